@@ -4,6 +4,9 @@ Single-file installer with InquirerPy prompts for guided setup.
 No local imports — designed to run standalone.
 
 Changes:
+  - 2026-10-16: Cache find_spec() probes in _spec_exists, cleared after each install
+                cascade; auto-install uv before the bootstrap cascade (_ensure_uv), matching
+                install.sh, given UV_INSTALL_TIMEOUT to finish.
   - 2026-02-17: Fix #184 — InquirerPy/prompt_toolkit raises OSError(22) on macOS
                 when running via curl|sh. All prompts now fall back to plain text
                 input on OSError. Disables InquirerPy globally after first failure.
@@ -18,6 +21,7 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import functools
 import importlib
 import importlib.util
 import json
@@ -42,13 +46,25 @@ _HAS_RICH = False
 _HAS_INQUIRER = False
 
 
+@functools.lru_cache(maxsize=32)
+def _spec_exists(name: str) -> bool:
+    """Cached find_spec() probe — avoids re-walking sys.path for the same name."""
+    return importlib.util.find_spec(name) is not None
+
+
+def _invalidate_import_caches() -> None:
+    """Forget cached import lookups after an install so new packages are seen."""
+    importlib.invalidate_caches()
+    _spec_exists.cache_clear()
+
+
 def _verify_imports(packages: list[str]) -> bool:
     """Verify packages are actually importable after install. Returns True if all found."""
     global _HAS_RICH, _HAS_INQUIRER
     all_ok = True
     for pkg in packages:
         spec_name = "rich" if pkg == "rich" else "InquirerPy"
-        if importlib.util.find_spec(spec_name) is not None:
+        if _spec_exists(spec_name):
             if spec_name == "rich":
                 _HAS_RICH = True
             else:
@@ -58,15 +74,62 @@ def _verify_imports(packages: list[str]) -> bool:
     return all_ok
 
 
+UV_INSTALL_URL = "https://astral.sh/uv/install.sh"
+UV_INSTALL_PS1_URL = "https://astral.sh/uv/install.ps1"
+UV_INSTALL_TIMEOUT = 120  # seconds; a stalled download falls through to pip
+
+
+def _ensure_uv() -> bool:
+    """Make sure uv is on PATH, installing the standalone binary if needed.
+
+    Mirrors ensure_uv() in install.sh so running installer.py directly still
+    gets the fast uv cascade. Returns True if uv is available afterwards.
+    """
+    if shutil.which("uv"):
+        return True
+
+    if platform.system() == "Windows":
+        cmd = [
+            "powershell",
+            "-ExecutionPolicy",
+            "ByPass",
+            "-Command",
+            f"irm {UV_INSTALL_PS1_URL} | iex",
+        ]
+    elif shutil.which("curl"):
+        cmd = ["sh", "-c", f"curl -LsSf --max-time {UV_INSTALL_TIMEOUT} {UV_INSTALL_URL} | sh"]
+    elif shutil.which("wget"):
+        cmd = ["sh", "-c", f"wget -qO- {UV_INSTALL_URL} | sh"]
+    else:
+        return False
+
+    print("  Installing uv (fast Python package manager)...")
+    try:
+        subprocess.check_call(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=UV_INSTALL_TIMEOUT,
+        )
+    except Exception:
+        return False
+
+    # Refresh PATH to pick up the new binary
+    home = Path.home()
+    extra = [str(home / ".local" / "bin"), str(home / ".cargo" / "bin")]
+    os.environ["PATH"] = os.pathsep.join(extra + [os.environ.get("PATH", "")])
+    return shutil.which("uv") is not None
+
+
 def _bootstrap_deps() -> None:
     """Install InquirerPy and rich if missing, with uv-first cascade."""
     global _HAS_RICH, _HAS_INQUIRER
     missing: list[str] = []
-    if importlib.util.find_spec("rich") is None:
+    if not _spec_exists("rich"):
         missing.append("rich")
     else:
         _HAS_RICH = True
-    if importlib.util.find_spec("InquirerPy") is None:
+    if not _spec_exists("InquirerPy"):
         missing.append("InquirerPy")
     else:
         _HAS_INQUIRER = True
@@ -77,13 +140,13 @@ def _bootstrap_deps() -> None:
     print(f"  Installing UI dependencies: {', '.join(missing)}...")
 
     # Cascade 1: uv pip install --system (target the running Python explicitly)
-    if shutil.which("uv"):
+    if _ensure_uv():
         try:
             cmd = ["uv", "pip", "install", "-q", "--python", sys.executable] + missing
             if not _in_virtualenv():
                 cmd.insert(3, "--system")
             subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
-            importlib.invalidate_caches()
+            _invalidate_import_caches()
             if _verify_imports(missing):
                 return
         except Exception:
@@ -96,7 +159,7 @@ def _bootstrap_deps() -> None:
             stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE,
         )
-        importlib.invalidate_caches()
+        _invalidate_import_caches()
         if _verify_imports(missing):
             return
     except subprocess.CalledProcessError as exc:
@@ -118,7 +181,7 @@ def _bootstrap_deps() -> None:
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.PIPE,
                 )
-                importlib.invalidate_caches()
+                _invalidate_import_caches()
                 if _verify_imports(missing):
                     return
             except Exception:
@@ -135,7 +198,7 @@ def _bootstrap_deps() -> None:
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.PIPE,
                 )
-                importlib.invalidate_caches()
+                _invalidate_import_caches()
                 if _verify_imports(missing):
                     return
             except Exception:
@@ -2,13 +2,21 @@
 # Thin wrapper that bootstraps Python/venv, installs pocketpaw via pip,
 # runs the server, and provides a system tray icon for non-technical users.
 # Created: 2026-02-10
+# Updated: 2026-10-16 — resolve __version__ lazily; importlib.metadata was the
+#   bulk of the import cost for every launcher submodule (and test module).
 
-try:
-    from importlib.metadata import version as _meta_version
 
-    __version__ = _meta_version("pocketpaw-launcher")
-except Exception:
-    # Fallback: read from POCKETPAW_VERSION env (set during build) or hardcoded
-    import os
+def __getattr__(name: str) -> str:
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        from importlib.metadata import version as _meta_version
 
-    __version__ = os.environ.get("POCKETPAW_VERSION", "0.1.0")
+        value = _meta_version("pocketpaw-launcher")
+    except Exception:
+        # Fallback: read from POCKETPAW_VERSION env (set during build) or hardcoded
+        import os
+
+        value = os.environ.get("POCKETPAW_VERSION", "0.1.0")
+    globals()["__version__"] = value
+    return value
@@ -5,8 +5,10 @@
 
 from __future__ import annotations
 
+import functools
 import io
 import logging
+import os
 import platform
 import shutil
 import subprocess
@@ -116,6 +118,38 @@ def _get_uv_download_url(version: str) -> str | None:
     return _UV_URL_TEMPLATE.format(version=version, target=target)
 
 
+@functools.lru_cache(maxsize=16)
+def _probe_python(python: str, mtime: float) -> tuple[int, int, int]:
+    """Run ``python`` to read its (major, minor, micro) version.
+
+    Cached per (path, mtime) so repeated checks of the same interpreter don't
+    fork again, while a reinstalled binary is re-probed. Failures raise and
+    are therefore never cached.
+    """
+    result = subprocess.run(
+        [python, "-c", "import sys; print(*sys.version_info[:3])"],
+        capture_output=True,
+        text=True,
+        timeout=10,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{python} exited with {result.returncode}")
+    major, minor, micro = (int(part) for part in result.stdout.split()[:3])
+    return major, minor, micro
+
+
+def _probe_python_cached(python: str) -> tuple[int, int, int] | None:
+    """Version of ``python`` via the (path, mtime) cache, or None if it can't be run."""
+    try:
+        mtime = os.path.getmtime(python)
+    except OSError:
+        mtime = 0.0
+    try:
+        return _probe_python(python, mtime)
+    except (subprocess.TimeoutExpired, OSError, RuntimeError, ValueError):
+        return None
+
+
 @dataclass
 class BootstrapStatus:
     """Current state of the bootstrap environment."""
@@ -310,39 +344,15 @@ class Bootstrap:
 
     def _check_python_version(self, python: str) -> bool:
         """Check if the given Python meets minimum version."""
-        try:
-            result = subprocess.run(
-                [python, "-c", "import sys; print(sys.version_info.major, sys.version_info.minor)"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            if result.returncode == 0:
-                parts = result.stdout.strip().split()
-                major, minor = int(parts[0]), int(parts[1])
-                return (major, minor) >= MIN_PYTHON
-        except (subprocess.TimeoutExpired, FileNotFoundError, ValueError, IndexError):
-            pass
-        return False
+        version = _probe_python_cached(python)
+        return version is not None and version[:2] >= MIN_PYTHON
 
     def _get_python_version(self, python: str) -> str | None:
         """Get the full version string."""
-        try:
-            result = subprocess.run(
-                [
-                    python,
-                    "-c",
-                    "import sys; v=sys.version_info; print(f'{v.major}.{v.minor}.{v.micro}')",
-                ],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        return None
+        version = _probe_python_cached(python)
+        if version is None:
+            return None
+        return ".".join(str(part) for part in version)
 
     # ── Embedded Python (Windows) ──────────────────────────────────────
 
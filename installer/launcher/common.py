@@ -7,11 +7,17 @@ from __future__ import annotations
 
 import logging
 import platform
+import re
 import shutil
 import subprocess
 from collections.abc import Callable
 from pathlib import Path
 
+try:  # Optional fast parser; orjson.JSONDecodeError subclasses json.JSONDecodeError
+    from orjson import loads as json_loads  # noqa: F401
+except ImportError:
+    from json import loads as json_loads  # noqa: F401
+
 logger = logging.getLogger(__name__)
 
 # ── Paths ──────────────────────────────────────────────────────────────
@@ -24,6 +30,12 @@ PACKAGE_NAME = "pocketpaw"
 GIT_REPO_URL = "https://github.com/pocketpaw/pocketpaw.git"
 DEV_MODE_MARKER = POCKETPAW_HOME / ".dev-mode"
 
+# "Version: X.Y.Z" line in `uv pip show` output
+_PIP_SHOW_VERSION_RE = re.compile(r"^version:[ \t]*(\S+)", re.MULTILINE | re.IGNORECASE)
+
+# Run inside the venv Python when uv isn't available (no pip import needed)
+_METADATA_VERSION_SCRIPT = f"import importlib.metadata as m; print(m.version({PACKAGE_NAME!r}))"
+
 # ── Callback types ─────────────────────────────────────────────────────
 StatusCallback = Callable[[str], None]
 
@@ -80,17 +92,20 @@ def get_installed_version(
                 text=True,
                 timeout=30,
             )
+            if result.returncode == 0:
+                match = _PIP_SHOW_VERSION_RE.search(result.stdout)
+                if match:
+                    return match.group(1)
         else:
+            # Read the dist-info metadata directly instead of importing pip
             result = subprocess.run(
-                [python, "-m", "pip", "show", PACKAGE_NAME],
+                [python, "-c", _METADATA_VERSION_SCRIPT],
                 capture_output=True,
                 text=True,
                 timeout=30,
             )
-        if result.returncode == 0:
-            for line in result.stdout.splitlines():
-                if line.lower().startswith("version:"):
-                    return line.split(":", 1)[1].strip()
+            if result.returncode == 0:
+                return result.stdout.strip() or None
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
     return None
@@ -2,32 +2,46 @@
 # Starts/stops the PocketPaw server process from the venv.
 # Created: 2026-02-10
 # Updated: 2026-02-10 — is_running() now cleans up stale PID files
+# Updated: 2026-10-16 — _is_port_free() probes with connect_ex instead of bind;
+#   _find_free_port() scans the fallback range with one select();
+#   is_healthy() reuses a keep-alive HTTPConnection;
+#   PID file guarded by an flock held for the server's lifetime (POSIX).
 
 from __future__ import annotations
 
-import json
+import errno
+import http.client
 import logging
 import os
 import platform
+import select
 import signal
 import socket
 import subprocess
 import time
-import urllib.request
 from pathlib import Path
 
 from installer.launcher.common import (
     POCKETPAW_HOME,
     VENV_DIR,
     StatusCallback,
+    json_loads,
     noop_status,
 )
 
+try:
+    import fcntl
+except ImportError:  # Windows — falls back to reading the PID and probing it
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
 PID_FILE = POCKETPAW_HOME / "launcher.pid"
 DEFAULT_PORT = 8888
 
+# connect_ex() results meaning "still connecting" on a non-blocking socket
+_CONNECT_PENDING = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN, 10035}  # 10035: WSA
+
 
 class ServerManager:
     """Manage the PocketPaw server subprocess."""
@@ -37,6 +51,7 @@ class ServerManager:
         self.on_status = on_status or noop_status
         self._process: subprocess.Popen | None = None
         self._log_fh = None
+        self._health_conn: http.client.HTTPConnection | None = None
         self._lock = __import__("threading").Lock()
 
     # ── Public API ─────────────────────────────────────────────────────
@@ -71,17 +86,26 @@ class ServerManager:
             log_file = POCKETPAW_HOME / "server.log"
             self._log_fh = open(log_file, "a", encoding="utf-8")  # noqa: SIM115
             env = self._build_env()
-            self._process = subprocess.Popen(
-                [str(python), "-m", "pocketpaw", "--port", str(self.port)],
-                env=env,
-                stdout=self._log_fh,
-                stderr=self._log_fh,
-                # Don't inherit the launcher's console on Windows
-                creationflags=self._creation_flags(),
-            )
-
-            # Write PID file
-            PID_FILE.write_text(str(self._process.pid))
+            # The server inherits the locked PID file descriptor, so the lock
+            # lives exactly as long as the server does (even past the launcher)
+            pid_fd = self._acquire_pid_lock()
+            try:
+                self._process = subprocess.Popen(
+                    [str(python), "-m", "pocketpaw", "--port", str(self.port)],
+                    env=env,
+                    stdout=self._log_fh,
+                    stderr=self._log_fh,
+                    # Don't inherit the launcher's console on Windows
+                    creationflags=self._creation_flags(),
+                    pass_fds=(pid_fd,) if pid_fd is not None else (),
+                )
+            except BaseException:
+                if pid_fd is not None:
+                    os.close(pid_fd)
+                raise
+
+            # Write PID file (closes our copy of the lock; the server keeps its own)
+            self._write_pid_file(pid_fd, self._process.pid)
 
             # Wait for the server to become healthy
             # pocketpaw needs ~25s for startup + internal setup
@@ -121,6 +145,10 @@ class ServerManager:
                     pass
                 self._log_fh = None
 
+            if self._health_conn is not None:
+                self._health_conn.close()
+                self._health_conn = None
+
             PID_FILE.unlink(missing_ok=True)
             self.on_status("PocketPaw stopped")
 
@@ -138,6 +166,8 @@ class ServerManager:
 
         # Check PID file
         if PID_FILE.exists():
+            if fcntl is not None:
+                return self._pid_lock_held()
             try:
                 pid = int(PID_FILE.read_text().strip())
                 if self._pid_alive(pid):
@@ -150,14 +180,25 @@ class ServerManager:
         return False
 
     def is_healthy(self) -> bool:
-        """Check if the server responds to HTTP."""
-        try:
-            url = f"http://127.0.0.1:{self.port}/"
-            req = urllib.request.Request(url, method="GET")
-            resp = urllib.request.urlopen(req, timeout=3)
-            return resp.status == 200
-        except Exception:
-            return False
+        """Check if the server responds to HTTP.
+
+        Polls over one keep-alive connection instead of a new TCP handshake
+        per call. A request on a connection the server already dropped is
+        retried once on a fresh one.
+        """
+        for _ in range(2):
+            conn = self._health_connection()
+            reused = conn.sock is not None
+            try:
+                conn.request("GET", "/")
+                resp = conn.getresponse()
+                resp.read()
+                return resp.status == 200
+            except Exception:
+                conn.close()
+                if not reused:
+                    return False
+        return False
 
     def get_dashboard_url(self) -> str:
         """Get the URL to open in the browser."""
@@ -165,6 +206,16 @@ class ServerManager:
 
     # ── Internal ───────────────────────────────────────────────────────
 
+    def _health_connection(self) -> http.client.HTTPConnection:
+        """Keep-alive connection used by is_healthy(), recreated if the port changed."""
+        conn = self._health_conn
+        if conn is None or conn.port != self.port:
+            if conn is not None:
+                conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=3)
+            self._health_conn = conn
+        return conn
+
     def _venv_python(self) -> Path:
         """Path to the venv Python executable."""
         if platform.system() == "Windows":
@@ -274,6 +325,67 @@ class ServerManager:
         except (ValueError, OSError, ProcessLookupError):
             pass
 
+    def _acquire_pid_lock(self) -> int | None:
+        """Open PID_FILE and take an exclusive flock on it (POSIX only).
+
+        Returns the locked descriptor, or None when locking isn't available
+        or another process already holds the lock.
+        """
+        if fcntl is None:
+            return None
+        try:
+            fd = os.open(PID_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            return None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+        return fd
+
+    def _write_pid_file(self, pid_fd: int | None, pid: int) -> None:
+        """Record the server PID, through the locked descriptor when we have one.
+
+        Closes ``pid_fd`` afterwards: the server inherited its own copy, and
+        keeping ours open would hold the lock after the server exits.
+        """
+        if pid_fd is None:
+            PID_FILE.write_text(str(pid))
+            return
+        try:
+            os.ftruncate(pid_fd, 0)
+            os.lseek(pid_fd, 0, os.SEEK_SET)
+            os.write(pid_fd, str(pid).encode())
+        finally:
+            os.close(pid_fd)
+
+    def _pid_lock_held(self) -> bool:
+        """True if a live server holds the PID file lock; removes the file if stale."""
+        try:
+            fd = os.open(PID_FILE, os.O_RDWR)
+        except OSError:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        else:
+            # Nobody holds the lock. PID files from launchers that predate the
+            # flock are never locked, so probe the recorded PID before
+            # treating the file as stale.
+            try:
+                if self._pid_alive(int(os.read(fd, 32).strip())):
+                    return True
+            except (ValueError, OSError):
+                pass
+            PID_FILE.unlink(missing_ok=True)
+            return False
+        finally:
+            os.close(fd)
+
     def _pid_alive(self, pid: int) -> bool:
         """Check if a PID is alive."""
         try:
@@ -291,31 +403,88 @@ class ServerManager:
             return False
 
     def _is_port_free(self, port: int) -> bool:
-        """Check if a port is available."""
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(("127.0.0.1", port))
-                return True
-        except OSError:
-            return False
+        """Check if a port is available.
+
+        Probes with a short connect instead of bind(): only a refused
+        connection means nothing is listening (a timeout or any other error
+        counts as busy), and the probe never leaves the port in TIME_WAIT the
+        way a bind+close can.
+        """
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(0.05)
+            try:
+                return s.connect_ex(("127.0.0.1", port)) == errno.ECONNREFUSED
+            except OSError:
+                return False
 
     def _find_free_port(self) -> int:
         """Find a free port starting from the default."""
-        for port in range(self.port, self.port + 100):
-            if self._is_port_free(port):
-                return port
+        if self._is_port_free(self.port):
+            return self.port
+        port = self._scan_ports(range(self.port + 1, min(self.port + 100, 65536)))
+        if port is not None:
+            return port
         # Last resort: let OS pick
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             s.bind(("127.0.0.1", 0))
             return s.getsockname()[1]
 
+    def _scan_ports(self, ports: range, timeout: float = 0.1) -> int | None:
+        """Return the first port in ``ports`` with no listener, probing them all at once.
+
+        Issues a non-blocking connect to every candidate and waits for all of
+        them in a single select() call, so the scan costs ~one timeout instead
+        of one per port.
+        """
+        socks: dict[socket.socket, int] = {}
+        free: set[int] = set()
+        try:
+            for port in ports:
+                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                s.setblocking(False)
+                err = s.connect_ex(("127.0.0.1", port))
+                if err in _CONNECT_PENDING:
+                    socks[s] = port
+                    continue
+                s.close()
+                if err == errno.ECONNREFUSED:
+                    free.add(port)
+
+            pending = list(socks)
+            deadline = time.monotonic() + timeout
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                _, writable, errored = select.select([], pending, pending, remaining)
+                done = set(writable) | set(errored)
+                if not done:
+                    break
+                for s in done:
+                    err = s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if err == errno.ECONNREFUSED:
+                        free.add(socks[s])
+                pending = [s for s in pending if s not in done]
+        finally:
+            for s in socks:
+                s.close()
+
+        for port in ports:
+            if port in free:
+                return port
+        return None
+
     def _read_port_from_config(self) -> int | None:
-        """Read the web port from the PocketPaw config file."""
-        config_path = POCKETPAW_HOME / "config.json"
-        if config_path.exists():
-            try:
-                config = json.loads(config_path.read_text())
-                return config.get("web_port")
-            except (json.JSONDecodeError, OSError):
-                pass
+        """Read the web port from the PocketPaw config file.
+
+        Parses and validates in one pass: anything other than an int port in
+        a JSON object (missing file, bad JSON, wrong type) yields None.
+        """
+        try:
+            config = json_loads((POCKETPAW_HOME / "config.json").read_bytes())
+        except (ValueError, OSError):
+            return None
+        port = config.get("web_port") if isinstance(config, dict) else None
+        if type(port) is int and 0 < port < 65536:
+            return port
         return None
@@ -5,12 +5,17 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
+import os
 import platform
 import subprocess
+import time
+import urllib.error
 import urllib.request
 from dataclasses import dataclass
+from email.utils import formatdate
 from pathlib import Path
 
 from installer.launcher.common import (
@@ -22,12 +27,15 @@ from installer.launcher.common import (
     StatusCallback,
     find_uv,
     get_installed_version,
+    json_loads,
     noop_status,
 )
 
 logger = logging.getLogger(__name__)
 
 PYPI_URL = f"https://pypi.org/pypi/{PACKAGE_NAME}/json"
+PYPI_CACHE_FILE = POCKETPAW_HOME / ".pypi_cache.json"
+PYPI_CACHE_TTL = 3600  # seconds before the cached version is revalidated
 
 
 @dataclass
@@ -209,38 +217,85 @@ class Updater:
         return get_installed_version(python=python, uv=self._find_uv())
 
     def _get_pypi_version(self) -> str | None:
-        """Fetch the latest version from PyPI JSON API."""
+        """Fetch the latest version from PyPI JSON API.
+
+        The answer is cached in PYPI_CACHE_FILE. A fresh cache (younger than
+        PYPI_CACHE_TTL) is returned without touching the network; an older one
+        is revalidated with If-Modified-Since so an unchanged release costs a 304.
+        """
+        cached, mtime = self._read_pypi_cache()
+        if cached and time.time() - mtime < PYPI_CACHE_TTL:
+            return cached
+
+        headers = {"Accept": "application/json"}
+        if cached:
+            headers["If-Modified-Since"] = formatdate(mtime, usegmt=True)
         try:
-            req = urllib.request.Request(
-                PYPI_URL,
-                headers={"Accept": "application/json"},
-            )
+            req = urllib.request.Request(PYPI_URL, headers=headers)
             resp = urllib.request.urlopen(req, timeout=10)
-            data = json.loads(resp.read())
-            return data.get("info", {}).get("version")
+            data = json_loads(resp.read())
+            version = data.get("info", {}).get("version")
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304 and cached:
+                self._write_pypi_cache(cached)
+                return cached
+            logger.warning("PyPI check failed: %s", exc)
+            return None
         except Exception as exc:
             logger.warning("PyPI check failed: %s", exc)
             return None
 
-    def _version_newer(self, latest: str, current: str) -> bool:
-        """Compare version strings. Returns True if latest > current.
+        if version:
+            self._write_pypi_cache(version)
+        return version
 
-        Handles pre-release suffixes (e.g. 0.2.0a1) via packaging.version,
-        falling back to tuple comparison for simple X.Y.Z versions.
-        """
+    def _read_pypi_cache(self) -> tuple[str | None, float]:
+        """Return (cached_version, cache_mtime), or (None, 0.0) if there is no usable cache."""
+        try:
+            mtime = os.path.getmtime(PYPI_CACHE_FILE)
+            version = json_loads(PYPI_CACHE_FILE.read_bytes()).get("version")
+        except (OSError, ValueError, AttributeError):
+            return None, 0.0
+        if not isinstance(version, str) or not version:
+            return None, 0.0
+        return version, mtime
+
+    def _write_pypi_cache(self, version: str) -> None:
+        """Persist the latest PyPI version (also refreshes the cache mtime)."""
         try:
-            from packaging.version import Version
+            PYPI_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            PYPI_CACHE_FILE.write_text(json.dumps({"version": version}), encoding="utf-8")
+        except OSError as exc:
+            logger.debug("Could not write PyPI cache: %s", exc)
+
+    def _version_newer(self, latest: str, current: str) -> bool:
+        """Compare version strings. Returns True if latest > current."""
+        return _version_newer(latest, current)
 
-            return Version(latest) > Version(current)
-        except ImportError:
-            pass
-        # Fallback: strip non-numeric suffixes and compare tuples
-        import re
 
-        def _parse(v: str) -> tuple[int, ...]:
-            return tuple(int(x) for x in re.findall(r"\d+", v))
+@functools.lru_cache(maxsize=128)
+def _version_newer(latest: str, current: str) -> bool:
+    """Return True if ``latest`` > ``current`` (memoized — the pair rarely changes).
+
+    Handles pre-release suffixes (e.g. 0.2.0a1) via packaging.version,
+    falling back to tuple comparison for simple X.Y.Z versions.
+    """
+    try:
+        from packaging.version import InvalidVersion, Version
 
         try:
-            return _parse(latest) > _parse(current)
-        except (ValueError, AttributeError):
-            return latest != current
+            return Version(latest) > Version(current)
+        except InvalidVersion:
+            pass
+    except ImportError:
+        pass
+    # Fallback: strip non-numeric suffixes and compare tuples
+    import re
+
+    def _parse(v: str) -> tuple[int, ...]:
+        return tuple(int(x) for x in re.findall(r"\d+", v))
+
+    try:
+        return _parse(latest) > _parse(current)
+    except (ValueError, AttributeError):
+        return latest != current
@@ -1,5 +1,13 @@
 """Optional dependency helpers."""
 
+import json
+from typing import Any
+
+try:  # Optional fast JSON; orjson.JSONDecodeError subclasses json.JSONDecodeError
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def require_extra(package: str, extra: str) -> None:
     """Raise ImportError with install instructions for a missing optional dependency."""
@@ -7,3 +15,28 @@ def require_extra(package: str, extra: str) -> None:
         f"'{package}' is required but not installed. "
         f"Install it with: pip install 'pocketpaw[{extra}]'"
     )
+
+
+def json_loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Parse JSON, with orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    # json.loads() only takes str/bytes, so a memoryview costs one copy here
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+def json_dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, with orjson when installed.
+
+    The stdlib fallback keeps ``ensure_ascii``, so the bytes are valid UTF-8 even
+    for strings orjson rejects, such as a lone surrogate from a split emoji.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, option=option)
+        except orjson.JSONEncodeError:
+            pass
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
@@ -41,23 +41,9 @@ async def get_identity():
 @router.put("/identity", response_model=IdentitySaveResponse)
 async def save_identity(body: IdentitySaveRequest):
     """Save edits to agent identity files. Changes take effect on the next message."""
+    from pocketpaw.bootstrap.default_provider import save_identity_files
     from pocketpaw.config import get_config_path
 
     identity_dir = get_config_path().parent / "identity"
-    identity_dir.mkdir(parents=True, exist_ok=True)
-
-    file_map = {
-        "identity_file": "IDENTITY.md",
-        "soul_file": "SOUL.md",
-        "style_file": "STYLE.md",
-        "instructions_file": "INSTRUCTIONS.md",
-        "user_file": "USER.md",
-    }
-    updated = []
-    data = body.model_dump(exclude_none=True)
-    for key, filename in file_map.items():
-        if key in data and isinstance(data[key], str):
-            (identity_dir / filename).write_text(data[key])
-            updated.append(filename)
-
+    updated = save_identity_files(identity_dir, body.model_dump(exclude_none=True))
     return IdentitySaveResponse(updated=updated)
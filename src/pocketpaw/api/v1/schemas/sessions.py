@@ -23,6 +23,12 @@ class SessionListResponse(BaseModel):
     total: int
 
 
+class SessionIndexRebuildResponse(BaseModel):
+    """Result of rebuilding the session index from the session files."""
+
+    total: int
+
+
 class SessionTitleRequest(BaseModel):
     """Session rename request."""
 
@@ -2,17 +2,22 @@
 # Created: 2026-02-20
 #
 # Extracted from dashboard.py session endpoints.
+# Updated: 2026-10-16 — POST /sessions/rebuild-index (scan runs off the event loop); search
+#   parses with orjson when installed; search byte prefilter; list uses heapq.nlargest.
 
 from __future__ import annotations
 
+import heapq
 import json
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
+from pocketpaw._compat import json_loads
 from pocketpaw.api.deps import require_scope
 from pocketpaw.api.v1.schemas.common import StatusResponse
 from pocketpaw.api.v1.schemas.sessions import (
+    SessionIndexRebuildResponse,
     SessionListResponse,
     SessionSearchResponse,
     SessionSearchResult,
@@ -34,11 +39,10 @@ async def list_sessions(limit: int = Query(50, ge=1, le=500)):
 
     if hasattr(store, "_load_session_index"):
         index = store._load_session_index()
-        entries = sorted(
-            index.items(),
-            key=lambda kv: kv[1].get("last_activity", ""),
-            reverse=True,
-        )[:limit]
+        # Newest `limit` by last_activity; same order as a stable descending sort
+        entries = heapq.nlargest(
+            limit, index.items(), key=lambda kv: kv[1].get("last_activity", "")
+        )
         sessions = []
         for safe_key, meta in entries:
             sessions.append({"id": safe_key, **meta})
@@ -47,6 +51,22 @@ async def list_sessions(limit: int = Query(50, ge=1, le=500)):
     return {"sessions": [], "total": 0}
 
 
+@router.post("/sessions/rebuild-index", response_model=SessionIndexRebuildResponse)
+async def rebuild_session_index():
+    """Rebuild the session index by rescanning every session file."""
+    from pocketpaw.memory import get_memory_manager
+
+    manager = get_memory_manager()
+    store = manager._store
+
+    if hasattr(store, "rebuild_session_index_async"):
+        # Scans on a worker thread under the index lock, so the loop keeps serving
+        index = await store.rebuild_session_index_async()
+        return SessionIndexRebuildResponse(total=len(index))
+
+    raise HTTPException(status_code=501, detail="Store does not support a session index")
+
+
 @router.delete("/sessions/{session_id}", response_model=StatusResponse)
 async def delete_session(session_id: str):
     """Delete a session by ID."""
@@ -85,6 +105,7 @@ async def update_session_title(session_id: str, body: SessionTitleRequest):
 async def search_sessions(q: str = Query(""), limit: int = Query(20, ge=1, le=200)):
     """Search sessions by content."""
     from pocketpaw.memory import get_memory_manager
+    from pocketpaw.memory.file_store import _raw_may_match
 
     if not q.strip():
         return SessionSearchResponse(sessions=[])
@@ -103,7 +124,10 @@ async def search_sessions(q: str = Query(""), limit: int = Query(20, ge=1, le=20
         if session_file.name.startswith("_") or session_file.name.endswith("_compaction.json"):
             continue
         try:
-            data = json.loads(session_file.read_text())
+            raw = session_file.read_bytes()
+            if not _raw_may_match(raw, query_lower):
+                continue
+            data = json_loads(raw)
             for msg in data:
                 if query_lower in msg.get("content", "").lower():
                     safe_key = session_file.stem
@@ -4,6 +4,7 @@ Created: 2026-02-02
 Updated: 2026-02-17 - Inject health state into system prompt when degraded/unhealthy
 Updated: 2026-02-07 - Semantic context injection for mem0 backend
 Updated: 2026-02-10 - Channel-aware format hints
+Updated: 2026-10-16 - Sender identity blocks come from module-level templates
 """
 
 from __future__ import annotations
@@ -16,6 +17,18 @@ from pocketpaw.bus.events import Channel
 from pocketpaw.bus.format import CHANNEL_FORMAT_HINTS
 from pocketpaw.memory.manager import MemoryManager, get_memory_manager
 
+# Sender identity block, picked by whether the sender is the configured owner
+_OWNER_IDENTITY_BLOCK = (
+    "\n# Current Conversation\n"
+    "You are speaking with sender_id={sender_id} (role: owner).\n"
+    "This is your owner."
+)
+_EXTERNAL_IDENTITY_BLOCK = (
+    "\n# Current Conversation\n"
+    "You are speaking with sender_id={sender_id} (role: external user).\n"
+    "This is NOT your owner. Be helpful but do not share owner-private information."
+)
+
 
 class AgentContextBuilder:
     """
@@ -80,20 +93,12 @@ class AgentContextBuilder:
 
             settings = get_settings()
             if settings.owner_id:
-                is_owner = sender_id == settings.owner_id
-                role = "owner" if is_owner else "external user"
-                identity_block = (
-                    f"\n# Current Conversation\n"
-                    f"You are speaking with sender_id={sender_id} (role: {role})."
+                template = (
+                    _OWNER_IDENTITY_BLOCK
+                    if sender_id == settings.owner_id
+                    else _EXTERNAL_IDENTITY_BLOCK
                 )
-                if is_owner:
-                    identity_block += "\nThis is your owner."
-                else:
-                    identity_block += (
-                        "\nThis is NOT your owner. Be helpful but do not share "
-                        "owner-private information."
-                    )
-                parts.append(identity_block)
+                parts.append(template.format(sender_id=sender_id))
 
         # 4. Inject channel format hint
         if channel:
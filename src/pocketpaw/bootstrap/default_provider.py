@@ -3,6 +3,8 @@ Default bootstrap provider reading from local files.
 Created: 2026-02-02
 """
 
+import asyncio
+import os
 from pathlib import Path
 
 from pocketpaw.bootstrap.protocol import BootstrapContext, BootstrapProviderProtocol
@@ -124,6 +126,66 @@ directly — never use a tool to look up what you already know.
    http://localhost:8888/api/oauth/authorize?service=spotify
 """
 
+# Request keys accepted by the identity endpoints, mapped to their files.
+_IDENTITY_FILE_MAP: tuple[tuple[str, str], ...] = (
+    ("identity_file", "IDENTITY.md"),
+    ("soul_file", "SOUL.md"),
+    ("style_file", "STYLE.md"),
+    ("instructions_file", "INSTRUCTIONS.md"),
+    ("user_file", "USER.md"),
+)
+
+
+def _fsync_dir(path: Path) -> None:
+    """Flush directory entries to disk (no-op where O_DIRECTORY is unsupported)."""
+    flag = getattr(os, "O_DIRECTORY", None)
+    if flag is None:
+        return
+    try:
+        fd = os.open(str(path), flag)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _read_optional(path: Path) -> str:
+    """Return the stripped content of ``path``, or an empty string if it is missing."""
+    if not path.exists():
+        return ""
+    return path.read_text().strip()
+
+
+def save_identity_files(identity_dir: Path, data: dict) -> list[str]:
+    """Write the string-valued identity fields in ``data`` into ``identity_dir``.
+
+    Files whose content is already up to date are left untouched, and the
+    directory is synced once after all writes instead of once per file.
+    Returns the filenames that were saved.
+    """
+    identity_dir.mkdir(parents=True, exist_ok=True)
+
+    updated = []
+    wrote = False
+    for key, filename in _IDENTITY_FILE_MAP:
+        content = data.get(key)
+        if not isinstance(content, str):
+            continue
+        path = identity_dir / filename
+        encoded = content.encode()
+        if not (path.exists() and path.read_bytes() == encoded):
+            path.write_bytes(encoded)
+            wrote = True
+        updated.append(filename)
+
+    if wrote:
+        _fsync_dir(identity_dir)
+    return updated
+
 
 class DefaultBootstrapProvider(BootstrapProviderProtocol):
     """
@@ -178,20 +240,14 @@ class DefaultBootstrapProvider(BootstrapProviderProtocol):
             instructions_file.write_text(_DEFAULT_INSTRUCTIONS)
 
     async def get_context(self) -> BootstrapContext:
-        """Load context from files."""
-        identity = (self.base_path / "IDENTITY.md").read_text()
-        soul = (self.base_path / "SOUL.md").read_text()
-        style = (self.base_path / "STYLE.md").read_text()
-
-        user_profile = ""
-        user_file = self.base_path / "USER.md"
-        if user_file.exists():
-            user_profile = user_file.read_text().strip()
-
-        instructions = ""
-        instructions_file = self.base_path / "INSTRUCTIONS.md"
-        if instructions_file.exists():
-            instructions = instructions_file.read_text().strip()
+        """Load context from files, reading them concurrently off the event loop."""
+        identity, soul, style, user_profile, instructions = await asyncio.gather(
+            asyncio.to_thread((self.base_path / "IDENTITY.md").read_text),
+            asyncio.to_thread((self.base_path / "SOUL.md").read_text),
+            asyncio.to_thread((self.base_path / "STYLE.md").read_text),
+            asyncio.to_thread(_read_optional, self.base_path / "USER.md"),
+            asyncio.to_thread(_read_optional, self.base_path / "INSTRUCTIONS.md"),
+        )
 
         return BootstrapContext(
             name="PocketPaw",
@@ -3,6 +3,7 @@
 Lightweight FastAPI server that serves the frontend and handles WebSocket communication.
 
 Changes:
+  - 2026-10-16: Session list picks the newest sessions with heapq.nlargest, not a full sort.
   - 2026-02-17: Health heartbeat — periodic checks every 5 min via APScheduler, broadcasts health_update on status transitions.
   - 2026-02-17: Health Engine API (GET /api/health, POST /api/health/check, WS get_health/run_health_check).
   - 2026-02-06: WebSocket auth via first message instead of URL query param; accept wss://.
@@ -23,6 +24,7 @@ Changes:
 
 import asyncio
 import base64
+import heapq
 import io
 import json
 import logging
@@ -1100,23 +1102,10 @@ async def get_identity():
 @app.put("/api/identity")
 async def save_identity(request: Request):
     """Save edits to agent identity files. Changes take effect on the next message."""
-    data = await request.json()
-    identity_dir = get_config_path().parent / "identity"
-    identity_dir.mkdir(parents=True, exist_ok=True)
-
-    file_map = {
-        "identity_file": "IDENTITY.md",
-        "soul_file": "SOUL.md",
-        "style_file": "STYLE.md",
-        "instructions_file": "INSTRUCTIONS.md",
-        "user_file": "USER.md",
-    }
-    updated = []
-    for key, filename in file_map.items():
-        if key in data and isinstance(data[key], str):
-            (identity_dir / filename).write_text(data[key])
-            updated.append(filename)
+    from pocketpaw.bootstrap.default_provider import save_identity_files
 
+    data = await request.json()
+    updated = save_identity_files(get_config_path().parent / "identity", data)
     return {"ok": True, "updated": updated}
 
 
@@ -1128,12 +1117,10 @@ async def list_sessions_v2(limit: int = 50):
 
     if hasattr(store, "_load_session_index"):
         index = store._load_session_index()
-        # Sort by last_activity descending
-        entries = sorted(
-            index.items(),
-            key=lambda kv: kv[1].get("last_activity", ""),
-            reverse=True,
-        )[:limit]
+        # Newest `limit` by last_activity; same order as a stable descending sort
+        entries = heapq.nlargest(
+            limit, index.items(), key=lambda kv: kv[1].get("last_activity", "")
+        )
         sessions = []
         for safe_key, meta in entries:
             sessions.append({"id": safe_key, **meta})
@@ -1,23 +1,35 @@
 """MCP server configuration — load/save from ~/.pocketpaw/mcp_servers.json.
 
 Created: 2026-02-07
+Updated: 2026-10-16 — JSON via orjson when installed; load reads raw bytes; mmap for large
+  files; parse cached on (path, mtime_ns, size); slotted MCPServerConfig; save writes a temp
+  file and renames it over the config.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import mmap
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from pocketpaw._compat import json_dumps, json_loads
 from pocketpaw.config import get_config_dir
 
 logger = logging.getLogger(__name__)
 
 MCP_CONFIG_FILENAME = "mcp_servers.json"
 
+# Configs above this size are mmapped and parsed straight from the page cache
+_MMAP_THRESHOLD = 64 * 1024
 
-@dataclass
+# Last parsed "servers" list, keyed on (path, st_mtime_ns, st_size) of the file
+_servers_cache: tuple[tuple[str, int, int], list[dict]] | None = None
+
+
+@dataclass(slots=True)
 class MCPServerConfig:
     """Configuration for a single MCP server."""
 
@@ -58,9 +70,9 @@ class MCPServerConfig:
             name=data.get("name", ""),
             transport=data.get("transport", "stdio"),
             command=data.get("command", ""),
-            args=data.get("args", []),
+            args=list(data.get("args") or []),
             url=data.get("url", ""),
-            env=data.get("env", {}),
+            env=dict(data.get("env") or {}),
             enabled=data.get("enabled", True),
             timeout=data.get("timeout", 30),
             registry_ref=data.get("registry_ref", ""),
@@ -72,23 +84,57 @@ def _get_mcp_config_path() -> Path:
     return get_config_dir() / MCP_CONFIG_FILENAME
 
 
+def _read_servers(path: Path) -> list[dict]:
+    """Return the raw "servers" entries, reparsing only when the file changed.
+
+    Files larger than _MMAP_THRESHOLD are mmapped rather than read.
+    """
+    global _servers_cache
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        cached = _servers_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        if st.st_size <= _MMAP_THRESHOLD:
+            data = json_loads(f.read())
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                data = json_loads(view)
+    servers = data.get("servers", [])
+    _servers_cache = (key, servers)
+    return servers
+
+
 def load_mcp_config() -> list[MCPServerConfig]:
-    """Load MCP server configs from disk."""
-    path = _get_mcp_config_path()
-    if not path.exists():
-        return []
+    """Load MCP server configs from disk.
+
+    Returns fresh objects on every call (callers mutate and re-save them);
+    only the JSON parse is cached.
+    """
     try:
-        data = json.loads(path.read_text())
-        servers = data.get("servers", [])
-        return [MCPServerConfig.from_dict(s) for s in servers]
+        return [MCPServerConfig.from_dict(s) for s in _read_servers(_get_mcp_config_path())]
+    except FileNotFoundError:
+        return []
     except (json.JSONDecodeError, Exception) as e:
         logger.warning("Failed to load MCP config: %s", e)
         return []
 
 
 def save_mcp_config(configs: list[MCPServerConfig]) -> None:
-    """Save MCP server configs to disk."""
+    """Save MCP server configs to disk atomically (temp file + rename).
+
+    The file stays indented so users can edit it by hand.
+    """
+    global _servers_cache
+    _servers_cache = None
     path = _get_mcp_config_path()
     data = {"servers": [c.to_dict() for c in configs]}
-    path.write_text(json.dumps(data, indent=2))
+    temp_path = path.with_suffix(".tmp")
+    try:
+        temp_path.write_bytes(json_dumps(data, indent=True) + b"\n")
+        temp_path.replace(path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+        raise
     logger.info("Saved %d MCP server configs", len(configs))
@@ -7,6 +7,11 @@ Singleton manager that handles:
 - Caching discovered tools for fast access
 
 Created: 2026-02-07
+Updated: 2026-10-16 — slotted MCPToolInfo; per-server locks (one server's possibly 300s
+  OAuth connect never blocks another); transport + session on one AsyncExitStack; cached
+  get_all_tools() list; _TRANSPORTS dispatch table (unknown transports rejected before OAuth
+  setup); _status_row(); singleton created under a lock; call_tool joins text blocks from a
+  generator.
 """
 
 from __future__ import annotations
@@ -14,7 +19,9 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import threading
 from collections.abc import Callable
+from contextlib import AsyncExitStack
 from dataclasses import dataclass, field
 from typing import Any
 from urllib.parse import parse_qs, urlparse
@@ -52,7 +59,7 @@ def set_oauth_callback_result(state: str, code: str) -> bool:
     return False
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPToolInfo:
     """Metadata about a tool discovered from an MCP server."""
 
@@ -68,7 +75,8 @@ class _ServerState:
 
     config: MCPServerConfig
     session: Any = None  # mcp.ClientSession
-    client: Any = None  # context manager
+    # Owns the transport and session contexts; closed LIFO by _cleanup_state
+    exit_stack: AsyncExitStack = field(default_factory=AsyncExitStack)
     read_stream: Any = None
     write_stream: Any = None
     tools: list[MCPToolInfo] = field(default_factory=list)
@@ -76,6 +84,14 @@ class _ServerState:
     connected: bool = False
 
 
+# transport name -> MCPManager method that opens it
+_TRANSPORTS: dict[str, str] = {
+    "stdio": "_open_stdio",
+    "streamable-http": "_open_streamable_http",
+    "sse": "_open_sse",
+    "http": "_open_http",
+}
+
 _UNHELPFUL_ERRORS = {
     "Attempted to exit a cancel scope that isn't the current tasks's current cancel scope",
 }
@@ -116,6 +132,32 @@ def _extract_root_error(exc: BaseException) -> str:
     return top
 
 
+def _status_row(config: MCPServerConfig, state: _ServerState | None) -> dict:
+    """Status entry for one server; runtime state (if any) wins over the saved config."""
+    if state is None:
+        info: dict = {
+            "connected": False,
+            "tool_count": 0,
+            "error": "",
+            "transport": config.transport,
+            "enabled": config.enabled,
+        }
+    else:
+        config = state.config
+        info = {
+            "connected": state.connected,
+            # A server in _servers that isn't connected and has no error is still starting
+            "connecting": not state.connected and not state.error,
+            "tool_count": len(state.tools),
+            "error": state.error,
+            "transport": config.transport,
+            "enabled": config.enabled,
+        }
+    if config.registry_ref:
+        info["registry_ref"] = config.registry_ref
+    return info
+
+
 class MCPManager:
     """Manages MCP server connections and tool invocations."""
 
@@ -157,7 +199,16 @@ class MCPManager:
 
     def __init__(self) -> None:
         self._servers: dict[str, _ServerState] = {}
-        self._lock = asyncio.Lock()
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Flat tool list for get_all_tools(); None = rebuild on next call
+        self._all_tools: list[MCPToolInfo] | None = None
+
+    def _server_lock(self, name: str) -> asyncio.Lock:
+        """Lock serializing start/stop of one server (other servers proceed freely)."""
+        lock = self._locks.get(name)
+        if lock is None:
+            lock = self._locks[name] = asyncio.Lock()
+        return lock
 
     @classmethod
     def _build_safe_env(cls, config_env: dict[str, str]) -> dict[str, str]:
@@ -260,16 +311,15 @@ class MCPManager:
         """Start an MCP server and initialize its session.
 
         Returns True on success, False on failure.
-        Uses a global lock to prevent races from interactive API calls.
+        Uses a per-server lock to prevent races from interactive API calls.
         """
-        async with self._lock:
+        async with self._server_lock(config.name):
             return await self._start_server_inner(config)
 
     async def _start_server_inner(self, config: MCPServerConfig) -> bool:
         """Start an MCP server (no lock — caller must handle synchronization).
 
-        Used directly by start_enabled_servers() for parallel startup,
-        and indirectly by start_server() which wraps it with a lock.
+        Called by start_server(), which wraps it with the server's lock.
         """
         if config.name in self._servers and self._servers[config.name].connected:
             logger.info("MCP server '%s' already connected", config.name)
@@ -278,6 +328,12 @@ class MCPManager:
         state = _ServerState(config=config)
         self._servers[config.name] = state
 
+        opener = _TRANSPORTS.get(config.transport)
+        if opener is None:
+            state.error = f"Unknown transport: {config.transport}"
+            logger.error(state.error)
+            return False
+
         # Build OAuth auth if needed
         auth = None
         if config.oauth:
@@ -293,55 +349,12 @@ class MCPManager:
             # OAuth flows need more time for user interaction
             connect_timeout = 300 if config.oauth else timeout
 
-            if config.transport == "stdio":
-                await asyncio.wait_for(self._connect_stdio(state), timeout=timeout)
-            elif config.transport == "streamable-http":
-                await self._connect_remote_with_timeout(
-                    state,
-                    connect_timeout,
-                    lambda s: self._connect_streamable_http(s, auth=auth),
-                )
-            elif config.transport == "sse":
-                await self._connect_remote_with_timeout(
-                    state,
-                    connect_timeout,
-                    lambda s: self._connect_sse(s, auth=auth),
-                )
-            elif config.transport == "http":
-                # Auto-detect: try Streamable HTTP first, fall back to SSE.
-                # Modern MCP servers use Streamable HTTP (POST-based);
-                # older ones use SSE (GET-based).
-                try:
-                    await self._connect_remote_with_timeout(
-                        state,
-                        connect_timeout,
-                        lambda s: self._connect_streamable_http(
-                            s, auth=auth
-                        ),
-                    )
-                except TimeoutError:
-                    raise  # Don't waste time retrying on timeout
-                except BaseException:
-                    await self._cleanup_state(state)
-                    state = _ServerState(config=config)
-                    self._servers[config.name] = state
-                    logger.debug(
-                        "Streamable HTTP failed for '%s', trying SSE",
-                        config.name,
-                    )
-                    await self._connect_remote_with_timeout(
-                        state,
-                        connect_timeout,
-                        lambda s: self._connect_sse(s, auth=auth),
-                    )
-            else:
-                state.error = f"Unknown transport: {config.transport}"
-                logger.error(state.error)
-                return False
+            await getattr(self, opener)(state, timeout, connect_timeout, auth)
 
             # Discover tools (also bounded by timeout)
             await asyncio.wait_for(self._discover_tools(state), timeout=timeout)
             state.connected = True
+            self._all_tools = None
             logger.info(
                 "MCP server '%s' started — %d tools",
                 config.name,
@@ -377,9 +390,71 @@ class MCPManager:
             logger.error("Failed to start MCP server '%s': %s", config.name, root_msg)
             return False
 
+    async def _open_stdio(
+        self, state: _ServerState, timeout: int, connect_timeout: int, auth: Any
+    ) -> None:
+        await asyncio.wait_for(self._connect_stdio(state), timeout=timeout)
+
+    async def _open_streamable_http(
+        self, state: _ServerState, timeout: int, connect_timeout: int, auth: Any
+    ) -> None:
+        await self._connect_remote_with_timeout(
+            state,
+            connect_timeout,
+            lambda s: self._connect_streamable_http(s, auth=auth),
+        )
+
+    async def _open_sse(
+        self, state: _ServerState, timeout: int, connect_timeout: int, auth: Any
+    ) -> None:
+        await self._connect_remote_with_timeout(
+            state,
+            connect_timeout,
+            lambda s: self._connect_sse(s, auth=auth),
+        )
+
+    async def _open_http(
+        self, state: _ServerState, timeout: int, connect_timeout: int, auth: Any
+    ) -> None:
+        """Auto-detect: try Streamable HTTP first, fall back to SSE.
+
+        Modern MCP servers use Streamable HTTP (POST-based); older ones use
+        SSE (GET-based).
+        """
+        try:
+            await self._open_streamable_http(state, timeout, connect_timeout, auth)
+        except TimeoutError:
+            raise  # Don't waste time retrying on timeout
+        except BaseException:
+            await self._cleanup_state(state)
+            # Fresh resources on the same state so status/errors stay in one place
+            state.exit_stack = AsyncExitStack()
+            state.session = state.read_stream = state.write_stream = None
+            logger.debug("Streamable HTTP failed for '%s', trying SSE", state.config.name)
+            await self._open_sse(state, timeout, connect_timeout, auth)
+
+    async def _open_session(self, state: _ServerState, transport: Any) -> None:
+        """Enter a transport context and an initialized ClientSession on top of it.
+
+        Both contexts are pushed onto ``state.exit_stack`` and stay open until
+        _cleanup_state(); if initialization fails, the caller's cleanup unwinds
+        whatever was entered (session first, then transport).
+        """
+        from mcp import ClientSession
+
+        streams = await state.exit_stack.enter_async_context(transport)
+        # streamablehttp_client also yields a get_session_id callable
+        state.read_stream = streams[0]
+        state.write_stream = streams[1]
+        session = await state.exit_stack.enter_async_context(
+            ClientSession(state.read_stream, state.write_stream)
+        )
+        await session.initialize()
+        state.session = session
+
     async def _connect_stdio(self, state: _ServerState) -> None:
         """Connect to an MCP server via stdio subprocess."""
-        from mcp import ClientSession, StdioServerParameters
+        from mcp import StdioServerParameters
         from mcp.client.stdio import stdio_client
 
         env = self._build_safe_env(state.config.env)
@@ -388,25 +463,7 @@ class MCPManager:
             args=state.config.args,
             env=env,
         )
-
-        # stdio_client is an async context manager — we enter it manually
-        # and keep it alive until stop_server.
-        # If session init fails, we must clean up the transport context.
-        ctx = stdio_client(params)
-        streams = await ctx.__aenter__()
-        state.client = ctx
-        state.read_stream = streams[0]
-        state.write_stream = streams[1]
-
-        try:
-            session = ClientSession(state.read_stream, state.write_stream)
-            await session.__aenter__()
-            await session.initialize()
-            state.session = session
-        except Exception:
-            await ctx.__aexit__(None, None, None)
-            state.client = None
-            raise
+        await self._open_session(state, stdio_client(params))
 
     async def _connect_remote_with_timeout(
         self,
@@ -437,52 +494,21 @@ class MCPManager:
 
     async def _connect_sse(self, state: _ServerState, auth=None) -> None:
         """Connect to an MCP server via SSE (Server-Sent Events)."""
-        from mcp import ClientSession
         from mcp.client.sse import sse_client
 
         kwargs: dict[str, Any] = {"url": state.config.url}
         if auth is not None:
             kwargs["auth"] = auth
-        ctx = sse_client(**kwargs)
-        streams = await ctx.__aenter__()
-        state.client = ctx
-        state.read_stream = streams[0]
-        state.write_stream = streams[1]
-
-        try:
-            session = ClientSession(state.read_stream, state.write_stream)
-            await session.__aenter__()
-            await session.initialize()
-            state.session = session
-        except Exception:
-            await ctx.__aexit__(None, None, None)
-            state.client = None
-            raise
+        await self._open_session(state, sse_client(**kwargs))
 
     async def _connect_streamable_http(self, state: _ServerState, auth=None) -> None:
         """Connect to an MCP server via Streamable HTTP transport."""
-        from mcp import ClientSession
         from mcp.client.streamable_http import streamablehttp_client
 
         kwargs: dict[str, Any] = {"url": state.config.url}
         if auth is not None:
             kwargs["auth"] = auth
-        ctx = streamablehttp_client(**kwargs)
-        streams = await ctx.__aenter__()
-        state.client = ctx
-        # streamablehttp_client yields (read, write, get_session_id)
-        state.read_stream = streams[0]
-        state.write_stream = streams[1]
-
-        try:
-            session = ClientSession(state.read_stream, state.write_stream)
-            await session.__aenter__()
-            await session.initialize()
-            state.session = session
-        except Exception:
-            await ctx.__aexit__(None, None, None)
-            state.client = None
-            raise
+        await self._open_session(state, streamablehttp_client(**kwargs))
 
     async def _discover_tools(self, state: _ServerState) -> None:
         """Discover tools from a connected MCP session."""
@@ -501,7 +527,7 @@ class MCPManager:
 
     async def stop_server(self, name: str) -> bool:
         """Stop a running MCP server. Returns True if it was running."""
-        async with self._lock:
+        async with self._server_lock(name):
             state = self._servers.pop(name, None)
             if state is None:
                 return False
@@ -511,25 +537,21 @@ class MCPManager:
 
     async def stop_all(self) -> None:
         """Stop all running MCP servers."""
-        async with self._lock:
-            for name in list(self._servers):
-                state = self._servers.pop(name)
-                await self._cleanup_state(state)
-            logger.info("All MCP servers stopped")
+        for name in list(self._servers):
+            async with self._server_lock(name):
+                state = self._servers.pop(name, None)
+                if state is not None:
+                    await self._cleanup_state(state)
+        logger.info("All MCP servers stopped")
 
     async def _cleanup_state(self, state: _ServerState) -> None:
-        """Clean up a server state's resources."""
-        try:
-            if state.session:
-                await state.session.__aexit__(None, None, None)
-        except Exception as e:
-            logger.debug("Error closing MCP session: %s", e)
+        """Clean up a server state's resources (session, then transport)."""
         try:
-            if state.client:
-                await state.client.__aexit__(None, None, None)
+            await state.exit_stack.aclose()
         except Exception as e:
-            logger.debug("Error closing MCP client: %s", e)
+            logger.debug("Error closing MCP server '%s': %s", state.config.name, e)
         state.connected = False
+        self._all_tools = None
 
     def discover_tools(self, name: str) -> list[MCPToolInfo]:
         """Return cached tools for a given server (synchronous)."""
@@ -540,11 +562,11 @@ class MCPManager:
 
     def get_all_tools(self) -> list[MCPToolInfo]:
         """Return all tools from all connected servers."""
-        tools: list[MCPToolInfo] = []
-        for state in self._servers.values():
-            if state.connected:
-                tools.extend(state.tools)
-        return tools
+        if self._all_tools is None:
+            self._all_tools = [
+                tool for state in self._servers.values() if state.connected for tool in state.tools
+            ]
+        return list(self._all_tools)
 
     async def call_tool(
         self, server_name: str, tool_name: str, arguments: dict[str, Any] | None = None
@@ -557,11 +579,8 @@ class MCPManager:
         try:
             result = await state.session.call_tool(tool_name, arguments or {})
             # Extract text from result content blocks
-            texts = []
-            for block in result.content:
-                if hasattr(block, "text"):
-                    texts.append(block.text)
-            return "\n".join(texts) if texts else "(no output)"
+            text = "\n".join(block.text for block in result.content if hasattr(block, "text"))
+            return text or "(no output)"
         except Exception as e:
             logger.error("MCP tool call failed (%s/%s): %s", server_name, tool_name, e)
             return f"Error calling {tool_name}: {e}"
@@ -571,43 +590,20 @@ class MCPManager:
 
         Merges config-file servers with runtime state so that servers
         that were never started (or were stopped) still appear in the UI.
+        Config order is kept; runtime-only servers follow.
         """
-        result = {}
-        # First, include all servers from the config file
-        for cfg in load_mcp_config():
-            info: dict = {
-                "connected": False,
-                "tool_count": 0,
-                "error": "",
-                "transport": cfg.transport,
-                "enabled": cfg.enabled,
-            }
-            if cfg.registry_ref:
-                info["registry_ref"] = cfg.registry_ref
-            result[cfg.name] = info
-        # Overlay runtime state for servers that have been started
-        for name, state in self._servers.items():
-            # A server in _servers that isn't connected and has no error is still starting
-            connecting = not state.connected and not state.error
-            info = {
-                "connected": state.connected,
-                "connecting": connecting,
-                "tool_count": len(state.tools),
-                "error": state.error,
-                "transport": state.config.transport,
-                "enabled": state.config.enabled,
-            }
-            if state.config.registry_ref:
-                info["registry_ref"] = state.config.registry_ref
-            result[name] = info
+        live = self._servers
+        result = {cfg.name: _status_row(cfg, live.get(cfg.name)) for cfg in load_mcp_config()}
+        for name, state in live.items():
+            if name not in result:
+                result[name] = _status_row(state.config, state)
         return result
 
     async def start_enabled_servers(self) -> None:
         """Start all enabled servers from config (in parallel).
 
-        Each server connects independently so a slow/failing server
-        doesn't block the others. Safe to call without the global lock
-        because each server writes to its own key in ``_servers``.
+        Each server connects independently under its own lock, so a
+        slow/failing server doesn't block the others.
         """
         configs = load_mcp_config()
         enabled = [c for c in configs if c.enabled]
@@ -615,11 +611,11 @@ class MCPManager:
             return
 
         if len(enabled) == 1:
-            await self._start_server_inner(enabled[0])
+            await self.start_server(enabled[0])
             return
 
         results = await asyncio.gather(
-            *(self._start_server_inner(c) for c in enabled),
+            *(self.start_server(c) for c in enabled),
             return_exceptions=True,
         )
         for config, result in zip(enabled, results):
@@ -660,19 +656,27 @@ class MCPManager:
 
 # Singleton
 _manager: MCPManager | None = None
+_manager_lock = threading.Lock()
 
 
 def get_mcp_manager() -> MCPManager:
-    """Get the singleton MCPManager instance."""
+    """Get the singleton MCPManager instance.
+
+    Double-checked: the lock is only taken until the first instance exists, so
+    concurrent first callers can't create two managers (and two sets of servers).
+    """
     global _manager
     if _manager is None:
-        _manager = MCPManager()
+        with _manager_lock:
+            if _manager is None:
+                manager = MCPManager()
 
-        from pocketpaw.lifecycle import register
+                from pocketpaw.lifecycle import register
 
-        def _reset():
-            global _manager
-            _manager = None
+                def _reset():
+                    global _manager
+                    _manager = None
 
-        register("mcp_manager", shutdown=_manager.stop_all, reset=_reset)
+                register("mcp_manager", shutdown=manager.stop_all, reset=_reset)
+                _manager = manager
     return _manager
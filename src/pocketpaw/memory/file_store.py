@@ -2,6 +2,18 @@
 # Created: 2026-02-02 - Memory System
 # Updated: 2026-02-09 - Fixed UUID collision, daily file loading, search, persistent delete
 # Updated: 2026-02-10 - Session index for fast listing, delete/rename support
+# Updated: 2026-10-16 - Index updates reuse the indexed title, rebuild keeps user renames;
+#   per-message index updates coalesced into one delayed write; rebuild parses raw bytes;
+#   rebuild lists with os.scandir (thread pool for large dirs); session/index/alias JSON
+#   written as bytes, via orjson when installed; rebuild skips files too small to hold a
+#   message; per-user MEMORY.md paths cached; lazy word->session search index; search scans
+#   an in-memory copy of the message text on the search pool; repeated searches answered
+#   from a small LRU; cached text keeps a lowercased copy; search lists session files with
+#   os.scandir; deleting a session drops its words from the search index; tokenizer, section
+#   and #tag regexes compiled once; oversized sessions byte-scanned before parsing; search
+#   cache build uses the thread pool for large dirs; _index.json re-parsed only when its
+#   mtime/size change; search disk reads run on their own thread pool;
+#   rebuild_session_index_async() scans on a thread.
 #
 # Stores memories as markdown files for human readability:
 # - ~/.pocketpaw/memory/MEMORY.md     (long-term)
@@ -10,14 +22,190 @@
 # - ~/.pocketpaw/memory/sessions/_index.json (session metadata index)
 
 import asyncio
+import atexit
 import json
+import os
 import re
+import time
 import uuid
+import weakref
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, date, datetime
 from pathlib import Path
+from typing import TypeVar
 
+from pocketpaw._compat import json_dumps, json_loads
 from pocketpaw.memory.protocol import MemoryEntry, MemoryType
 
+_T = TypeVar("_T")
+
+# Per-message session index updates are batched into one write this many seconds later
+_INDEX_FLUSH_DELAY = 0.1
+
+# Index rebuilds and search cache builds over at least this many session files
+# read them on a thread pool
+_PARALLEL_REBUILD_MIN_FILES = 64
+
+# Word runs indexed for search_sessions (any substring match lies inside one)
+_SEARCH_WORD_RE = re.compile(r"\w+")
+
+# Sessions with more message text than this are searched from disk, not memory
+_SEARCH_CACHE_MAX_CHARS = 50_000
+
+# Recent search_sessions results kept per store, and how long (seconds) they stay fresh
+_SEARCH_RESULT_CACHE_SIZE = 128
+_SEARCH_RESULT_TTL = 60.0
+
+# Threads for search_sessions disk reads, so a cold search cache build doesn't
+# hold default-executor workers that session saves need (created on first search)
+_SEARCH_IO_WORKERS = 4
+_search_executor: ThreadPoolExecutor | None = None
+
+# Stores holding index updates that have not reached _index.json yet
+_pending_index_flush: "weakref.WeakSet[FileMemoryStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_pending_session_indexes() -> None:
+    for store in list(_pending_index_flush):
+        store._flush_session_index()
+
+
+def _session_file_paths(sessions_path: Path, *, skip_empty: bool = False) -> list[str]:
+    """Paths of the session JSON files, leaving out _*.json and *_compaction.json.
+
+    Names are filtered before anything is stat'ed. With *skip_empty*, files too
+    small to hold a message ("[]" or less) are left out as well.
+    """
+    paths = []
+    with os.scandir(sessions_path) as it:
+        for entry in it:
+            name = entry.name
+            if (
+                not name.endswith(".json")
+                or name.startswith("_")
+                or name.endswith("_compaction.json")
+            ):
+                continue
+            try:
+                if entry.is_file() and (not skip_empty or entry.stat().st_size > 2):
+                    paths.append(entry.path)
+            except OSError:
+                continue
+    return paths
+
+
+def _get_search_executor() -> ThreadPoolExecutor:
+    """The shared search_sessions thread pool, created on first use."""
+    global _search_executor
+    if _search_executor is None:
+        _search_executor = ThreadPoolExecutor(
+            max_workers=_SEARCH_IO_WORKERS, thread_name_prefix="pocketpaw-search"
+        )
+    return _search_executor
+
+
+def _map_session_files(func: Callable[[str], _T], paths: list[str]) -> list[_T]:
+    """[func(path) for path in paths], on a thread pool once there are enough paths."""
+    if len(paths) < _PARALLEL_REBUILD_MIN_FILES:
+        return [func(path) for path in paths]
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, paths))
+
+
+def _raw_may_match(raw: bytes, needle: str) -> bool:
+    """False only when the session file bytes *raw* cannot hold *needle* (lowercased).
+
+    Decides from the bytes alone when both sides are plain ASCII: the needle
+    without quotes, backslashes or control characters (which JSON escapes), the
+    file without \\u escapes. Anything else, e.g. a non-ASCII character that
+    lowercases to ASCII, needs the parsed text.
+    """
+    if not (needle.isascii() and raw.isascii()) or b"\\u" in raw:
+        return True
+    if '"' in needle or "\\" in needle or any(ord(ch) < 0x20 for ch in needle):
+        return True
+    return needle.encode() in raw.lower()
+
+
+def _session_index_entry(path: str) -> dict | None:
+    """Build the _index.json entry for one session file (None if unreadable/empty)."""
+    try:
+        data = json_loads(Path(path).read_bytes())
+        if not data or not isinstance(data, list):
+            return None
+
+        # Derive channel from safe_key (format: "channel_uuid")
+        parts = os.path.basename(path)[:-5].split("_", 1)
+        channel = parts[0] if len(parts) > 1 else "unknown"
+
+        # First user message as title
+        title = "New Chat"
+        for msg in data:
+            if msg.get("role") == "user" and msg.get("content", "").strip():
+                title = msg["content"].strip()[:80]
+                break
+
+        first_msg = data[0]
+        last_msg = data[-1]
+
+        return {
+            "title": title,
+            "channel": channel,
+            "created": first_msg.get("timestamp", ""),
+            "last_activity": last_msg.get("timestamp", ""),
+            "message_count": len(data),
+            "preview": last_msg.get("content", "")[:120],
+        }
+    except (json.JSONDecodeError, KeyError, OSError):
+        return None
+
+
+def _read_session_messages(path: str) -> tuple[list[tuple[str, str, str]], set[str]] | None:
+    """(role, content, content.lower()) per message plus the words, None if unreadable."""
+    try:
+        data = json_loads(Path(path).read_bytes())
+        messages = []
+        words: set[str] = set()
+        for msg in data:
+            content = msg.get("content", "")
+            lowered = content.lower()
+            messages.append((msg.get("role", ""), content, lowered))
+            words.update(_SEARCH_WORD_RE.findall(lowered))
+    except (json.JSONDecodeError, OSError, AttributeError, TypeError):
+        return None
+    return messages, words
+
+
+def _build_session_search_cache(
+    sessions_path: Path,
+) -> tuple[dict[str, list[tuple[str, str, str]] | None], dict[str, set[str]], dict[str, set[str]]]:
+    """Read every session file once for search_sessions.
+
+    Returns (safe_key -> [(role, content, content.lower()), ...], word ->
+    safe_keys, safe_key -> words). Sessions with more than
+    _SEARCH_CACHE_MAX_CHARS of text map to None instead of their messages;
+    they are still in the word index.
+    """
+    texts: dict[str, list[tuple[str, str, str]] | None] = {}
+    terms: dict[str, set[str]] = {}
+    session_words: dict[str, set[str]] = {}
+    session_files = _session_file_paths(sessions_path)
+    parsed_files = _map_session_files(_read_session_messages, session_files)
+    for path, parsed in zip(session_files, parsed_files):
+        if parsed is None:
+            continue
+        messages, words = parsed
+        safe_key = os.path.basename(path)[:-5]  # strip ".json"
+        size = sum(len(content) for _, content, _ in messages)
+        texts[safe_key] = messages if size <= _SEARCH_CACHE_MAX_CHARS else None
+        session_words[safe_key] = words
+        for word in words:
+            terms.setdefault(word, set()).add(safe_key)
+    return texts, terms, session_words
+
 
 def _ensure_utc(dt: datetime) -> datetime:
     """Ensure a datetime is timezone-aware (UTC)."""
@@ -145,9 +333,14 @@ def _make_deterministic_id(path: Path, header: str, body: str) -> str:
     return str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{path}:{header}:{body}"))
 
 
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SECTION_SPLIT_RE = re.compile(r"\n(?=##+ )")  # before each ## / ### header
+_TAG_RE = re.compile(r"#(\w+)")
+
+
 def _tokenize(text: str) -> set[str]:
     """Lowercase, split on non-alpha, strip stop words."""
-    words = set(re.findall(r"[a-z0-9]+", text.lower()))
+    words = set(_TOKEN_RE.findall(text.lower()))
     return words - _STOP_WORDS
 
 
@@ -172,9 +365,26 @@ class FileMemoryStore:
 
         # In-memory index for fast lookup
         self._index: dict[str, MemoryEntry] = {}
+        self._user_memory_files: dict[str, Path] = {}  # user_id -> MEMORY.md (dir created)
         self._session_write_locks: dict[str, asyncio.Lock] = {}
         self._session_index_lock = asyncio.Lock()  # Protects _index.json read-modify-write
         self._alias_lock = asyncio.Lock()  # Protects _aliases.json read-modify-write
+        # Index with unflushed updates, and the timer that will write it. With no
+        # write pending it is the parsed _index.json whose (mtime_ns, size) is
+        # _session_index_stat.
+        self._session_index_cache: dict = {}
+        self._session_index_stat: tuple[int, int] | None = None
+        self._session_index_flush: asyncio.TimerHandle | None = None
+        self._session_index_flush_loop: asyncio.AbstractEventLoop | None = None
+        # Message text, word -> session keys and session key -> words for
+        # search_sessions, built on the first search and then patched one
+        # session at a time by saves and deletes.
+        self._session_texts: dict[str, list[tuple[str, str, str]] | None] | None = None
+        self._session_terms: dict[str, set[str]] = {}
+        self._session_words: dict[str, set[str]] = {}
+        self._sessions_generation = 0  # Bumped on every session write
+        # (query_lower, limit) -> (monotonic time, generation, results), oldest first
+        self._search_results: dict[tuple[str, int], tuple[float, int, list[dict]]] = {}
         self._load_index()
 
         # Build session index on first run (migration)
@@ -191,19 +401,68 @@ class FileMemoryStore:
         return self.sessions_path / "_index.json"
 
     def _load_session_index(self) -> dict:
-        """Read session index from disk. Returns empty dict if missing/corrupt."""
-        if not self._index_path.exists():
+        """Read session index from disk. Returns empty dict if missing/corrupt.
+
+        While a batched write is pending the in-memory index is newer than the
+        file, so that is returned instead. Otherwise the last parse is reused
+        until the file's mtime or size changes.
+        """
+        if self._session_index_flush is not None:
+            return self._session_index_cache
+        try:
+            st = self._index_path.stat()
+        except OSError:
             return {}
+        if (st.st_mtime_ns, st.st_size) == self._session_index_stat:
+            return self._session_index_cache
         try:
-            return json.loads(self._index_path.read_text(encoding="utf-8"))
+            index = json_loads(self._index_path.read_bytes())
         except (json.JSONDecodeError, OSError):
             return {}
+        self._session_index_cache = index
+        self._session_index_stat = (st.st_mtime_ns, st.st_size)
+        return index
 
     def _save_session_index(self, index: dict) -> None:
         """Atomic write of session index (write to .tmp then rename)."""
+        if self._session_index_flush is not None:
+            self._session_index_flush.cancel()
+            self._session_index_flush = self._session_index_flush_loop = None
+            _pending_index_flush.discard(self)
         tmp = self._index_path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(index, indent=2), encoding="utf-8")
+        tmp.write_bytes(json_dumps(index, indent=True))
+        st = tmp.stat()
         tmp.replace(self._index_path)
+        self._session_index_cache = index
+        self._session_index_stat = (st.st_mtime_ns, st.st_size)
+
+    def _schedule_session_index_save(self, index: dict) -> None:
+        """Save the index after _INDEX_FLUSH_DELAY, folding in any updates made meanwhile.
+
+        The timer callback runs on the event loop with no await inside, so it
+        cannot interleave with a locked read-modify-write of the index.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        pending = self._session_index_flush is not None
+        if loop is None or (pending and self._session_index_flush_loop is not loop):
+            # No loop to batch on, or the timer belongs to another (maybe closed) loop
+            self._save_session_index(index)
+            return
+        self._session_index_cache = index
+        if not pending:
+            self._session_index_flush = loop.call_later(
+                _INDEX_FLUSH_DELAY, self._flush_session_index
+            )
+            self._session_index_flush_loop = loop
+            _pending_index_flush.add(self)
+
+    def _flush_session_index(self) -> None:
+        """Write a pending batched index update now (no-op if nothing is pending)."""
+        if self._session_index_flush is not None:
+            self._save_session_index(self._session_index_cache)
 
     # =========================================================================
     # Session Aliases
@@ -219,14 +478,14 @@ class FileMemoryStore:
         if not self._aliases_path.exists():
             return {}
         try:
-            return json.loads(self._aliases_path.read_text(encoding="utf-8"))
+            return json_loads(self._aliases_path.read_bytes())
         except (json.JSONDecodeError, OSError):
             return {}
 
     def _save_aliases(self, aliases: dict[str, str]) -> None:
         """Atomic write of aliases file (write to .tmp then rename)."""
         tmp = self._aliases_path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(aliases, indent=2), encoding="utf-8")
+        tmp.write_bytes(json_dumps(aliases, indent=True))
         tmp.replace(self._aliases_path)
 
     async def resolve_session_alias(self, session_key: str) -> str:
@@ -289,12 +548,17 @@ class FileMemoryStore:
             parts = session_key.split(":", 1)
             channel = parts[0] if len(parts) > 1 else "unknown"
 
-            # Find first user message for title
-            title = ""
-            for msg in session_data:
-                if msg.get("role") == "user" and msg.get("content", "").strip():
-                    title = msg["content"].strip()[:80]
-                    break
+            # Sessions only grow by appending, so once the index holds a real
+            # title for fewer messages it is still the first user message.
+            existing = index.get(safe_key, {})
+            title = existing.get("title", "")
+            if title == "New Chat" or not 0 < existing.get("message_count", 0) < len(session_data):
+                # Find first user message for title
+                title = ""
+                for msg in session_data:
+                    if msg.get("role") == "user" and msg.get("content", "").strip():
+                        title = msg["content"].strip()[:80]
+                        break
             if not title:
                 title = "New Chat"
 
@@ -308,7 +572,6 @@ class FileMemoryStore:
             last_activity = last_msg.get("timestamp", datetime.now(tz=UTC).isoformat())
 
             # Preserve existing title if user renamed it
-            existing = index.get(safe_key, {})
             if existing.get("user_title"):
                 title = existing["user_title"]
 
@@ -324,47 +587,57 @@ class FileMemoryStore:
             if existing.get("user_title"):
                 index[safe_key]["user_title"] = existing["user_title"]
 
-            self._save_session_index(index)
+            self._schedule_session_index_save(index)
 
     def rebuild_session_index(self) -> dict:
-        """Full directory scan to build index from all session files."""
-        index: dict = {}
-        for session_file in self.sessions_path.glob("*.json"):
-            if session_file.name.startswith("_") or session_file.name.endswith("_compaction.json"):
-                continue
+        """Full directory scan to build index from all session files.
 
-            safe_key = session_file.stem
-            try:
-                data = json.loads(session_file.read_text(encoding="utf-8"))
-                if not data or not isinstance(data, list):
-                    continue
+        Only needed when _index.json is missing or damaged; saves keep it current.
+        User-chosen titles in a readable existing index are carried over.
+        """
+        index = self._scan_session_index(self._session_user_titles())
+        self._save_session_index(index)
+        self._sessions_generation += 1
+        return index
 
-                # Derive channel from safe_key (format: "channel_uuid")
-                parts = safe_key.split("_", 1)
-                channel = parts[0] if len(parts) > 1 else "unknown"
+    async def rebuild_session_index_async(self) -> dict:
+        """rebuild_session_index() with the file scan on a worker thread.
 
-                # First user message as title
-                title = "New Chat"
-                for msg in data:
-                    if msg.get("role") == "user" and msg.get("content", "").strip():
-                        title = msg["content"].strip()[:80]
-                        break
+        Holds the index lock throughout, so per-message updates and renames
+        wait for the rebuilt index instead of being overwritten by it.
+        """
+        async with self._session_index_lock:
+            self._flush_session_index()
+            renamed = self._session_user_titles()
+            index = await asyncio.to_thread(self._scan_session_index, renamed)
+            self._save_session_index(index)
+            self._sessions_generation += 1
+        return index
 
-                first_msg = data[0]
-                last_msg = data[-1]
-
-                index[safe_key] = {
-                    "title": title,
-                    "channel": channel,
-                    "created": first_msg.get("timestamp", ""),
-                    "last_activity": last_msg.get("timestamp", ""),
-                    "message_count": len(data),
-                    "preview": last_msg.get("content", "")[:120],
-                }
-            except (json.JSONDecodeError, KeyError, OSError):
-                continue
+    def _session_user_titles(self) -> dict[str, str]:
+        """safe_key -> user-chosen title, from the current index."""
+        return {
+            key: meta["user_title"]
+            for key, meta in self._load_session_index().items()
+            if isinstance(meta, dict) and meta.get("user_title")
+        }
 
-        self._save_session_index(index)
+    def _scan_session_index(self, renamed: dict[str, str]) -> dict:
+        """Build a fresh index from the session files, applying *renamed* titles.
+
+        Only reads files (never the cached index), so it can run off the loop.
+        """
+        session_files = _session_file_paths(self.sessions_path, skip_empty=True)
+        entries = _map_session_files(_session_index_entry, session_files)
+
+        index: dict = {}
+        for path, meta in zip(session_files, entries):
+            if meta is None:
+                continue
+            safe_key = os.path.basename(path)[:-5]  # strip ".json"
+            if safe_key in renamed:
+                meta["title"] = meta["user_title"] = renamed[safe_key]
+            index[safe_key] = meta
         return index
 
     async def delete_session(self, session_key: str) -> bool:
@@ -379,6 +652,7 @@ class FileMemoryStore:
         session_file.unlink()
         if compaction_file.exists():
             compaction_file.unlink()
+        self._drop_from_search_cache(safe_key)
 
         # Remove from index (protected by lock to prevent lost updates)
         async with self._session_index_lock:
@@ -401,58 +675,175 @@ class FileMemoryStore:
             index[safe_key]["title"] = title
             index[safe_key]["user_title"] = title  # Mark as user-renamed
             self._save_session_index(index)
+        self._sessions_generation += 1  # Cached search results carry the old title
         return True
 
-    async def search_sessions(self, query: str, limit: int = 20) -> list[dict]:
-        """Search session files for messages matching *query*.
+    def _add_to_search_cache(self, safe_key: str, role: str | None, content: str) -> None:
+        """Record a saved message in the search_sessions cache (if built)."""
+        self._sessions_generation += 1
+        if self._session_texts is None:
+            return
+        lowered = content.lower()
+        messages = self._session_texts.setdefault(safe_key, [])
+        if messages is not None:
+            messages.append((role, content, lowered))
+            if sum(len(text) for _, text, _ in messages) > _SEARCH_CACHE_MAX_CHARS:
+                self._session_texts[safe_key] = None
+        words = self._session_words.setdefault(safe_key, set())
+        for word in set(_SEARCH_WORD_RE.findall(lowered)) - words:
+            self._session_terms.setdefault(word, set()).add(safe_key)
+            words.add(word)
+
+    def _drop_from_search_cache(self, safe_key: str) -> None:
+        """Forget a deleted/cleared session in the search_sessions cache."""
+        self._sessions_generation += 1
+        if self._session_texts is None:
+            return
+        self._session_texts.pop(safe_key, None)
+        for word in self._session_words.pop(safe_key, ()):
+            keys = self._session_terms.get(word)
+            if keys is not None:
+                keys.discard(safe_key)
+                if not keys:
+                    del self._session_terms[word]
 
-        All blocking I/O (glob, read_text, json.loads) runs inside
-        ``asyncio.to_thread`` so the event loop is never blocked.
+    async def search_sessions(self, query: str, limit: int = 20) -> list[dict]:
+        """Search session messages for *query* (case-insensitive substring).
+
+        The first search reads every session file on a worker thread into an
+        in-memory copy of the message text plus a word -> session index; saves
+        keep both current, so later searches scan memory and only go to disk
+        for the session index metadata and for sessions too large to cache.
+        Both the scan and the disk reads run on the search thread pool, so the
+        event loop is never blocked.  Session files changed by another process
+        after that first read are not seen.
+
+        Every word of the query must lie within a word of a matching message,
+        so the word index narrows the scan to the sessions holding all of
+        them.  Queries without word characters scan every session.
+
+        Results are cached per (query, limit) until the next session change,
+        or for _SEARCH_RESULT_TTL seconds at most.
         """
         if not query or not query.strip():
             return []
 
         query_lower = query.lower()
+        cache_key = (query_lower, limit)
+        cached = self._search_results.pop(cache_key, None)
+        if cached is not None:
+            stamp, generation, results = cached
+            if (
+                generation == self._sessions_generation
+                and time.monotonic() - stamp < _SEARCH_RESULT_TTL
+            ):
+                self._search_results[cache_key] = cached  # most recently used
+                return [dict(result) for result in results]
+
+        generation = self._sessions_generation
+        results = await self._search_sessions_uncached(query_lower, limit)
+        if generation == self._sessions_generation:
+            self._search_results[cache_key] = (time.monotonic(), generation, results)
+            if len(self._search_results) > _SEARCH_RESULT_CACHE_SIZE:
+                del self._search_results[next(iter(self._search_results))]
+        return [dict(result) for result in results]
+
+    async def _search_sessions_uncached(self, query_lower: str, limit: int) -> list[dict]:
+        """search_sessions without the result cache."""
+        texts, terms = self._session_texts, self._session_terms
+        if texts is None:
+            generation = self._sessions_generation
+            texts, terms, session_words = await asyncio.get_running_loop().run_in_executor(
+                _get_search_executor(), _build_session_search_cache, self.sessions_path
+            )
+            # A save during the build may be missing from it; rebuild next time
+            if generation == self._sessions_generation:
+                self._session_texts, self._session_terms = texts, terms
+                self._session_words = session_words
+
         sessions_path = self.sessions_path
         index_path = self._index_path
+        # Unflushed index updates exist only in memory; snapshot them here
+        pending_index = (
+            dict(self._session_index_cache) if self._session_index_flush is not None else None
+        )
 
         def _search_sync() -> list[dict]:
-            # Load index inside the thread so its file I/O doesn't block
-            # the event loop either.
-            try:
-                index_snapshot = json.loads(index_path.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError, FileNotFoundError):
-                index_snapshot = {}
-            results: list[dict] = []
-            for session_file in sessions_path.glob("*.json"):
-                if session_file.name.startswith("_") or session_file.name.endswith(
-                    "_compaction.json"
-                ):
+            # Matching runs here, off the event loop, over the live cache.
+            # dict()/list() copy each dict in one call under the GIL, so saves
+            # on the loop can't resize them mid-iteration; a message saved
+            # after the copy may be missed, as with any search racing a save.
+            candidates: set[str] | None = None
+            for word in set(_SEARCH_WORD_RE.findall(query_lower)):
+                hits: set[str] = set()
+                for term, keys in list(terms.items()):
+                    if word in term:
+                        hits |= keys
+                candidates = hits if candidates is None else candidates & hits
+                if not candidates:
+                    return []
+
+            matches: list[tuple[str, str, str]] = []  # (safe_key, role, content)
+            uncached: list[str] = []
+            cached = dict(texts)
+            for safe_key in list(cached) if candidates is None else sorted(candidates):
+                if safe_key not in cached:
+                    continue  # deleted since it was indexed
+                messages = cached[safe_key]
+                if messages is None:
+                    uncached.append(safe_key)
                     continue
+                for role, content, lowered in messages:
+                    if query_lower in lowered:
+                        matches.append((safe_key, role, content))
+                        break
+                if len(matches) >= limit:
+                    break
+            if not matches and not uncached:
+                return []
+
+            # Oversized sessions and the index are read here too, so their
+            # file I/O doesn't block the event loop either.
+            for safe_key in uncached:
+                if len(matches) >= limit:
+                    break
                 try:
-                    data = json.loads(session_file.read_text())
-                    for msg in data:
-                        if query_lower in msg.get("content", "").lower():
-                            safe_key = session_file.stem
-                            meta = index_snapshot.get(safe_key, {})
-                            results.append(
-                                {
-                                    "id": safe_key,
-                                    "title": meta.get("title", "Untitled"),
-                                    "channel": meta.get("channel", "unknown"),
-                                    "match": msg["content"][:200],
-                                    "match_role": msg.get("role", ""),
-                                    "last_activity": meta.get("last_activity", ""),
-                                }
-                            )
-                            break
+                    raw = (sessions_path / f"{safe_key}.json").read_bytes()
+                    if not _raw_may_match(raw, query_lower):
+                        continue
+                    data = json_loads(raw)
                 except (json.JSONDecodeError, OSError):
                     continue
-                if len(results) >= limit:
-                    break
+                for msg in data:
+                    if query_lower in msg.get("content", "").lower():
+                        matches.append((safe_key, msg.get("role", ""), msg["content"]))
+                        break
+
+            if pending_index is not None:
+                index_snapshot = pending_index
+            else:
+                try:
+                    index_snapshot = json_loads(index_path.read_bytes())
+                except (json.JSONDecodeError, OSError, FileNotFoundError):
+                    index_snapshot = {}
+            results: list[dict] = []
+            for safe_key, role, content in matches:
+                meta = index_snapshot.get(safe_key, {})
+                results.append(
+                    {
+                        "id": safe_key,
+                        "title": meta.get("title", "Untitled"),
+                        "channel": meta.get("channel", "unknown"),
+                        "match": content[:200],
+                        "match_role": role,
+                        "last_activity": meta.get("last_activity", ""),
+                    }
+                )
             return results
 
-        return await asyncio.to_thread(_search_sync)
+        return await asyncio.get_running_loop().run_in_executor(
+            _get_search_executor(), _search_sync
+        )
 
     def _load_index(self) -> None:
         """Load existing memories into index."""
@@ -487,7 +878,7 @@ class FileMemoryStore:
             pass
 
         # Split by headers (## or ###)
-        sections = re.split(r"\n(?=##+ )", content)
+        sections = _SECTION_SPLIT_RE.split(content)
 
         for section in sections:
             if not section.strip():
@@ -513,7 +904,7 @@ class FileMemoryStore:
 
     def _extract_tags(self, content: str) -> list[str]:
         """Extract #tags from content."""
-        return re.findall(r"#(\w+)", content)
+        return _TAG_RE.findall(content)
 
     def _get_user_memory_file(self, user_id: str = "default") -> Path:
         """Get the MEMORY.md path for a given user.
@@ -523,9 +914,12 @@ class FileMemoryStore:
         """
         if user_id == "default":
             return self.long_term_file
-        user_dir = self.base_path / "users" / user_id
-        user_dir.mkdir(parents=True, exist_ok=True)
-        return user_dir / "MEMORY.md"
+        path = self._user_memory_files.get(user_id)
+        if path is None:
+            user_dir = self.base_path / "users" / user_id
+            user_dir.mkdir(parents=True, exist_ok=True)
+            path = self._user_memory_files[user_id] = user_dir / "MEMORY.md"
+        return path
 
     def _get_daily_file(self, d: date) -> Path:
         """Get the path for a daily notes file."""
@@ -604,7 +998,7 @@ class FileMemoryStore:
                 session_data = []
                 if session_file.exists():
                     try:
-                        session_data = json.loads(session_file.read_text())
+                        session_data = json_loads(session_file.read_bytes())
                     except json.JSONDecodeError:
                         pass
                 session_data.append(
@@ -618,12 +1012,14 @@ class FileMemoryStore:
                 )
                 # Atomic write: tmp file + replace to prevent corruption on crash
                 tmp = session_file.with_suffix(".tmp")
-                tmp.write_text(json.dumps(session_data, indent=2))
+                tmp.write_bytes(json_dumps(session_data, indent=True))
                 tmp.replace(session_file)
                 return session_data
 
             session_data = await asyncio.to_thread(_read_and_append)
 
+            self._add_to_search_cache(session_file.stem, entry.role, entry.content)
+
             # Update session index
             await self._update_session_index(entry.session_key, entry, session_data)
 
@@ -739,8 +1135,8 @@ class FileMemoryStore:
             return []
 
         try:
-            raw = await asyncio.to_thread(session_file.read_text)
-            data = json.loads(raw)
+            raw = await asyncio.to_thread(session_file.read_bytes)
+            data = json_loads(raw)
             return [
                 MemoryEntry(
                     id=item["id"],
@@ -759,11 +1155,12 @@ class FileMemoryStore:
     async def clear_session(self, session_key: str) -> int:
         """Clear session history."""
         session_file = self._get_session_file(session_key)
+        self._drop_from_search_cache(session_file.stem)
 
         def _clear():
             if session_file.exists():
                 try:
-                    data = json.loads(session_file.read_text())
+                    data = json_loads(session_file.read_bytes())
                     count = len(data)
                     session_file.unlink()
                     return count
@@ -3,10 +3,12 @@
 # Updated: 2026-02-04 - Added Mem0 backend support
 # Updated: 2026-02-07 - Configurable providers, auto-learn, semantic context - Memory System
 # Updated: 2026-02-11 - Sender-scoped memory isolation
+# Updated: 2026-10-16 - Memoize the per-sender user_id hash
 
 import hashlib
 import logging
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -16,6 +18,12 @@ from pocketpaw.memory.protocol import MemoryEntry, MemoryStoreProtocol, MemoryTy
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _hash_sender_id(sender_id: str) -> str:
+    """sha256(sender_id)[:16] — the on-disk user_id, so the algorithm must not change."""
+    return hashlib.sha256(sender_id.encode()).hexdigest()[:16]
+
+
 def create_memory_store(
     backend: str = "file",
     base_path: Path | None = None,
@@ -175,7 +183,7 @@ class MemoryManager:
         if sender_id == settings.owner_id:
             return "default"
 
-        return hashlib.sha256(sender_id.encode()).hexdigest()[:16]
+        return _hash_sender_id(sender_id)
 
     # =========================================================================
     # High-Level Operations
@@ -1,6 +1,8 @@
 # Mem0-based memory store implementation.
 # Created: 2026-02-04
 # Updated: 2026-02-07 — Configurable LLM/embedder/vector providers, auto-learn
+# Updated: 2026-10-16 — read-only embedding-dims table (":latest" tags resolve to the base
+#   model); Ollama dims probes memoized per (model, url).
 #
 # Provides semantic memory with LLM-powered fact extraction and search.
 #
@@ -13,46 +15,53 @@
 import asyncio
 import logging
 from datetime import UTC, datetime
-from functools import partial
+from functools import lru_cache, partial
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 from pocketpaw.memory.protocol import MemoryEntry, MemoryType
 
 logger = logging.getLogger(__name__)
 
-# Embedding dimensions by model
-_EMBEDDING_DIMS = {
-    "text-embedding-3-small": 1536,
-    "text-embedding-3-large": 3072,
-    "text-embedding-ada-002": 1536,
-    "nomic-embed-text": 768,
-    "nomic-embed-text:latest": 768,
-    "mxbai-embed-large": 1024,
-    "mxbai-embed-large:latest": 1024,
-    "all-minilm": 384,
-    "all-minilm:latest": 384,
-    "snowflake-arctic-embed": 1024,
-    "qwen3-embedding:0.6b": 1024,
-    "qwen3-embedding:latest": 1024,
-}
+# Embedding dimensions by model (Ollama ":latest" tags are looked up by base name)
+_EMBEDDING_DIMS = MappingProxyType(
+    {
+        "text-embedding-3-small": 1536,
+        "text-embedding-3-large": 3072,
+        "text-embedding-ada-002": 1536,
+        "nomic-embed-text": 768,
+        "mxbai-embed-large": 1024,
+        "all-minilm": 384,
+        "snowflake-arctic-embed": 1024,
+        "qwen3-embedding": 1024,
+        "qwen3-embedding:0.6b": 1024,
+    }
+)
+
+
+@lru_cache(maxsize=32)
+def _probe_ollama_embedding_dims(model: str, base_url: str) -> int:
+    """Ask Ollama for a model's embedding size. Raises on failure so misses aren't cached."""
+    import httpx
+
+    resp = httpx.post(
+        f"{base_url}/api/embeddings",
+        json={"model": model, "prompt": "dim check"},
+        timeout=10.0,
+    )
+    resp.raise_for_status()
+    dims = len(resp.json().get("embedding", []))
+    if dims <= 0:
+        raise ValueError("empty embedding")
+    logger.info("Auto-detected %d dims for Ollama model %s", dims, model)
+    return dims
 
 
 def _get_ollama_embedding_dims(model: str, base_url: str) -> int | None:
     """Query Ollama for the actual embedding dimensions of a model."""
     try:
-        import httpx
-
-        resp = httpx.post(
-            f"{base_url}/api/embeddings",
-            json={"model": model, "prompt": "dim check"},
-            timeout=10.0,
-        )
-        if resp.status_code == 200:
-            dims = len(resp.json().get("embedding", []))
-            if dims > 0:
-                logger.info("Auto-detected %d dims for Ollama model %s", dims, model)
-                return dims
+        return _probe_ollama_embedding_dims(model, base_url)
     except Exception as e:
         logger.debug("Could not auto-detect embedding dims for %s: %s", model, e)
     return None
@@ -98,7 +107,7 @@ def _build_mem0_config(
         llm_config["config"] = {"model": llm_model, "temperature": 0, "max_tokens": 2000}
 
     # --- Embedder config ---
-    embedding_dims = _EMBEDDING_DIMS.get(embedder_model)
+    embedding_dims = _EMBEDDING_DIMS.get(embedder_model.removesuffix(":latest"))
     if embedding_dims is None and embedder_provider == "ollama":
         embedding_dims = _get_ollama_embedding_dims(embedder_model, ollama_base_url)
     if embedding_dims is None:
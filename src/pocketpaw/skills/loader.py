@@ -27,7 +27,7 @@ SKILL_PATHS = [
 ]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Skill:
     """Represents a loaded skill."""
 
@@ -43,6 +43,15 @@ class Skill:
     allowed_tools: list[str] = field(default_factory=list)
     metadata: dict = field(default_factory=dict)
 
+    # Lowercased name/description for SkillLoader.search()
+    _name_lc: str = field(init=False, repr=False, compare=False)
+    _desc_lc: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # frozen: set the derived fields the way the generated __init__ does
+        object.__setattr__(self, "_name_lc", self.name.lower())
+        object.__setattr__(self, "_desc_lc", self.description.lower())
+
     def build_prompt(self, args: str = "") -> str:
         """
         Build the prompt to send to the agent.
@@ -137,6 +146,9 @@ class SkillLoader:
 
         self._skills: dict[str, Skill] = {}
         self._loaded = False
+        # Invocable skills, rebuilt whenever _skills is replaced (i.e. on every load)
+        self._invocable: list[Skill] = []
+        self._invocable_for: dict[str, Skill] | None = None
 
     def load(self, force: bool = False) -> dict[str, Skill]:
         """
@@ -207,10 +219,17 @@ class SkillLoader:
 
     def get_invocable(self) -> list[Skill]:
         """Get all user-invocable skills (for slash commands)."""
+        return list(self._get_invocable())
+
+    def _get_invocable(self) -> list[Skill]:
+        """The cached invocable skills, built once per load (do not modify)."""
         if not self._loaded:
             self.load()
 
-        return [s for s in self._skills.values() if s.user_invocable]
+        if self._invocable_for is not self._skills:
+            self._invocable = [s for s in self._skills.values() if s.user_invocable]
+            self._invocable_for = self._skills
+        return self._invocable
 
     def search(self, query: str = "") -> list[Skill]:
         """Search user-invocable skills by name and description.
@@ -222,11 +241,11 @@ class SkillLoader:
         Returns:
             List of matching Skill objects.
         """
-        invocable = self.get_invocable()
+        invocable = self._get_invocable()
         if not query:
-            return invocable
+            return list(invocable)
         q = query.lower()
-        return [s for s in invocable if q in s.name.lower() or q in s.description.lower()]
+        return [s for s in invocable if q in s._name_lc or q in s._desc_lc]
 
     def list_names(self) -> list[str]:
         """Get list of all skill names."""
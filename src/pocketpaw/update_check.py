@@ -1,6 +1,8 @@
 """Startup version check against PyPI + release notes fetching.
 
 Changes:
+  - 2026-10-16: _parse_version memoized with functools.lru_cache; responses parsed with
+    orjson when installed.
   - 2026-02-18: Added styled CLI update box, release notes fetching, version seen tracking.
   - 2026-02-16: Initial implementation. Checks PyPI daily, caches result, prints update notice.
 
@@ -9,6 +11,7 @@ Cache stored in ~/.pocketpaw/.update_check so the result is shared between
 CLI launches and the dashboard API.
 """
 
+import functools
 import json
 import logging
 import os
@@ -17,6 +20,8 @@ import time
 import urllib.request
 from pathlib import Path
 
+from pocketpaw._compat import json_loads
+
 logger = logging.getLogger(__name__)
 
 PYPI_URL = "https://pypi.org/pypi/pocketpaw/json"
@@ -29,6 +34,7 @@ RELEASE_NOTES_TTL = 3600  # 1 hour
 GITHUB_API_URL = "https://api.github.com/repos/pocketpaw/pocketpaw/releases/tags/v{version}"
 
 
+@functools.lru_cache(maxsize=128)
 def _parse_version(v: str) -> tuple[int, ...]:
     """Parse '0.4.1' into (0, 4, 1)."""
     return tuple(int(x) for x in v.strip().split("."))
@@ -47,7 +53,7 @@ def check_for_updates(current_version: str, config_dir: Path) -> dict | None:
         # Try cache first
         if cache_file.exists():
             try:
-                cache = json.loads(cache_file.read_text())
+                cache = json_loads(cache_file.read_bytes())
                 if now - cache.get("ts", 0) < CACHE_TTL:
                     latest = cache.get("latest", current_version)
                     return {
@@ -62,7 +68,7 @@ def check_for_updates(current_version: str, config_dir: Path) -> dict | None:
         # Fetch from PyPI
         req = urllib.request.Request(PYPI_URL, headers={"Accept": "application/json"})
         with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
-            data = json.loads(resp.read())
+            data = json_loads(resp.read())
         latest = data["info"]["version"]
 
         # Write cache
@@ -171,7 +177,7 @@ def fetch_release_notes(version: str, config_dir: Path) -> dict | None:
         # Try cache first
         if cache_file.exists():
             try:
-                cached = json.loads(cache_file.read_text())
+                cached = json_loads(cache_file.read_bytes())
                 if now - cached.get("ts", 0) < RELEASE_NOTES_TTL:
                     return cached.get("data")
             except (json.JSONDecodeError, ValueError):
@@ -183,7 +189,7 @@ def fetch_release_notes(version: str, config_dir: Path) -> dict | None:
             url, headers={"Accept": "application/vnd.github.v3+json", "User-Agent": "pocketpaw"}
         )
         with urllib.request.urlopen(req, timeout=5) as resp:
-            release = json.loads(resp.read())
+            release = json_loads(resp.read())
 
         data = {
             "version": version,
@@ -208,7 +214,7 @@ def get_last_seen_version(config_dir: Path) -> str | None:
     try:
         cache_file = config_dir / CACHE_FILENAME
         if cache_file.exists():
-            cache = json.loads(cache_file.read_text())
+            cache = json_loads(cache_file.read_bytes())
             return cache.get("last_seen_version")
     except (json.JSONDecodeError, ValueError, OSError):
         pass
@@ -225,7 +231,7 @@ def mark_version_seen(version: str, config_dir: Path) -> None:
         cache = {}
         if cache_file.exists():
             try:
-                cache = json.loads(cache_file.read_text())
+                cache = json_loads(cache_file.read_bytes())
             except (json.JSONDecodeError, ValueError):
                 pass
         cache["last_seen_version"] = version
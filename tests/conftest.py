@@ -1,7 +1,9 @@
 """Pytest configuration."""
 
-import tempfile
+import functools
+import platform
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
@@ -23,3 +25,30 @@ def _isolate_audit_log(tmp_path):
         patch("pocketpaw.tools.registry.get_audit_logger", return_value=temp_logger),
     ):
         yield temp_logger
+
+
+@functools.cache
+def _run_result(returncode: int, stdout: str = "", stderr: str = "") -> SimpleNamespace:
+    return SimpleNamespace(returncode=returncode, stdout=stdout, stderr=stderr)
+
+
+@pytest.fixture(scope="session")
+def run_result():
+    """Factory for shared subprocess.CompletedProcess stand-ins (launcher tests).
+
+    Only returncode/stdout/stderr are read, so equal results are one cached object.
+    """
+    return _run_result
+
+
+@pytest.fixture(scope="session")
+def fake_venv(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Pre-built launcher venv skeleton, shared by tests that only check it exists."""
+    venv_dir = tmp_path_factory.mktemp("venv")
+    if platform.system() == "Windows":
+        python = venv_dir / "Scripts" / "python.exe"
+    else:
+        python = venv_dir / "bin" / "python"
+    python.parent.mkdir(parents=True)
+    python.touch()
+    return venv_dir
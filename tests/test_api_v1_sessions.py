@@ -1,5 +1,7 @@
 # Tests for API v1 sessions router.
 # Created: 2026-02-20
+# Updated: 2026-10-16 — rebuild-index endpoint (awaits the threaded store rebuild);
+#   byte-prefiltered search; limited list order.
 
 import json
 import tempfile
@@ -80,6 +82,15 @@ class TestListSessions:
         assert resp.status_code == 200
         assert len(resp.json()["sessions"]) == 3
 
+    @patch("pocketpaw.memory.get_memory_manager")
+    def test_list_sessions_limit_keeps_newest_in_order(self, mock_mgr, client):
+        index = {f"s{i}": {"last_activity": f"2026-02-20T{i % 4:02d}:00:00"} for i in range(8)}
+        store = _make_store_with_index(index)
+        mock_mgr.return_value._store = store
+        resp = client.get("/api/v1/sessions?limit=3")
+        # Ties keep index order, as a stable sort would
+        assert [s["id"] for s in resp.json()["sessions"]] == ["s3", "s7", "s2"]
+
     @patch("pocketpaw.memory.get_memory_manager")
     def test_list_sessions_no_index(self, mock_mgr, client):
         store = MagicMock(spec=[])
@@ -117,6 +128,27 @@ class TestDeleteSession:
         assert resp.status_code == 501
 
 
+class TestRebuildIndex:
+    """Tests for POST /api/v1/sessions/rebuild-index."""
+
+    @patch("pocketpaw.memory.get_memory_manager")
+    def test_rebuild_index(self, mock_mgr, client):
+        store = MagicMock()
+        store.rebuild_session_index_async = AsyncMock(return_value={"s1": {}, "s2": {}})
+        mock_mgr.return_value._store = store
+        resp = client.post("/api/v1/sessions/rebuild-index")
+        assert resp.status_code == 200
+        assert resp.json() == {"total": 2}
+        store.rebuild_session_index_async.assert_awaited_once_with()
+        store.rebuild_session_index.assert_not_called()
+
+    @patch("pocketpaw.memory.get_memory_manager")
+    def test_rebuild_index_unsupported_store(self, mock_mgr, client):
+        mock_mgr.return_value._store = MagicMock(spec=[])
+        resp = client.post("/api/v1/sessions/rebuild-index")
+        assert resp.status_code == 501
+
+
 class TestUpdateTitle:
     """Tests for POST /api/v1/sessions/{session_id}/title."""
 
@@ -172,6 +204,24 @@ class TestSearchSessions:
             assert len(results) == 1
             assert results[0]["id"] == "sess1"
 
+    @patch("pocketpaw.memory.get_memory_manager")
+    def test_search_matches_json_escaped_text(self, mock_mgr, client):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sessions_path = Path(tmpdir)
+            (sessions_path / "sess1.json").write_text(
+                json.dumps([{"content": 'He said "Héllo"', "role": "user"}])
+            )
+            (sessions_path / "sess2.json").write_text(
+                json.dumps([{"content": "nothing here", "role": "user"}])
+            )
+            store = MagicMock()
+            store.sessions_path = sessions_path
+            store._load_session_index.return_value = {}
+            mock_mgr.return_value._store = store
+            resp = client.get('/api/v1/sessions/search?q="héllo"')
+            assert resp.status_code == 200
+            assert [r["id"] for r in resp.json()["sessions"]] == ["sess1"]
+
     @patch("pocketpaw.memory.get_memory_manager")
     def test_search_no_sessions_path(self, mock_mgr, client):
         store = MagicMock(spec=[])
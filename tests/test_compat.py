@@ -0,0 +1,90 @@
+# Tests for pocketpaw._compat JSON helpers (orjson when installed, stdlib otherwise).
+# Created: 2026-10-16
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from pocketpaw import _compat
+from pocketpaw.memory.file_store import FileMemoryStore
+
+_DOC = {"name": "café 🐾", 1: [1, 2]}
+_PARSED = {"name": "café 🐾", "1": [1, 2]}
+_COMPACT = '{"name":"café 🐾","1":[1,2]}'.encode()
+# A lone surrogate (half an emoji) parses from valid JSON but is not valid UTF-8
+_UNENCODABLE = {"content": "split \ud83d"}
+
+
+class _FakeEncodeError(TypeError):
+    """orjson.JSONEncodeError subclasses TypeError."""
+
+
+@pytest.fixture
+def fake_orjson(monkeypatch):
+    """Stand-in orjson module that records the options it is called with."""
+    calls = []
+
+    def dumps(obj, option=0):
+        calls.append(("dumps", option))
+        if obj == _UNENCODABLE:
+            raise _FakeEncodeError("str is not valid UTF-8: surrogates not allowed")
+        return b"{}"
+
+    def loads(data):
+        calls.append(("loads", data))
+        return {}
+
+    fake = SimpleNamespace(
+        OPT_INDENT_2=1,
+        OPT_NON_STR_KEYS=2,
+        JSONEncodeError=_FakeEncodeError,
+        dumps=dumps,
+        loads=loads,
+    )
+    monkeypatch.setattr(_compat, "orjson", fake)
+    return calls
+
+
+@pytest.fixture
+def no_orjson(monkeypatch):
+    monkeypatch.setattr(_compat, "orjson", None)
+
+
+class TestOrjsonBackend:
+    def test_dumps_options(self, fake_orjson):
+        _compat.json_dumps(_DOC)
+        _compat.json_dumps(_DOC, indent=True)
+        assert fake_orjson == [("dumps", 2), ("dumps", 1 | 2)]
+
+    def test_loads_passes_buffer_through(self, fake_orjson):
+        view = memoryview(b"{}")
+        _compat.json_loads(view)
+        assert fake_orjson == [("loads", view)]
+
+    def test_unencodable_falls_back_to_stdlib(self, fake_orjson):
+        raw = _compat.json_dumps(_UNENCODABLE)
+        assert json.loads(raw) == _UNENCODABLE
+        assert fake_orjson == [("dumps", 2)]
+
+    def test_file_store_writes_through_shim(self, fake_orjson, tmp_path):
+        FileMemoryStore(base_path=tmp_path)._save_aliases({"a": "b"})
+        assert ("dumps", 1 | 2) in fake_orjson
+
+
+class TestStdlibBackend:
+    @pytest.mark.parametrize("indent", [False, True])
+    def test_dumps_round_trips(self, no_orjson, indent):
+        assert json.loads(_compat.json_dumps(_DOC, indent=indent)) == _PARSED
+
+    def test_dumps_is_valid_utf8_with_lone_surrogate(self, no_orjson):
+        raw = _compat.json_dumps(_UNENCODABLE)
+        assert json.loads(raw.decode("utf-8")) == _UNENCODABLE
+
+    @pytest.mark.parametrize("data", [_COMPACT, _COMPACT.decode(), memoryview(_COMPACT)])
+    def test_loads_accepts_bytes_str_and_memoryview(self, no_orjson, data):
+        assert _compat.json_loads(data) == _PARSED
+
+    def test_loads_error_is_json_decode_error(self, no_orjson):
+        with pytest.raises(json.JSONDecodeError):
+            _compat.json_loads(b"not json")
@@ -229,6 +229,35 @@ class TestSaveIdentity:
             assert result["updated"] == ["USER.md"]
             assert not (identity_dir / "malicious_key").exists()
 
+    async def test_skips_rewriting_unchanged_files(self):
+        """PUT /api/identity leaves files with identical content untouched."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            identity_dir = base / "identity"
+            identity_dir.mkdir()
+            (identity_dir / "SOUL.md").write_text("Same soul")
+
+            request = MagicMock()
+            request.json = AsyncMock(
+                return_value={"soul_file": "Same soul", "user_file": "Name: Dana"}
+            )
+
+            with (
+                patch("pocketpaw.dashboard.get_config_path") as mock_path,
+                patch.object(
+                    Path, "write_bytes", autospec=True, side_effect=Path.write_bytes
+                ) as mock_write,
+            ):
+                mock_path.return_value = base / "config.json"
+                from pocketpaw.dashboard import save_identity
+
+                result = await save_identity(request)
+
+            assert result["updated"] == ["SOUL.md", "USER.md"]
+            written = [call.args[0].name for call in mock_write.call_args_list]
+            assert written == ["USER.md"]
+            assert (identity_dir / "USER.md").read_text() == "Name: Dana"
+
 
 class TestIdentityAgentIntegration:
     """Tests verifying that saved identity changes are picked up by the agent."""
@@ -1,22 +1,43 @@
 """Tests for installer.py bootstrap dependency logic.
 
 Changes:
+  - 2026-10-16: Mirror the lru_cache'd _spec_exists probe, cleared between tests; cover
+                _ensure_uv (uv auto-install and its timeout).
   - 2026-02-13: Created. Reproduces the bug where uv installs to wrong Python
                 and _HAS_RICH is set True even though rich isn't importable.
 """
 
+import functools
 import importlib
 import importlib.util
+import os
 import subprocess
 import sys
+from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 # ---------------------------------------------------------------------------
 # We can't import installer.py directly (it runs _bootstrap_deps at module
 # level), so we extract and test the individual functions.
 # ---------------------------------------------------------------------------
 
 
+@functools.lru_cache(maxsize=32)
+def _spec_exists(name: str) -> bool:
+    """Standalone copy of the cached find_spec() probe."""
+    return importlib.util.find_spec(name) is not None
+
+
+@pytest.fixture(autouse=True)
+def _clear_spec_cache():
+    """Tests patch find_spec, so never let a cached probe leak between them."""
+    _spec_exists.cache_clear()
+    yield
+    _spec_exists.cache_clear()
+
+
 def _verify_imports_fn(packages: list[str]) -> tuple[bool, bool, bool]:
     """Standalone copy of _verify_imports for testing.
 
@@ -27,7 +48,7 @@ def _verify_imports_fn(packages: list[str]) -> tuple[bool, bool, bool]:
     all_ok = True
     for pkg in packages:
         spec_name = "rich" if pkg == "rich" else "InquirerPy"
-        if importlib.util.find_spec(spec_name) is not None:
+        if _spec_exists(spec_name):
             if spec_name == "rich":
                 has_rich = True
             else:
@@ -37,6 +58,37 @@ def _verify_imports_fn(packages: list[str]) -> tuple[bool, bool, bool]:
     return all_ok, has_rich, has_inquirer
 
 
+UV_INSTALL_URL = "https://astral.sh/uv/install.sh"
+UV_INSTALL_TIMEOUT = 120
+
+
+def _ensure_uv_fn() -> bool:
+    """Standalone copy of _ensure_uv (POSIX branch) for testing."""
+    import shutil
+
+    if shutil.which("uv"):
+        return True
+    if shutil.which("curl"):
+        cmd = ["sh", "-c", f"curl -LsSf --max-time {UV_INSTALL_TIMEOUT} {UV_INSTALL_URL} | sh"]
+    elif shutil.which("wget"):
+        cmd = ["sh", "-c", f"wget -qO- {UV_INSTALL_URL} | sh"]
+    else:
+        return False
+    try:
+        subprocess.check_call(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=UV_INSTALL_TIMEOUT,
+        )
+    except Exception:
+        return False
+    home = Path.home()
+    extra = [str(home / ".local" / "bin"), str(home / ".cargo" / "bin")]
+    os.environ["PATH"] = os.pathsep.join(extra + [os.environ.get("PATH", "")])
+    return shutil.which("uv") is not None
+
+
 class TestVerifyImports:
     """Tests for the _verify_imports helper."""
 
@@ -69,6 +121,17 @@ class TestVerifyImports:
         assert has_rich is True
         assert has_inquirer is False
 
+    def test_spec_lookup_cached_until_cleared(self):
+        """Repeated verification reuses the probe until caches are invalidated."""
+        with patch.object(importlib.util, "find_spec", return_value=None) as mock_find:
+            _verify_imports_fn(["rich"])
+            _verify_imports_fn(["rich"])
+            assert mock_find.call_count == 1
+
+            _spec_exists.cache_clear()
+            _verify_imports_fn(["rich"])
+            assert mock_find.call_count == 2
+
 
 class TestBootstrapBugReproduction:
     """Reproduces the original bug: uv install succeeds but package isn't importable."""
@@ -117,6 +180,59 @@ class TestBootstrapBugReproduction:
         assert sys.executable in captured_cmd
         assert "--system" in captured_cmd
 
+    def test_uv_autoinstalled_when_missing(self, monkeypatch):
+        """Without uv on PATH, the standalone installer runs before the uv cascade."""
+        captured_cmd = []
+        installed = []
+
+        def fake_which(name):
+            if name == "uv":
+                return "/home/user/.local/bin/uv" if installed else None
+            return f"/usr/bin/{name}"
+
+        def capture_check_call(cmd, **kwargs):
+            captured_cmd.extend(cmd)
+            installed.append(True)
+            return 0
+
+        monkeypatch.setenv("PATH", "/usr/bin")
+        with (
+            patch("shutil.which", side_effect=fake_which),
+            patch("subprocess.check_call", side_effect=capture_check_call),
+        ):
+            assert _ensure_uv_fn() is True
+
+        assert captured_cmd[:2] == ["sh", "-c"]
+        assert UV_INSTALL_URL in captured_cmd[2]
+        assert os.environ["PATH"].startswith(str(Path.home() / ".local" / "bin"))
+
+    def test_uv_autoinstall_times_out(self, monkeypatch):
+        """A stalled download gives up after UV_INSTALL_TIMEOUT so pip can take over."""
+        captured_kwargs = {}
+
+        def hang(cmd, **kwargs):
+            captured_kwargs.update(kwargs)
+            raise subprocess.TimeoutExpired(cmd, kwargs["timeout"])
+
+        monkeypatch.setenv("PATH", "/usr/bin")
+        with (
+            patch("shutil.which", side_effect=lambda name: None if name == "uv" else name),
+            patch("subprocess.check_call", side_effect=hang),
+        ):
+            assert _ensure_uv_fn() is False
+
+        assert captured_kwargs["timeout"] == UV_INSTALL_TIMEOUT
+        assert os.environ["PATH"] == "/usr/bin"
+
+    def test_uv_autoinstall_skipped_when_present(self):
+        """If uv is already on PATH, nothing is downloaded."""
+        with (
+            patch("shutil.which", return_value="/usr/local/bin/uv"),
+            patch("subprocess.check_call") as mock_call,
+        ):
+            assert _ensure_uv_fn() is True
+        mock_call.assert_not_called()
+
     def test_fallback_to_plain_text_when_all_cascades_fail(self):
         """If all install cascades fail, _HAS_RICH stays False and we get plain text mode."""
         # All find_spec calls return None (nothing installable)
@@ -2,33 +2,57 @@
 # Covers: Python detection, venv creation, pocketpaw install, version checks.
 # Created: 2026-02-10
 # Updated: 2026-02-14 — align with refactored _create_venv fallback chain.
+# Updated: 2026-10-16 — table-driven TestCheckPythonVersion; run_result / fake_venv fixtures
+#   from conftest.py; memoized interpreter probe; argv capture in TestInstallPocketpaw;
+#   class-scoped Bootstrap.
 
 from __future__ import annotations
 
 import platform
 import subprocess
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
+
+import pytest
 
 from installer.launcher.bootstrap import (
     PACKAGE_NAME,
     Bootstrap,
+    _probe_python,
 )
 
 # ── helpers ───────────────────────────────────────────────────────────
 
 
+def _venv_python_path(venv_dir: Path) -> Path:
+    """Expected venv python executable for the current platform."""
+    if platform.system() == "Windows":
+        return venv_dir / "Scripts" / "python.exe"
+    return venv_dir / "bin" / "python"
+
+
 def _make_venv_python(venv_dir: Path) -> Path:
     """Create the expected venv python executable for the current platform."""
-    if platform.system() == "Windows":
-        p = venv_dir / "Scripts" / "python.exe"
-    else:
-        p = venv_dir / "bin" / "python"
+    p = _venv_python_path(venv_dir)
     p.parent.mkdir(parents=True, exist_ok=True)
     p.touch()
     return p
 
 
+@pytest.fixture(scope="class")
+def bootstrap() -> Bootstrap:
+    """One Bootstrap per test class; the methods under test keep no instance state."""
+    return Bootstrap()
+
+
+@pytest.fixture(autouse=True)
+def _clear_python_probe_cache():
+    """Interpreter probes are memoized per path; don't leak them across tests."""
+    _probe_python.cache_clear()
+    yield
+    _probe_python.cache_clear()
+
+
 # ── check_status ──────────────────────────────────────────────────────
 
 
@@ -46,15 +70,14 @@ class TestCheckStatus:
             assert status.needs_install is True
             assert status.pocketpaw_installed is False
 
-    def test_venv_exists_with_pocketpaw(self, tmp_path: Path):
+    def test_venv_exists_with_pocketpaw(self, fake_venv: Path):
         """When venv exists and pocketpaw is installed, needs_install is False."""
-        venv_dir = tmp_path / "venv"
-        python = _make_venv_python(venv_dir)
+        python = _venv_python_path(fake_venv)
 
         with (
             patch.object(Bootstrap, "_find_python", return_value=str(python)),
             patch.object(Bootstrap, "_get_python_version", return_value="3.12.8"),
-            patch("installer.launcher.bootstrap.VENV_DIR", venv_dir),
+            patch("installer.launcher.bootstrap.VENV_DIR", fake_venv),
             patch.object(Bootstrap, "_get_installed_version", return_value="0.2.5"),
         ):
             b = Bootstrap()
@@ -63,15 +86,14 @@ class TestCheckStatus:
             assert status.pocketpaw_installed is True
             assert status.pocketpaw_version == "0.2.5"
 
-    def test_venv_exists_no_pocketpaw(self, tmp_path: Path):
+    def test_venv_exists_no_pocketpaw(self, fake_venv: Path):
         """When venv exists but pocketpaw is not installed."""
-        venv_dir = tmp_path / "venv"
-        python = _make_venv_python(venv_dir)
+        python = _venv_python_path(fake_venv)
 
         with (
             patch.object(Bootstrap, "_find_python", return_value=str(python)),
             patch.object(Bootstrap, "_get_python_version", return_value="3.12.8"),
-            patch("installer.launcher.bootstrap.VENV_DIR", venv_dir),
+            patch("installer.launcher.bootstrap.VENV_DIR", fake_venv),
             patch.object(Bootstrap, "_get_installed_version", return_value=None),
         ):
             b = Bootstrap()
@@ -86,47 +108,49 @@ class TestCheckStatus:
 class TestCheckPythonVersion:
     """Tests for Bootstrap._check_python_version()."""
 
-    def test_valid_python_312(self):
-        """Python 3.12 should pass."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "3 12\n"
-
-        with patch("subprocess.run", return_value=mock_result):
-            b = Bootstrap()
-            assert b._check_python_version("/usr/bin/python3") is True
-
-    def test_valid_python_311(self):
-        """Python 3.11 should pass (minimum)."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "3 11\n"
-
-        with patch("subprocess.run", return_value=mock_result):
-            b = Bootstrap()
-            assert b._check_python_version("/usr/bin/python3") is True
-
-    def test_old_python_310(self):
-        """Python 3.10 should fail."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "3 10\n"
-
-        with patch("subprocess.run", return_value=mock_result):
-            b = Bootstrap()
-            assert b._check_python_version("/usr/bin/python3") is False
-
-    def test_python_not_found(self):
-        """Missing Python binary should return False."""
-        with patch("subprocess.run", side_effect=FileNotFoundError):
-            b = Bootstrap()
-            assert b._check_python_version("/usr/bin/nope") is False
-
-    def test_python_timeout(self):
-        """Hung Python should return False."""
-        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 10)):
-            b = Bootstrap()
-            assert b._check_python_version("/usr/bin/python3") is False
+    @pytest.mark.parametrize(
+        ("stdout", "exc", "expected"),
+        [
+            pytest.param("3 12 8\n", None, True, id="valid_python_312"),
+            pytest.param("3 11 0\n", None, True, id="valid_python_311_minimum"),
+            pytest.param("3 10 14\n", None, False, id="old_python_310"),
+            pytest.param(None, FileNotFoundError, False, id="python_not_found"),
+            pytest.param(None, subprocess.TimeoutExpired("cmd", 10), False, id="python_timeout"),
+        ],
+    )
+    def test_check_python_version(self, run_result, bootstrap: Bootstrap, stdout, exc, expected):
+        """Only Python >= 3.11 that answers the probe should pass."""
+        if exc is not None:
+            run_patch = patch("subprocess.run", side_effect=exc)
+        else:
+            run_patch = patch("subprocess.run", return_value=run_result(0, stdout))
+
+        with run_patch:
+            assert bootstrap._check_python_version("/usr/bin/python3") is expected
+
+    def test_version_check_cached(self, run_result, bootstrap: Bootstrap, tmp_path: Path):
+        """Repeated probes of the same interpreter only run it once."""
+        python = tmp_path / "python3"
+        python.touch()
+
+        with patch("subprocess.run", return_value=run_result(0, "3 12 8\n")) as mock_run:
+            assert bootstrap._check_python_version(str(python)) is True
+            assert bootstrap._check_python_version(str(python)) is True
+            assert bootstrap._get_python_version(str(python)) == "3.12.8"
+
+        assert mock_run.call_count == 1
+
+    def test_failed_probe_not_cached(self, run_result, bootstrap: Bootstrap, tmp_path: Path):
+        """A failed probe is retried on the next check."""
+        python = tmp_path / "python3"
+        python.touch()
+
+        with patch(
+            "subprocess.run",
+            side_effect=[subprocess.TimeoutExpired("cmd", 10), run_result(0, "3 12 8\n")],
+        ):
+            assert bootstrap._check_python_version(str(python)) is False
+            assert bootstrap._check_python_version(str(python)) is True
 
 
 # ── _get_installed_version ────────────────────────────────────────────
@@ -135,31 +159,43 @@ class TestCheckPythonVersion:
 class TestGetInstalledVersion:
     """Tests for Bootstrap._get_installed_version()."""
 
-    def test_package_installed(self):
-        """Should parse version from pip show output."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Name: pocketpaw\nVersion: 0.2.5\nSummary: A self-hosted AI agent\n"
+    def test_package_installed_via_uv(self, run_result, bootstrap: Bootstrap):
+        """With uv, should parse the version from `uv pip show` output."""
+        mock_result = run_result(
+            0, "Name: pocketpaw\nVersion: 0.2.5\nSummary: A self-hosted AI agent\n"
+        )
 
-        with patch("subprocess.run", return_value=mock_result):
-            b = Bootstrap()
-            assert b._get_installed_version("/path/to/python") == "0.2.5"
+        with patch("subprocess.run", return_value=mock_result) as mock_run:
+            assert bootstrap._get_installed_version("/path/to/python", uv="/usr/bin/uv") == "0.2.5"
+            assert mock_run.call_args[0][0][:3] == ["/usr/bin/uv", "pip", "show"]
+
+    def test_package_installed_without_uv(self, run_result, bootstrap: Bootstrap):
+        """Without uv, should read importlib.metadata in the venv instead of pip show."""
+        with (
+            patch("installer.launcher.common.find_uv", return_value=None),
+            patch("subprocess.run", return_value=run_result(0, "0.2.5\n")) as mock_run,
+        ):
+            assert bootstrap._get_installed_version("/path/to/python") == "0.2.5"
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd[:2] == ["/path/to/python", "-c"]
+        assert "importlib.metadata" in cmd[2]
+        assert "pip" not in cmd
 
-    def test_package_not_installed(self):
+    def test_package_not_installed(self, run_result, bootstrap: Bootstrap):
         """Should return None when package isn't installed."""
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stdout = ""
+        mock_result = run_result(1)
 
-        with patch("subprocess.run", return_value=mock_result):
-            b = Bootstrap()
-            assert b._get_installed_version("/path/to/python") is None
+        with (
+            patch("installer.launcher.common.find_uv", return_value=None),
+            patch("subprocess.run", return_value=mock_result),
+        ):
+            assert bootstrap._get_installed_version("/path/to/python") is None
 
-    def test_pip_timeout(self):
+    def test_pip_timeout(self, bootstrap: Bootstrap):
         """Should return None on timeout."""
         with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 30)):
-            b = Bootstrap()
-            assert b._get_installed_version("/path/to/python") is None
+            assert bootstrap._get_installed_version("/path/to/python") is None
 
 
 # ── run (full bootstrap) ──────────────────────────────────────────────
@@ -168,11 +204,8 @@ class TestGetInstalledVersion:
 class TestBootstrapRun:
     """Tests for Bootstrap.run() — the full bootstrap flow."""
 
-    def test_successful_install(self, tmp_path: Path):
+    def test_successful_install(self, fake_venv: Path):
         """Full bootstrap with all steps succeeding."""
-        venv_dir = tmp_path / "venv"
-        _make_venv_python(venv_dir)
-
         progress_calls = []
 
         def track_progress(msg: str, pct: int) -> None:
@@ -182,7 +215,7 @@ class TestBootstrapRun:
             patch.object(Bootstrap, "_find_python", return_value="/usr/bin/python3"),
             patch.object(Bootstrap, "_get_python_version", return_value="3.12.8"),
             patch.object(Bootstrap, "_ensure_uv", return_value="/usr/bin/uv"),
-            patch("installer.launcher.bootstrap.VENV_DIR", venv_dir),
+            patch("installer.launcher.bootstrap.VENV_DIR", fake_venv),
             patch.object(Bootstrap, "_create_venv"),
             patch.object(Bootstrap, "_install_pocketpaw", return_value=None),
             patch.object(Bootstrap, "_get_installed_version", return_value="0.2.5"),
@@ -233,16 +266,13 @@ class TestBootstrapRun:
             assert status.error is None
             assert status.pocketpaw_installed is True
 
-    def test_install_failure(self, tmp_path: Path):
+    def test_install_failure(self, run_result, fake_venv: Path):
         """Should return error when pip install fails."""
-        venv_dir = tmp_path / "venv"
-        _make_venv_python(venv_dir)
-
         with (
             patch.object(Bootstrap, "_find_python", return_value="/usr/bin/python3"),
             patch.object(Bootstrap, "_get_python_version", return_value="3.12.8"),
             patch.object(Bootstrap, "_ensure_uv", return_value=None),
-            patch("installer.launcher.bootstrap.VENV_DIR", venv_dir),
+            patch("installer.launcher.bootstrap.VENV_DIR", fake_venv),
             patch.object(Bootstrap, "_create_venv"),
             patch.object(
                 Bootstrap,
@@ -264,46 +294,38 @@ class TestInstallPocketpaw:
     The method returns None on success, or an error string on failure.
     """
 
-    def test_install_with_extras(self):
-        """Should build correct pip command with extras."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
+    @pytest.fixture
+    def captured_run(self, monkeypatch: pytest.MonkeyPatch, run_result) -> list[list[str]]:
+        """Record every subprocess.run argv and report success."""
+        captured: list[list[str]] = []
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
-            b = Bootstrap()
-            result = b._install_pocketpaw("/path/to/python", ["telegram", "discord"])
+        def fake_run(cmd, **kwargs):
+            captured.append(cmd)
+            return run_result(0)
 
-            assert result is None  # None == success
-            # At least one subprocess.run call should contain the extras spec
-            any_has_extras = any(
-                f"{PACKAGE_NAME}[telegram,discord]" in str(c)
-                for c in mock_run.call_args_list
-            )
-            assert any_has_extras
+        monkeypatch.setattr(subprocess, "run", fake_run)
+        return captured
 
-    def test_install_no_extras(self):
-        """Should install bare package when no extras."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
+    def test_install_with_extras(self, bootstrap: Bootstrap, captured_run: list[list[str]]):
+        """Should build correct pip command with extras."""
+        result = bootstrap._install_pocketpaw("/path/to/python", ["telegram", "discord"])
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
-            b = Bootstrap()
-            result = b._install_pocketpaw("/path/to/python", [])
+        assert result is None  # None == success
+        # The install call (after the pip self-upgrade) carries the extras spec
+        assert any(f"{PACKAGE_NAME}[telegram,discord]" in cmd for cmd in captured_run)
 
-            assert result is None  # None == success
-            any_has_pkg = any(
-                PACKAGE_NAME in str(c) for c in mock_run.call_args_list
-            )
-            assert any_has_pkg
+    def test_install_no_extras(self, bootstrap: Bootstrap, captured_run: list[list[str]]):
+        """Should install bare package when no extras."""
+        result = bootstrap._install_pocketpaw("/path/to/python", [])
+
+        assert result is None  # None == success
+        assert any(PACKAGE_NAME in cmd for cmd in captured_run)
 
-    def test_install_pip_failure(self):
+    def test_install_pip_failure(self, run_result, bootstrap: Bootstrap):
         """Should return an error string on pip failure."""
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stderr = "ERROR: Could not find a version"
+        mock_result = run_result(1, stderr="ERROR: Could not find a version")
 
         with patch("subprocess.run", return_value=mock_result):
-            b = Bootstrap()
-            result = b._install_pocketpaw("/path/to/python", [])
+            result = bootstrap._install_pocketpaw("/path/to/python", [])
             assert result is not None  # error string
             assert isinstance(result, str)
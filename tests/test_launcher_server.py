@@ -1,15 +1,25 @@
 # Tests for installer/launcher/server.py
 # Covers: port management, PID lifecycle, health checks, process start/stop.
 # Created: 2026-02-10
+# Updated: 2026-10-16 — batched select() port scan; only ECONNREFUSED counts as a free port;
+#   keep-alive health checks; flock-guarded PID files (real child, crashed servers,
+#   pre-flock PID files); config port type-checked while read; in-memory home for config
+#   tests.
 
 from __future__ import annotations
 
+import errno
 import json
+import os
 import socket
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from installer.launcher.server import ServerManager
+import pytest
+
+from installer.launcher.server import ServerManager, fcntl
 
 # ── Port Management ───────────────────────────────────────────────────
 
@@ -36,6 +46,13 @@ class TestPortManagement:
             s.listen(1)
             assert mgr._is_port_free(taken_port) is False
 
+    @pytest.mark.parametrize("err", [errno.ETIMEDOUT, errno.EAGAIN, errno.EHOSTUNREACH])
+    def test_is_port_free_only_on_refused(self, err):
+        """Errors other than ECONNREFUSED (e.g. a probe timeout) mean busy."""
+        mgr = ServerManager()
+        with patch("socket.socket.connect_ex", return_value=err):
+            assert mgr._is_port_free(mgr.port) is False
+
     def test_find_free_port_default_available(self):
         """When default port is free, should return it."""
         mgr = ServerManager(port=49999)
@@ -43,57 +60,114 @@ class TestPortManagement:
             assert mgr._find_free_port() == 49999
 
     def test_find_free_port_default_taken(self):
-        """When default is taken, should find next free port."""
+        """When default is taken, should scan from the next port."""
         mgr = ServerManager(port=49999)
-        call_count = 0
-
-        def mock_free(port):
-            nonlocal call_count
-            call_count += 1
-            return call_count > 1  # First call (49999) returns False, second (50000) True
 
-        with patch.object(mgr, "_is_port_free", side_effect=mock_free):
+        with (
+            patch.object(mgr, "_is_port_free", return_value=False),
+            patch.object(mgr, "_scan_ports", return_value=50000) as mock_scan,
+        ):
             assert mgr._find_free_port() == 50000
+        assert mock_scan.call_args[0][0].start == 50000
+
+    def test_find_free_port_batch(self):
+        """The batched scan skips occupied ports and returns the first free one."""
+        listeners = []
+        try:
+            first = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            first.bind(("127.0.0.1", 0))
+            first.listen(1)
+            listeners.append(first)
+            base = first.getsockname()[1]
+            if base + 3 > 65535:
+                pytest.skip("ephemeral port too close to the top of the range")
+            # Occupy alternating ports: base, base+2 — base+1 should be picked
+            try:
+                second = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                listeners.append(second)
+                second.bind(("127.0.0.1", base + 2))
+                second.listen(1)
+            except OSError:
+                pytest.skip("neighbouring port unavailable")
+            mgr = ServerManager(port=base)
+            if not mgr._is_port_free(base + 1):
+                pytest.skip("neighbouring port unavailable")
+
+            assert mgr._scan_ports(range(base, base + 3)) == base + 1
+            assert mgr._find_free_port() == base + 1
+        finally:
+            for s in listeners:
+                s.close()
+
+    def test_scan_ports_none_free(self):
+        """A range made only of listening ports yields None."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("127.0.0.1", 0))
+            s.listen(1)
+            port = s.getsockname()[1]
+            mgr = ServerManager(port=port)
+            assert mgr._scan_ports(range(port, port + 1)) is None
 
 
 # ── Config Reading ────────────────────────────────────────────────────
 
 
+class _MemoryHome:
+    """Stand-in for POCKETPAW_HOME that serves files from a dict, not the disk.
+
+    Only supports what _read_port_from_config touches: ``home / name`` and
+    ``.read_bytes()`` (missing names raise FileNotFoundError like a real Path).
+    """
+
+    def __init__(self, files: dict[str, str], name: str | None = None) -> None:
+        self._files = files
+        self._name = name
+
+    def __truediv__(self, name: str) -> _MemoryHome:
+        return _MemoryHome(self._files, name)
+
+    def read_bytes(self) -> bytes:
+        if self._name not in self._files:
+            raise FileNotFoundError(self._name)
+        return self._files[self._name].encode()
+
+
 class TestConfigReading:
     """Tests for reading port from config."""
 
-    def test_read_port_from_config(self, tmp_path: Path):
-        """Should read port from config.json."""
-        config_path = tmp_path / "config.json"
-        config_path.write_text(json.dumps({"web_port": 9999}))
+    @staticmethod
+    def _read_port(files: dict[str, str]) -> int | None:
+        with patch("installer.launcher.server.POCKETPAW_HOME", _MemoryHome(files)):
+            return ServerManager()._read_port_from_config()
 
-        with patch("installer.launcher.server.POCKETPAW_HOME", tmp_path):
-            mgr = ServerManager()
-            assert mgr._read_port_from_config() == 9999
+    def test_read_port_from_config(self):
+        """Should read port from config.json."""
+        assert self._read_port({"config.json": json.dumps({"web_port": 9999})}) == 9999
 
-    def test_read_port_no_config(self, tmp_path: Path):
+    def test_read_port_no_config(self):
         """Should return None when config doesn't exist."""
-        with patch("installer.launcher.server.POCKETPAW_HOME", tmp_path):
-            mgr = ServerManager()
-            assert mgr._read_port_from_config() is None
+        assert self._read_port({}) is None
 
-    def test_read_port_invalid_json(self, tmp_path: Path):
+    def test_read_port_invalid_json(self):
         """Should return None on invalid JSON."""
-        config_path = tmp_path / "config.json"
-        config_path.write_text("not json")
-
-        with patch("installer.launcher.server.POCKETPAW_HOME", tmp_path):
-            mgr = ServerManager()
-            assert mgr._read_port_from_config() is None
+        assert self._read_port({"config.json": "not json"}) is None
 
-    def test_read_port_no_port_key(self, tmp_path: Path):
+    def test_read_port_no_port_key(self):
         """Should return None when port key is missing."""
-        config_path = tmp_path / "config.json"
-        config_path.write_text(json.dumps({"agent_backend": "claude_agent_sdk"}))
+        payload = json.dumps({"agent_backend": "claude_agent_sdk"})
+        assert self._read_port({"config.json": payload}) is None
+
+    @pytest.mark.parametrize("payload", ['{"web_port": "9999"}', '{"web_port": true}', "[9999]"])
+    def test_read_port_wrong_type(self, payload: str):
+        """Should return None when the port isn't an int inside a JSON object."""
+        assert self._read_port({"config.json": payload}) is None
+
+    def test_read_port_from_disk(self, tmp_path: Path):
+        """One end-to-end read through a real file keeps the stub honest."""
+        (tmp_path / "config.json").write_text(json.dumps({"web_port": 9999}))
 
         with patch("installer.launcher.server.POCKETPAW_HOME", tmp_path):
-            mgr = ServerManager()
-            assert mgr._read_port_from_config() is None
+            assert ServerManager()._read_port_from_config() == 9999
 
 
 # ── PID File Management ───────────────────────────────────────────────
@@ -137,6 +211,74 @@ class TestPidManagement:
             assert mgr.is_running() is False
             assert not pid_file.exists()  # Cleaned up
 
+    @pytest.mark.skipif(fcntl is None, reason="flock is POSIX-only")
+    def test_is_running_locked_pid_file(self, tmp_path: Path):
+        """A PID file whose lock is held by a live server means it is running."""
+        pid_file = tmp_path / "launcher.pid"
+
+        with patch("installer.launcher.server.PID_FILE", pid_file):
+            owner = ServerManager()
+            fd = owner._acquire_pid_lock()
+            assert fd is not None
+            child = subprocess.Popen(
+                [sys.executable, "-c", "import time; time.sleep(30)"], pass_fds=(fd,)
+            )
+            try:
+                owner._write_pid_file(fd, child.pid)
+                assert pid_file.read_text() == str(child.pid)
+                # A second manager (e.g. a relaunched launcher) sees it running
+                assert ServerManager().is_running() is True
+                # ...and cannot take the lock itself
+                assert ServerManager()._acquire_pid_lock() is None
+            finally:
+                child.kill()
+                child.wait()
+
+            # Lock released with the server — the file is now stale
+            assert ServerManager().is_running() is False
+            assert not pid_file.exists()
+
+    @pytest.mark.skipif(fcntl is None, reason="flock is POSIX-only")
+    def test_crashed_server_not_running(self, tmp_path: Path):
+        """After the launched server exits, is_running() is False and start() relaunches."""
+        python = tmp_path / "venv" / "bin" / "python"
+        python.parent.mkdir(parents=True)
+        python.write_text("#!/bin/sh\nexit 1\n")
+        python.chmod(0o755)
+
+        with (
+            patch("installer.launcher.server.VENV_DIR", tmp_path / "venv"),
+            patch("installer.launcher.server.POCKETPAW_HOME", tmp_path),
+            patch("installer.launcher.server.PID_FILE", tmp_path / "launcher.pid"),
+            patch.object(ServerManager, "is_healthy", return_value=False),
+        ):
+            mgr = ServerManager(port=0)
+            assert mgr.start() is True
+            mgr._process.wait()
+            assert mgr.is_running() is False
+
+            status_messages = []
+            mgr.on_status = status_messages.append
+            first = mgr._process
+            mgr.start()
+            assert mgr._process is not first
+            assert "Server is already running" not in status_messages
+            mgr.stop()
+
+    @pytest.mark.skipif(fcntl is None, reason="flock is POSIX-only")
+    def test_unlocked_pid_file_from_old_launcher(self, tmp_path: Path):
+        """An unlocked PID file (pre-flock launcher) is kept while its PID is alive."""
+        pid_file = tmp_path / "launcher.pid"
+        pid_file.write_text(str(os.getpid()))
+
+        with patch("installer.launcher.server.PID_FILE", pid_file):
+            assert ServerManager().is_running() is True
+            assert pid_file.exists()
+
+            with patch.object(ServerManager, "_pid_alive", return_value=False):
+                assert ServerManager().is_running() is False
+            assert not pid_file.exists()
+
 
 # ── Health Check ──────────────────────────────────────────────────────
 
@@ -146,19 +288,49 @@ class TestHealthCheck:
 
     def test_healthy_server(self):
         """Should return True when server responds 200."""
-        mock_resp = MagicMock()
-        mock_resp.status = 200
+        mock_conn = MagicMock(port=8888, sock=None)
+        mock_conn.getresponse.return_value.status = 200
 
-        with patch("urllib.request.urlopen", return_value=mock_resp):
+        with patch("http.client.HTTPConnection", return_value=mock_conn):
             mgr = ServerManager(port=8888)
             assert mgr.is_healthy() is True
+        mock_conn.request.assert_called_once_with("GET", "/")
 
     def test_unhealthy_server(self):
         """Should return False when server doesn't respond."""
-        with patch("urllib.request.urlopen", side_effect=ConnectionRefusedError):
+        mock_conn = MagicMock(port=8888, sock=None)
+        mock_conn.request.side_effect = ConnectionRefusedError
+
+        with patch("http.client.HTTPConnection", return_value=mock_conn):
             mgr = ServerManager(port=8888)
             assert mgr.is_healthy() is False
 
+    def test_health_connection_reused(self):
+        """Repeated polls share one keep-alive connection."""
+        mock_conn = MagicMock(port=8888, sock=None)
+        mock_conn.getresponse.return_value.status = 200
+
+        with patch("http.client.HTTPConnection", return_value=mock_conn) as mock_cls:
+            mgr = ServerManager(port=8888)
+            assert mgr.is_healthy() is True
+            assert mgr.is_healthy() is True
+        assert mock_cls.call_count == 1
+
+    def test_stale_health_connection_retried(self):
+        """A keep-alive connection dropped by the server is retried once."""
+        mock_conn = MagicMock(port=8888, sock=object())
+        mock_conn.getresponse.side_effect = [ConnectionResetError, MagicMock(status=200)]
+
+        def close():
+            mock_conn.sock = None
+
+        mock_conn.close.side_effect = close
+
+        with patch("http.client.HTTPConnection", return_value=mock_conn):
+            mgr = ServerManager(port=8888)
+            assert mgr.is_healthy() is True
+        assert mock_conn.request.call_count == 2
+
     def test_dashboard_url(self):
         """Should return correct localhost URL."""
         mgr = ServerManager(port=9999)
@@ -1,14 +1,36 @@
 # Tests for installer/launcher/updater.py
 # Covers: PyPI version checking, version comparison, update flow.
 # Created: 2026-02-10
+# Updated: 2026-10-16 — run_result / fake_venv fixtures from conftest.py; isolated PyPI
+#   response cache; class-scoped Updater.
 
 from __future__ import annotations
 
 import json
+import os
+import time
+import urllib.error
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from installer.launcher.updater import Updater
+import pytest
+
+from installer.launcher.updater import PYPI_CACHE_TTL, Updater
+
+
+@pytest.fixture(autouse=True)
+def _pypi_cache(tmp_path: Path):
+    """Keep the PyPI version cache out of the real ~/.pocketpaw."""
+    cache_file = tmp_path / "pypi_cache.json"
+    with patch("installer.launcher.updater.PYPI_CACHE_FILE", cache_file):
+        yield cache_file
+
+
+@pytest.fixture(scope="class")
+def updater() -> Updater:
+    """One Updater per test class for the stateless comparison tests."""
+    return Updater()
+
 
 # ── Version Comparison ────────────────────────────────────────────────
 
@@ -16,29 +38,37 @@ from installer.launcher.updater import Updater
 class TestVersionComparison:
     """Tests for Updater._version_newer()."""
 
-    def test_newer_patch(self):
-        u = Updater()
-        assert u._version_newer("0.2.6", "0.2.5") is True
+    def test_newer_patch(self, updater: Updater):
+        assert updater._version_newer("0.2.6", "0.2.5") is True
 
-    def test_newer_minor(self):
-        u = Updater()
-        assert u._version_newer("0.3.0", "0.2.5") is True
+    def test_newer_minor(self, updater: Updater):
+        assert updater._version_newer("0.3.0", "0.2.5") is True
 
-    def test_newer_major(self):
-        u = Updater()
-        assert u._version_newer("1.0.0", "0.9.9") is True
+    def test_newer_major(self, updater: Updater):
+        assert updater._version_newer("1.0.0", "0.9.9") is True
 
-    def test_same_version(self):
-        u = Updater()
-        assert u._version_newer("0.2.5", "0.2.5") is False
+    def test_same_version(self, updater: Updater):
+        assert updater._version_newer("0.2.5", "0.2.5") is False
 
-    def test_older_version(self):
-        u = Updater()
-        assert u._version_newer("0.2.4", "0.2.5") is False
+    def test_older_version(self, updater: Updater):
+        assert updater._version_newer("0.2.4", "0.2.5") is False
 
-    def test_three_vs_two_segments(self):
-        u = Updater()
-        assert u._version_newer("0.3.0", "0.2") is True
+    def test_three_vs_two_segments(self, updater: Updater):
+        assert updater._version_newer("0.3.0", "0.2") is True
+
+    @pytest.mark.parametrize(
+        ("latest", "current", "expected"),
+        [
+            ("0.3.0", "0.3.0rc1", True),
+            ("0.3.0rc1", "0.2.9", True),
+            ("0.3.0rc1", "0.3.0", False),
+            ("0.3.0a1", "0.3.0rc1", False),
+            ("0.3.0.post1", "0.3.0", True),
+            ("0.3.0.dev1", "0.3.0", False),
+        ],
+    )
+    def test_pre_and_post_releases(self, updater: Updater, latest, current, expected):
+        assert updater._version_newer(latest, current) is expected
 
 
 # ── PyPI Check ────────────────────────────────────────────────────────
@@ -72,6 +102,33 @@ class TestPyPICheck:
             u = Updater()
             assert u._get_pypi_version() is None
 
+    def test_pypi_uses_cache(self):
+        """A fresh cache answers the second lookup without another request."""
+        mock_resp = MagicMock()
+        mock_resp.read.return_value = json.dumps({"info": {"version": "0.3.0"}}).encode()
+
+        with patch("urllib.request.urlopen", return_value=mock_resp) as mock_urlopen:
+            u = Updater()
+            assert u._get_pypi_version() == "0.3.0"
+            assert u._get_pypi_version() == "0.3.0"
+
+        assert mock_urlopen.call_count == 1
+
+    def test_stale_cache_revalidated_with_304(self, _pypi_cache: Path):
+        """An expired cache sends If-Modified-Since and is kept on 304."""
+        _pypi_cache.write_text(json.dumps({"version": "0.2.9"}))
+        old = time.time() - PYPI_CACHE_TTL - 60
+        os.utime(_pypi_cache, (old, old))
+
+        not_modified = urllib.error.HTTPError("url", 304, "Not Modified", {}, None)
+        with patch("urllib.request.urlopen", side_effect=not_modified) as mock_urlopen:
+            u = Updater()
+            assert u._get_pypi_version() == "0.2.9"
+
+        req = mock_urlopen.call_args[0][0]
+        assert req.get_header("If-modified-since")
+        assert time.time() - _pypi_cache.stat().st_mtime < PYPI_CACHE_TTL
+
 
 # ── Installed Version ─────────────────────────────────────────────────
 
@@ -79,20 +136,13 @@ class TestPyPICheck:
 class TestInstalledVersion:
     """Tests for Updater._get_installed_version()."""
 
-    def test_installed(self, tmp_path: Path):
+    def test_installed(self, run_result, fake_venv: Path):
         """Should return version when installed."""
-        venv_dir = tmp_path / "venv"
-        venv_bin = venv_dir / "bin"
-        venv_bin.mkdir(parents=True)
-        python = venv_bin / "python"
-        python.touch()
-
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Name: pocketpaw\nVersion: 0.2.5\n"
+        mock_result = run_result(0, "Name: pocketpaw\nVersion: 0.2.5\n")
 
         with (
-            patch("installer.launcher.updater.VENV_DIR", venv_dir),
+            patch("installer.launcher.updater.VENV_DIR", fake_venv),
+            patch("installer.launcher.updater.find_uv", return_value="/usr/bin/uv"),
             patch("subprocess.run", return_value=mock_result),
         ):
             u = Updater()
@@ -159,21 +209,14 @@ class TestCheckFlow:
 class TestApplyUpdate:
     """Tests for Updater.apply()."""
 
-    def test_successful_upgrade(self, tmp_path: Path):
+    def test_successful_upgrade(self, run_result, fake_venv: Path):
         """Should run pip upgrade and report new version."""
-        venv_dir = tmp_path / "venv"
-        venv_bin = venv_dir / "bin"
-        venv_bin.mkdir(parents=True)
-        python = venv_bin / "python"
-        python.touch()
-
-        mock_result = MagicMock()
-        mock_result.returncode = 0
+        mock_result = run_result(0)
 
         status_messages = []
 
         with (
-            patch("installer.launcher.updater.VENV_DIR", venv_dir),
+            patch("installer.launcher.updater.VENV_DIR", fake_venv),
             patch("subprocess.run", return_value=mock_result),
             patch.object(Updater, "_get_installed_version", return_value="0.3.0"),
         ):
@@ -181,20 +224,12 @@ class TestApplyUpdate:
             assert u.apply() is True
             assert any("0.3.0" in m for m in status_messages)
 
-    def test_upgrade_failure(self, tmp_path: Path):
+    def test_upgrade_failure(self, run_result, fake_venv: Path):
         """Should return False on pip failure."""
-        venv_dir = tmp_path / "venv"
-        venv_bin = venv_dir / "bin"
-        venv_bin.mkdir(parents=True)
-        python = venv_bin / "python"
-        python.touch()
-
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stderr = "ERROR: some pip error"
+        mock_result = run_result(1, stderr="ERROR: some pip error")
 
         with (
-            patch("installer.launcher.updater.VENV_DIR", venv_dir),
+            patch("installer.launcher.updater.VENV_DIR", fake_venv),
             patch("subprocess.run", return_value=mock_result),
         ):
             u = Updater()
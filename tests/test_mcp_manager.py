@@ -3,10 +3,16 @@
 All MCP SDK imports are mocked since mcp is an optional dependency.
 """
 
+import ast
+import asyncio
 import json
+import sys
+from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
+import pytest
+
 from pocketpaw.mcp.config import MCPServerConfig, load_mcp_config, save_mcp_config
 from pocketpaw.mcp.manager import MCPManager, MCPToolInfo, get_mcp_manager
 
@@ -44,6 +50,26 @@ class TestMCPServerConfig:
         assert d["env"] == {"NODE_ENV": "production"}
         assert d["timeout"] == 60
 
+    def test_to_dict_omits_unset_optional_keys(self):
+        """registry_ref/oauth only appear on disk when set (unlike dataclasses.asdict)."""
+        assert set(MCPServerConfig(name="fs").to_dict()) == {
+            "name",
+            "transport",
+            "command",
+            "args",
+            "url",
+            "env",
+            "enabled",
+            "timeout",
+        }
+        d = MCPServerConfig(name="fs", registry_ref="@x/y@1.0", oauth=True).to_dict()
+        assert d["registry_ref"] == "@x/y@1.0"
+        assert d["oauth"] is True
+
+    def test_from_dict_ignores_unknown_keys(self):
+        cfg = MCPServerConfig.from_dict({"name": "fs", "legacy_field": 1})
+        assert cfg.name == "fs"
+
     def test_from_dict(self):
         data = {
             "name": "github",
@@ -108,6 +134,57 @@ class TestMCPConfig:
         assert loaded[1].name == "b"
         assert loaded[1].enabled is False
 
+    def test_load_large_config(self, tmp_path, monkeypatch):
+        """Configs past the mmap threshold load the same as small ones."""
+        from pocketpaw.mcp.config import _MMAP_THRESHOLD
+
+        monkeypatch.setattr("pocketpaw.mcp.config.get_config_dir", lambda: tmp_path)
+        configs = [
+            MCPServerConfig(name=f"srv-{i}", command="npx", args=["-y", f"@mcp/server-{i}"])
+            for i in range(1000)
+        ]
+        save_mcp_config(configs)
+        assert (tmp_path / "mcp_servers.json").stat().st_size > _MMAP_THRESHOLD
+
+        loaded = load_mcp_config()
+        assert [c.name for c in loaded] == [c.name for c in configs]
+        assert loaded[-1].args == ["-y", "@mcp/server-999"]
+
+    def test_load_null_args_and_env(self, tmp_path, monkeypatch):
+        """Hand-edited nulls load as empty values instead of dropping every server."""
+        monkeypatch.setattr("pocketpaw.mcp.config.get_config_dir", lambda: tmp_path)
+        servers = [{"name": "a", "args": None}, {"name": "b", "env": None}]
+        (tmp_path / "mcp_servers.json").write_text(json.dumps({"servers": servers}))
+
+        loaded = load_mcp_config()
+        assert [c.name for c in loaded] == ["a", "b"]
+        assert loaded[0].args == []
+        assert loaded[1].env == {}
+
+    def test_load_reuses_parse_until_file_changes(self, tmp_path, monkeypatch):
+        import pocketpaw.mcp.config as config_mod
+
+        monkeypatch.setattr("pocketpaw.mcp.config.get_config_dir", lambda: tmp_path)
+        save_mcp_config([MCPServerConfig(name="a", args=["x"])])
+        real_loads = config_mod.json_loads
+        calls = []
+        monkeypatch.setattr(config_mod, "json_loads", lambda d: calls.append(1) or real_loads(d))
+
+        first = load_mcp_config()
+        second = load_mcp_config()
+        assert len(calls) == 1
+        # Callers get independent objects they can mutate and re-save
+        first[0].enabled = False
+        first[0].args.append("y")
+        assert second[0].enabled is True
+        assert load_mcp_config()[0].args == ["x"]
+
+        # An out-of-band edit (new size/mtime) is picked up
+        path = tmp_path / "mcp_servers.json"
+        path.write_text(json.dumps({"servers": [{"name": "edited"}]}))
+        assert [c.name for c in load_mcp_config()] == ["edited"]
+        assert len(calls) == 2
+
     def test_load_corrupt_json(self, tmp_path, monkeypatch):
         monkeypatch.setattr("pocketpaw.mcp.config.get_config_dir", lambda: tmp_path)
         (tmp_path / "mcp_servers.json").write_text("not json")
@@ -125,6 +202,29 @@ class TestMCPConfig:
         save_mcp_config([MCPServerConfig(name="x")])
         assert (tmp_path / "mcp_servers.json").exists()
 
+    def test_save_is_indented(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("pocketpaw.mcp.config.get_config_dir", lambda: tmp_path)
+        save_mcp_config([MCPServerConfig(name="x")])
+        assert b'\n  "servers"' in (tmp_path / "mcp_servers.json").read_bytes()
+        assert [c.name for c in load_mcp_config()] == ["x"]
+
+    def test_save_is_atomic(self, tmp_path, monkeypatch):
+        """A failed write leaves the previous config intact and no temp file behind."""
+        monkeypatch.setattr("pocketpaw.mcp.config.get_config_dir", lambda: tmp_path)
+        save_mcp_config([MCPServerConfig(name="old")])
+        assert (tmp_path / "mcp_servers.json").read_bytes().endswith(b"}\n")
+
+        def boom(self, target):
+            raise OSError("disk full")
+
+        with monkeypatch.context() as m:
+            m.setattr("pathlib.Path.replace", boom)
+            with pytest.raises(OSError):
+                save_mcp_config([MCPServerConfig(name="new")])
+
+        assert [c.name for c in load_mcp_config()] == ["old"]
+        assert list(tmp_path.iterdir()) == [tmp_path / "mcp_servers.json"]
+
 
 # ======================================================================
 # MCPToolInfo tests
@@ -214,6 +314,25 @@ class TestMCPManager:
             mock_start.assert_any_call(cfg_a)
             mock_start.assert_any_call(cfg_b)
 
+    async def test_slow_start_does_not_block_other_servers(self):
+        """Locks are per server: a hung connect doesn't stall another server's start."""
+        mgr = MCPManager()
+        release = asyncio.Event()
+
+        async def fake_inner(config):
+            if config.name == "slow":
+                await release.wait()
+            return True
+
+        with patch.object(mgr, "_start_server_inner", side_effect=fake_inner):
+            slow = asyncio.create_task(mgr.start_server(MCPServerConfig(name="slow")))
+            await asyncio.sleep(0)
+            fast = await asyncio.wait_for(mgr.start_server(MCPServerConfig(name="fast")), timeout=1)
+            assert fast is True
+            assert not slow.done()
+            release.set()
+            assert await slow is True
+
     async def test_start_server_unknown_transport(self):
         mgr = MCPManager()
         cfg = MCPServerConfig(name="weird", transport="grpc")
@@ -223,6 +342,14 @@ class TestMCPManager:
             status = mgr.get_server_status()
         assert "grpc" in status["weird"]["error"]
 
+    async def test_unknown_transport_rejected_before_oauth(self):
+        mgr = MCPManager()
+        cfg = MCPServerConfig(name="weird", transport="grpc", oauth=True)
+        with patch.object(MCPManager, "_make_oauth_auth") as mock_oauth:
+            assert await mgr.start_server(cfg) is False
+        mock_oauth.assert_not_called()
+        assert "grpc" in mgr._servers["weird"].error
+
     async def test_start_server_stdio_success(self):
         """Test successful stdio connection with fully mocked MCP SDK."""
         mgr = MCPManager()
@@ -251,7 +378,7 @@ class TestMCPManager:
         original_connect = mgr_mod.MCPManager._connect_stdio
 
         async def patched_connect(self_inner, state):
-            state.client = mock_ctx
+            await state.exit_stack.enter_async_context(mock_ctx)
             state.read_stream = AsyncMock()
             state.write_stream = AsyncMock()
             state.session = mock_session
@@ -273,6 +400,23 @@ class TestMCPManager:
         finally:
             mgr_mod.MCPManager._connect_stdio = original_connect
 
+    async def test_all_tools_cached_until_server_stops(self):
+        from pocketpaw.mcp.manager import _ServerState
+
+        mgr = MCPManager()
+        tool = MCPToolInfo(server_name="fs", name="read_file")
+        mgr._servers["fs"] = _ServerState(
+            config=MCPServerConfig(name="fs"), tools=[tool], connected=True
+        )
+
+        first = mgr.get_all_tools()
+        assert first == [tool]
+        first.clear()  # callers get a copy, not the cache
+        assert mgr.get_all_tools() == [tool]
+
+        await mgr.stop_server("fs")
+        assert mgr.get_all_tools() == []
+
     async def test_start_server_already_connected(self):
         """Starting an already-connected server should return True."""
         mgr = MCPManager()
@@ -291,15 +435,53 @@ class TestMCPManager:
 
         cfg = MCPServerConfig(name="fs")
         state = _ServerState(config=cfg, connected=True)
-        state.session = AsyncMock()
-        state.session.__aexit__ = AsyncMock()
-        state.client = AsyncMock()
-        state.client.__aexit__ = AsyncMock()
+        closed = []
+        state.exit_stack.push_async_callback(AsyncMock(side_effect=lambda: closed.append("t")))
+        state.exit_stack.push_async_callback(AsyncMock(side_effect=lambda: closed.append("s")))
         mgr._servers["fs"] = state
 
         result = await mgr.stop_server("fs")
         assert result is True
         assert "fs" not in mgr._servers
+        # Session is closed before its transport
+        assert closed == ["s", "t"]
+
+    async def test_failed_initialize_unwinds_transport(self):
+        """If session.initialize() fails, cleanup exits both session and transport."""
+        from contextlib import asynccontextmanager
+
+        from pocketpaw.mcp.manager import _ServerState
+
+        events = []
+
+        @asynccontextmanager
+        async def fake_transport():
+            events.append("transport enter")
+            yield ("read", "write")
+            events.append("transport exit")
+
+        class FakeSession:
+            def __init__(self, read, write):
+                pass
+
+            async def __aenter__(self):
+                events.append("session enter")
+                return self
+
+            async def __aexit__(self, *exc):
+                events.append("session exit")
+
+            async def initialize(self):
+                raise RuntimeError("handshake failed")
+
+        mgr = MCPManager()
+        state = _ServerState(config=MCPServerConfig(name="bad"))
+        with patch.dict(sys.modules, {"mcp": SimpleNamespace(ClientSession=FakeSession)}):
+            with pytest.raises(RuntimeError, match="handshake failed"):
+                await mgr._open_session(state, fake_transport())
+        assert state.session is None
+        await mgr._cleanup_state(state)
+        assert events == ["transport enter", "session enter", "session exit", "transport exit"]
 
     async def test_call_tool_success(self):
         """Test successful tool call."""
@@ -488,3 +670,47 @@ class TestGetMCPManager:
         b = get_mcp_manager()
         assert a is b
         mod._manager = None  # cleanup
+
+    def test_concurrent_first_calls_share_instance(self):
+        import threading
+        import time
+
+        import pocketpaw.mcp.manager as mod
+
+        real_init = MCPManager.__init__
+
+        def slow_init(self):
+            time.sleep(0.01)  # widen the window between check and assignment
+            real_init(self)
+
+        mod._manager = None
+        results = []
+        with patch.object(MCPManager, "__init__", slow_init):
+            threads = [
+                threading.Thread(target=lambda: results.append(get_mcp_manager())) for _ in range(8)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        mod._manager = None  # cleanup
+        assert len({id(m) for m in results}) == 1
+
+
+class TestOptionalSDKImport:
+    def test_manager_defers_mcp_import(self):
+        """The mcp SDK is only imported inside connect helpers, never at module level.
+
+        Keeps these tests (and `import pocketpaw.mcp.manager`) runnable and cheap
+        without the optional dependency, so no collection-time skip is needed.
+        """
+        import pocketpaw.mcp.manager as mod
+
+        tree = ast.parse(Path(mod.__file__).read_text(encoding="utf-8"))
+        top_level = set()
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                top_level.update(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                top_level.add(node.module.split(".")[0])
+        assert "mcp" not in top_level
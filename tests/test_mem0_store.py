@@ -1,6 +1,10 @@
 # Tests for Mem0 Memory Store Integration
 # Created: 2026-02-04
 # Updated: 2026-02-07 — Configurable providers, auto-learn, semantic context
+# Updated: 2026-10-16 — module-level Mem0MemoryStore import; parametrized per-type save
+#   test; no find_spec("mem0") probe (store tests inject a mock Memory); class-scoped mock
+#   Memory reset per test; shared session data_path; _returning() stubs; bare stub class for
+#   the file backend; monkeypatched getters.
 
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -8,6 +12,7 @@ import pytest
 
 from pocketpaw.memory.file_store import FileMemoryStore
 from pocketpaw.memory.manager import MemoryManager, create_memory_store
+from pocketpaw.memory.mem0_store import Mem0MemoryStore
 from pocketpaw.memory.protocol import MemoryEntry, MemoryType
 
 # =========================================================================
@@ -209,16 +214,18 @@ class TestBuildMem0Config:
         config = _build_mem0_config(llm_provider="anthropic")
         assert "api_key" not in config["llm"]["config"]
 
-    def test_ollama_dims_auto_detection(self):
+    def test_ollama_dims_auto_detection(self, monkeypatch):
         from pocketpaw.memory.mem0_store import _build_mem0_config
 
         # Unknown model with ollama provider — triggers auto-detection
-        with patch("pocketpaw.memory.mem0_store._get_ollama_embedding_dims", return_value=512):
-            config = _build_mem0_config(
-                embedder_provider="ollama",
-                embedder_model="custom-ollama-embed",
-                vector_store="qdrant",
-            )
+        monkeypatch.setattr(
+            "pocketpaw.memory.mem0_store._get_ollama_embedding_dims", lambda *args: 512
+        )
+        config = _build_mem0_config(
+            embedder_provider="ollama",
+            embedder_model="custom-ollama-embed",
+            vector_store="qdrant",
+        )
         assert config["vector_store"]["config"]["embedding_model_dims"] == 512
 
     def test_qwen3_embedding_dims_known(self):
@@ -227,69 +234,86 @@ class TestBuildMem0Config:
         config = _build_mem0_config(embedder_model="qwen3-embedding:0.6b", vector_store="qdrant")
         assert config["vector_store"]["config"]["embedding_model_dims"] == 1024
 
+    def test_ollama_dims_probe_memoized_on_success_only(self):
+        from pocketpaw.memory.mem0_store import (
+            _get_ollama_embedding_dims,
+            _probe_ollama_embedding_dims,
+        )
+
+        _probe_ollama_embedding_dims.cache_clear()
+        ok = MagicMock(status_code=200)
+        ok.json.return_value = {"embedding": [0.0] * 512}
+        try:
+            with patch("httpx.post", side_effect=[ConnectionError("down"), ok]) as mock_post:
+                assert _get_ollama_embedding_dims("custom", "http://ollama:11434") is None
+                assert _get_ollama_embedding_dims("custom", "http://ollama:11434") == 512
+                assert _get_ollama_embedding_dims("custom", "http://ollama:11434") == 512
+            assert mock_post.call_count == 2
+        finally:
+            _probe_ollama_embedding_dims.cache_clear()
+
+    def test_latest_tag_uses_known_dims_without_probe(self):
+        from pocketpaw.memory.mem0_store import _build_mem0_config
+
+        with patch("pocketpaw.memory.mem0_store._get_ollama_embedding_dims") as mock_probe:
+            config = _build_mem0_config(
+                embedder_provider="ollama",
+                embedder_model="snowflake-arctic-embed:latest",
+                vector_store="qdrant",
+            )
+        mock_probe.assert_not_called()
+        assert config["vector_store"]["config"]["embedding_model_dims"] == 1024
+
 
 # =========================================================================
-# Mem0MemoryStore Tests (requires mem0ai or mocked)
+# Mem0MemoryStore Tests (mocked Memory — no mem0 needed)
 # =========================================================================
 
-try:
-    import importlib.util
 
-    HAS_MEM0 = importlib.util.find_spec("mem0") is not None
-except Exception:
-    HAS_MEM0 = False
+_DEFAULT_MEM0_ITEM = {
+    "id": "test-id-123",
+    "memory": "test content",
+    "metadata": {"pocketpaw_type": "long_term", "tags": ["test"]},
+}
+_DEFAULT_ADD_RESULT = {"results": [{"id": "test-id-123", "memory": "test content", "event": "ADD"}]}
+_DEFAULT_SEARCH_RESULT = {"results": [{**_DEFAULT_MEM0_ITEM, "score": 0.95}]}
+_DEFAULT_GET_ALL_RESULT = {"results": [_DEFAULT_MEM0_ITEM]}
 
 
-@pytest.mark.skipif(not HAS_MEM0, reason="mem0ai not installed")
-class TestMem0MemoryStore:
-    """Tests for Mem0MemoryStore (requires mem0ai package)."""
+@pytest.fixture(scope="class")
+def mock_mem0_memory():
+    """One mock Mem0 Memory per class; _reset_mock clears it between tests."""
+    mock_instance = MagicMock()
+    mock_instance.add.return_value = _DEFAULT_ADD_RESULT
+    mock_instance.get.return_value = _DEFAULT_MEM0_ITEM
+    mock_instance.search.return_value = _DEFAULT_SEARCH_RESULT
+    mock_instance.get_all.return_value = _DEFAULT_GET_ALL_RESULT
+    mock_instance.delete.return_value = None
+    mock_instance.delete_all.return_value = None
+    return mock_instance
 
-    @pytest.fixture
-    def mock_mem0_memory(self):
-        """Create a mock Mem0 Memory instance."""
-        mock_instance = MagicMock()
 
-        # Setup default return values
-        mock_instance.add.return_value = {
-            "results": [{"id": "test-id-123", "memory": "test content", "event": "ADD"}]
-        }
-        mock_instance.get.return_value = {
-            "id": "test-id-123",
-            "memory": "test content",
-            "metadata": {"pocketpaw_type": "long_term", "tags": ["test"]},
-        }
-        mock_instance.search.return_value = {
-            "results": [
-                {
-                    "id": "test-id-123",
-                    "memory": "test content",
-                    "metadata": {"pocketpaw_type": "long_term", "tags": ["test"]},
-                    "score": 0.95,
-                }
-            ]
-        }
-        mock_instance.get_all.return_value = {
-            "results": [
-                {
-                    "id": "test-id-123",
-                    "memory": "test content",
-                    "metadata": {"pocketpaw_type": "long_term", "tags": ["test"]},
-                }
-            ]
-        }
-        mock_instance.delete.return_value = None
-        mock_instance.delete_all.return_value = None
+@pytest.fixture(scope="session")
+def shared_mem0_dir(tmp_path_factory):
+    """data_path for stores whose Memory is mocked (nothing is written there)."""
+    return tmp_path_factory.mktemp("mem0_data_shared")
+
 
-        return mock_instance
+class TestMem0MemoryStore:
+    """Tests for Mem0MemoryStore with an injected mock Memory."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_mock(self, mock_mem0_memory):
+        """Drop recorded calls and any side_effect a test set; keep return values."""
+        yield
+        mock_mem0_memory.reset_mock(side_effect=True)
 
     @pytest.fixture
-    def mem0_store(self, mock_mem0_memory, tmp_path):
+    def mem0_store(self, mock_mem0_memory, shared_mem0_dir):
         """Create a Mem0MemoryStore with mocked Memory."""
-        from pocketpaw.memory.mem0_store import Mem0MemoryStore
-
         store = Mem0MemoryStore(
             user_id="test-user",
-            data_path=tmp_path / "mem0_data",
+            data_path=shared_mem0_dir,
             use_inference=False,
             llm_provider="anthropic",
             llm_model="claude-haiku-4-5-20251001",
@@ -304,45 +328,47 @@ class TestMem0MemoryStore:
 
     # --- Save tests ---
 
-    async def test_save_long_term_memory(self, mem0_store, mock_mem0_memory):
-        entry = MemoryEntry(
-            id="",
-            type=MemoryType.LONG_TERM,
-            content="User prefers dark mode",
-            tags=["preferences"],
-        )
-        result_id = await mem0_store.save(entry)
+    @pytest.mark.parametrize(
+        ("entry_kwargs", "scope_kwarg"),
+        [
+            (
+                {
+                    "type": MemoryType.LONG_TERM,
+                    "content": "User prefers dark mode",
+                    "tags": ["preferences"],
+                },
+                ("user_id", "test-user"),
+            ),
+            (
+                {
+                    "type": MemoryType.SESSION,
+                    "content": "Hello, how are you?",
+                    "role": "user",
+                    "session_key": "test-session",
+                },
+                ("run_id", "test-session"),
+            ),
+            (
+                {
+                    "type": MemoryType.DAILY,
+                    "content": "Had a meeting about project X",
+                    "tags": ["work"],
+                },
+                ("user_id", "test-user"),
+            ),
+        ],
+        ids=["long_term", "session", "daily"],
+    )
+    async def test_save_memory(self, mem0_store, mock_mem0_memory, entry_kwargs, scope_kwarg):
+        """Session entries are scoped by run_id (no inference); the rest by user_id."""
+        result_id = await mem0_store.save(MemoryEntry(id="", **entry_kwargs))
         assert result_id == "test-id-123"
         mock_mem0_memory.add.assert_called_once()
-        # Long-term should use user_id
-        call_kwargs = mock_mem0_memory.add.call_args[1]
-        assert call_kwargs.get("user_id") == "test-user"
-
-    async def test_save_session_memory(self, mem0_store, mock_mem0_memory):
-        entry = MemoryEntry(
-            id="",
-            type=MemoryType.SESSION,
-            content="Hello, how are you?",
-            role="user",
-            session_key="test-session",
-        )
-        result_id = await mem0_store.save(entry)
-        assert result_id == "test-id-123"
         call_kwargs = mock_mem0_memory.add.call_args[1]
-        assert call_kwargs.get("run_id") == "test-session"
-        assert call_kwargs.get("infer") is False
-
-    async def test_save_daily_memory(self, mem0_store, mock_mem0_memory):
-        entry = MemoryEntry(
-            id="",
-            type=MemoryType.DAILY,
-            content="Had a meeting about project X",
-            tags=["work"],
-        )
-        result_id = await mem0_store.save(entry)
-        assert result_id == "test-id-123"
-        call_kwargs = mock_mem0_memory.add.call_args[1]
-        assert call_kwargs.get("user_id") == "test-user"
+        key, value = scope_kwarg
+        assert call_kwargs.get(key) == value
+        if entry_kwargs["type"] is MemoryType.SESSION:
+            assert call_kwargs.get("infer") is False
 
     # --- Search tests ---
 
@@ -454,11 +480,11 @@ class TestMem0MemoryStore:
         assert stats["embedder_provider"] == "openai"
         assert stats["vector_store"] == "qdrant"
 
-    # --- Config tests ---
 
-    def test_store_stores_provider_config(self, tmp_path):
-        from pocketpaw.memory.mem0_store import Mem0MemoryStore
+class TestMem0StoreConfig:
+    """Provider settings recorded by the Mem0MemoryStore constructor."""
 
+    def test_store_stores_provider_config(self, tmp_path):
         store = Mem0MemoryStore(
             user_id="test",
             data_path=tmp_path,
@@ -478,17 +504,14 @@ class TestMem0MemoryStore:
 
 
 # =========================================================================
-# MemoryEntry Conversion Tests (requires mem0ai for import)
+# MemoryEntry Conversion Tests (no mem0 needed)
 # =========================================================================
 
 
-@pytest.mark.skipif(not HAS_MEM0, reason="mem0ai not installed")
 class TestMemoryEntryConversion:
     """Test conversion between Mem0 format and MemoryEntry."""
 
     def test_mem0_to_entry_conversion(self):
-        from pocketpaw.memory.mem0_store import Mem0MemoryStore
-
         store = Mem0MemoryStore.__new__(Mem0MemoryStore)
         mem0_item = {
             "id": "test-id",
@@ -508,16 +531,12 @@ class TestMemoryEntryConversion:
         assert "custom_field" in entry.metadata
 
     def test_mem0_to_entry_handles_missing_type(self):
-        from pocketpaw.memory.mem0_store import Mem0MemoryStore
-
         store = Mem0MemoryStore.__new__(Mem0MemoryStore)
         mem0_item = {"id": "test-id", "memory": "Test content", "metadata": {}}
         entry = store._mem0_to_entry(mem0_item)
         assert entry.type == MemoryType.LONG_TERM
 
     def test_mem0_to_entry_handles_session_type(self):
-        from pocketpaw.memory.mem0_store import Mem0MemoryStore
-
         store = Mem0MemoryStore.__new__(Mem0MemoryStore)
         mem0_item = {
             "id": "test-id",
@@ -534,8 +553,6 @@ class TestMemoryEntryConversion:
         assert entry.session_key == "telegram:123"
 
     def test_mem0_to_entry_handles_invalid_timestamp(self):
-        from pocketpaw.memory.mem0_store import Mem0MemoryStore
-
         store = Mem0MemoryStore.__new__(Mem0MemoryStore)
         mem0_item = {
             "id": "test-id",
@@ -551,6 +568,21 @@ class TestMemoryEntryConversion:
 # =========================================================================
 
 
+_SEMANTIC_RESULTS = [
+    {"memory": "User likes Python", "id": "1", "score": 0.9},
+    {"memory": "User is a data scientist", "id": "2", "score": 0.8},
+]
+
+
+def _returning(value):
+    """Plain async stub for mocks whose calls are never asserted (cheaper than AsyncMock)."""
+
+    async def stub(*args, **kwargs):
+        return value
+
+    return stub
+
+
 class TestMemoryManagerAutoLearn:
     """Test auto-learn and semantic context features."""
 
@@ -571,21 +603,18 @@ class TestMemoryManagerAutoLearn:
 
     async def test_get_semantic_context_with_file_backend(self):
         """Semantic context should fall back to get_context_for_agent for file."""
-        mock_store = MagicMock(spec=["get_by_type"])
-        mock_store.get_by_type = AsyncMock(return_value=[])
-        manager = MemoryManager(store=mock_store)
+
+        class _FileStore:
+            get_by_type = staticmethod(_returning([]))
+
+        manager = MemoryManager(store=_FileStore())
         context = await manager.get_semantic_context("test query")
         assert isinstance(context, str)
 
     async def test_get_semantic_context_with_mem0_store(self):
         """Semantic context should use semantic_search for mem0."""
         mock_store = MagicMock()
-        mock_store.semantic_search = AsyncMock(
-            return_value=[
-                {"memory": "User likes Python", "id": "1", "score": 0.9},
-                {"memory": "User is a data scientist", "id": "2", "score": 0.8},
-            ]
-        )
+        mock_store.semantic_search = _returning(_SEMANTIC_RESULTS)
         manager = MemoryManager(store=mock_store)
         context = await manager.get_semantic_context("programming")
         assert "User likes Python" in context
@@ -595,8 +624,8 @@ class TestMemoryManagerAutoLearn:
     async def test_get_semantic_context_empty_results(self):
         """Semantic context should fall back when no results."""
         mock_store = MagicMock()
-        mock_store.semantic_search = AsyncMock(return_value=[])
-        mock_store.get_by_type = AsyncMock(return_value=[])
+        mock_store.semantic_search = _returning([])
+        mock_store.get_by_type = _returning([])
         manager = MemoryManager(store=mock_store)
         context = await manager.get_semantic_context("test")
         assert isinstance(context, str)
@@ -624,7 +653,7 @@ class TestMemorySettings:
         assert settings.mem0_ollama_base_url == "http://localhost:11434"
         assert settings.mem0_auto_learn is True
 
-    def test_memory_settings_saved(self, tmp_path):
+    def test_memory_settings_saved(self, tmp_path, monkeypatch):
         """Memory settings should be included in save()."""
         import json
 
@@ -639,8 +668,8 @@ class TestMemorySettings:
         config_path = tmp_path / "config.json"
         config_path.write_text("{}")
 
-        with patch("pocketpaw.config.get_config_path", return_value=config_path):
-            settings.save()
+        monkeypatch.setattr("pocketpaw.config.get_config_path", lambda: config_path)
+        settings.save()
 
         saved = json.loads(config_path.read_text())
         assert saved["memory_backend"] == "mem0"
@@ -670,11 +699,10 @@ class TestContextBuilderWithMem0:
             return_value="## Relevant Memories\n- User likes Python"
         )
 
-        mock_bootstrap = MagicMock()
-        mock_bootstrap.get_context = AsyncMock()
         mock_context = MagicMock()
         mock_context.to_system_prompt.return_value = "You are PocketPaw."
-        mock_bootstrap.get_context.return_value = mock_context
+        mock_bootstrap = MagicMock()
+        mock_bootstrap.get_context = _returning(mock_context)
 
         builder = AgentContextBuilder(
             bootstrap_provider=mock_bootstrap,
@@ -694,11 +722,10 @@ class TestContextBuilderWithMem0:
         mock_memory = MagicMock()
         mock_memory.get_context_for_agent = AsyncMock(return_value="some context")
 
-        mock_bootstrap = MagicMock()
-        mock_bootstrap.get_context = AsyncMock()
         mock_context = MagicMock()
         mock_context.to_system_prompt.return_value = "You are PocketPaw."
-        mock_bootstrap.get_context.return_value = mock_context
+        mock_bootstrap = MagicMock()
+        mock_bootstrap.get_context = _returning(mock_context)
 
         builder = AgentContextBuilder(
             bootstrap_provider=mock_bootstrap,
@@ -1,6 +1,7 @@
 """Tests for memory isolation — sender-scoped memory and identity injection."""
 
 import hashlib
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from pocketpaw.memory.file_store import FileMemoryStore
@@ -12,12 +13,17 @@ from pocketpaw.memory.protocol import MemoryEntry, MemoryType
 # ---------------------------------------------------------------------------
 
 
+class _StoreStub:
+    """Bare store: _resolve_user_id never touches the store."""
+
+    save = get_by_type = get_session = search = staticmethod(lambda *args, **kwargs: None)
+
+
 class TestResolveUserId:
     """Tests for MemoryManager._resolve_user_id()."""
 
     def _make_manager(self) -> MemoryManager:
-        store = MagicMock(spec=["save", "get_by_type", "get_session", "search"])
-        return MemoryManager(store=store)
+        return MemoryManager(store=_StoreStub())
 
     def test_no_sender_returns_default(self):
         mgr = self._make_manager()
@@ -56,6 +62,18 @@ class TestResolveUserId:
         mgr = self._make_manager()
         assert mgr._resolve_user_id("alice") != mgr._resolve_user_id("bob")
 
+    @patch("pocketpaw.config.get_settings")
+    def test_hash_memoized_per_sender(self, mock_settings):
+        from pocketpaw.memory.manager import _hash_sender_id
+
+        mock_settings.return_value = MagicMock(owner_id="owner123")
+        mgr = self._make_manager()
+        _hash_sender_id.cache_clear()
+        mgr._resolve_user_id("carol")
+        mgr._resolve_user_id("carol")
+        info = _hash_sender_id.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
 
 # ---------------------------------------------------------------------------
 # File store per-user routing
@@ -76,6 +94,19 @@ class TestFileStoreUserScoping:
         assert result == tmp_path / "users" / "abc123" / "MEMORY.md"
         assert result.parent.exists()  # dir auto-created
 
+    def test_get_user_memory_file_creates_dir_once(self, tmp_path, monkeypatch):
+        store = FileMemoryStore(base_path=tmp_path)
+        mkdirs = []
+        real_mkdir = Path.mkdir
+        monkeypatch.setattr(
+            Path, "mkdir", lambda self, *a, **kw: mkdirs.append(self) or real_mkdir(self, *a, **kw)
+        )
+        first = store._get_user_memory_file("abc123")
+        assert mkdirs
+        mkdirs.clear()
+        assert store._get_user_memory_file("abc123") == first
+        assert mkdirs == []
+
     async def test_save_long_term_default_user(self, tmp_path):
         store = FileMemoryStore(base_path=tmp_path)
         entry = MemoryEntry(
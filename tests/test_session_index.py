@@ -2,17 +2,30 @@
 
 Created: 2026-02-10
 Tests Phase A (session index), Phase B (WS switching), Phase D (recent), Phase E (search).
+Updated: 2026-10-16 — indexed-title reuse, rebuild keeps renames; batched index writes;
+  rebuild from raw UTF-8 bytes; thread-pool rebuild; non-ASCII and lone-surrogate byte I/O;
+  empty session files skipped; search word index; in-memory text cache; result cache;
+  original-case match text; non-session listing entries ignored; delete updates the word
+  index; byte prefilter; threaded search cache build; index re-parsed only on change; search
+  thread pool; async rebuild off the loop.
 """
 
 import json
+import threading
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from pocketpaw.memory.file_store import FileMemoryStore
+import pocketpaw.memory.file_store as file_store
+from pocketpaw.memory.file_store import (
+    _SEARCH_CACHE_MAX_CHARS,
+    _SEARCH_RESULT_TTL,
+    FileMemoryStore,
+)
 from pocketpaw.memory.protocol import MemoryEntry, MemoryType
 
 # =========================================================================
@@ -76,6 +89,25 @@ class TestLoadSaveSessionIndex:
         loaded = store._load_session_index()
         assert loaded == index
 
+    def test_unchanged_file_not_reparsed(self, store, monkeypatch):
+        store._save_session_index({"a": {"title": "A"}})
+        parsed = []
+        real_loads = file_store.json_loads
+        monkeypatch.setattr(
+            file_store, "json_loads", lambda raw: parsed.append(raw) or real_loads(raw)
+        )
+        assert store._load_session_index() == {"a": {"title": "A"}}
+        assert store._load_session_index() == {"a": {"title": "A"}}
+        assert parsed == []
+
+    def test_external_change_is_reloaded(self, store):
+        store._save_session_index({"a": {"title": "A"}})
+        store._load_session_index()
+        store._index_path.write_text(json.dumps({"b": {"title": "Longer title"}}))
+        assert store._load_session_index() == {"b": {"title": "Longer title"}}
+        store._index_path.unlink()
+        assert store._load_session_index() == {}
+
     def test_atomic_write(self, store):
         """Verify .tmp file doesn't persist after write."""
         store._save_session_index({"key": {"title": "val"}})
@@ -119,11 +151,73 @@ class TestRebuildSessionIndex:
         assert len(index) == 1
         assert "websocket_abc" in index
 
+    def test_rebuild_parses_utf8_bytes(self, store):
+        (store.sessions_path / "websocket_utf8.json").write_bytes(
+            json.dumps(
+                [{"id": "1", "role": "user", "content": "héllo 🐾", "timestamp": "t"}],
+                ensure_ascii=False,
+            ).encode()
+        )
+        index = store.rebuild_session_index()
+        assert index["websocket_utf8"]["title"] == "héllo 🐾"
+
+    def test_rebuild_on_thread_pool_matches_serial(self, populated_store, monkeypatch):
+        from pocketpaw.memory import file_store
+
+        store, sessions = populated_store
+        (store.sessions_path / "websocket_empty.json").write_text("[]")
+        serial = store.rebuild_session_index()
+
+        monkeypatch.setattr(file_store, "_PARALLEL_REBUILD_MIN_FILES", 1)
+        assert store.rebuild_session_index() == serial
+        assert set(serial) == set(sessions)
+
+    async def test_rebuild_async_scans_off_loop(self, populated_store, monkeypatch):
+        store, sessions = populated_store
+        serial = store.rebuild_session_index()
+        await store.update_session_title(next(iter(sessions)).replace("_", ":", 1), "Mine")
+
+        scan_threads = []
+        real_scan = store._scan_session_index
+
+        def scan(renamed):
+            scan_threads.append(threading.get_ident())
+            return real_scan(renamed)
+
+        monkeypatch.setattr(store, "_scan_session_index", scan)
+        index = await store.rebuild_session_index_async()
+
+        assert scan_threads and scan_threads[0] != threading.get_ident()
+        assert set(index) == set(serial)
+        assert index[next(iter(sessions))]["title"] == "Mine"
+        assert store._load_session_index() == index
+
     def test_rebuild_skips_empty_files(self, store):
         (store.sessions_path / "websocket_empty.json").write_text("[]")
         index = store.rebuild_session_index()
         assert len(index) == 0
 
+    def test_rebuild_does_not_open_empty_files(self, store, monkeypatch):
+        (store.sessions_path / "websocket_empty.json").write_text("[]")
+        (store.sessions_path / "websocket_blank.json").write_text("")
+        opened = []
+        real_read_bytes = Path.read_bytes
+        monkeypatch.setattr(
+            Path, "read_bytes", lambda self: opened.append(self.name) or real_read_bytes(self)
+        )
+        store.rebuild_session_index()
+        assert not [name for name in opened if name.startswith("websocket_")]
+
+    async def test_rebuild_keeps_user_titles(self, populated_store):
+        store, sessions = populated_store
+        safe_key = next(iter(sessions))
+        store.rebuild_session_index()
+        await store.update_session_title(safe_key, "Renamed")
+
+        index = store.rebuild_session_index()
+        assert index[safe_key]["title"] == "Renamed"
+        assert index[safe_key]["user_title"] == "Renamed"
+
 
 class TestUpdateSessionIndex:
     async def test_update_creates_entry(self, store):
@@ -176,6 +270,24 @@ class TestUpdateSessionIndex:
         index = store._load_session_index()
         assert index["websocket_test1"]["title"] == "My Custom Title"
 
+    async def test_update_reuses_indexed_title_for_appended_messages(self, store):
+        entry = MagicMock(spec=MemoryEntry)
+        data = [{"id": "1", "role": "user", "content": "First", "timestamp": "2026-02-10T10:00:00"}]
+        await store._update_session_index("websocket:grow", entry, data)
+
+        # A later append never changes the first user message, so the scan is skipped
+        data.append({"id": "2", "role": "user", "content": "Second", "timestamp": "x"})
+        data[0]["content"] = "Not rescanned"
+        await store._update_session_index("websocket:grow", entry, data)
+        item = store._load_session_index()["websocket_grow"]
+        assert item["title"] == "First"
+        assert item["message_count"] == 2
+
+        # A shorter file (session cleared and restarted) derives the title again
+        restarted = [{"id": "3", "role": "user", "content": "Fresh", "timestamp": "y"}]
+        await store._update_session_index("websocket:grow", entry, restarted)
+        assert store._load_session_index()["websocket_grow"]["title"] == "Fresh"
+
 
 class TestDeleteSession:
     async def test_delete_existing(self, populated_store):
@@ -262,6 +374,106 @@ class TestSaveSessionEntryIntegration:
         assert index["websocket_multi123"]["title"] == "Hi"
 
 
+class TestSessionFileEncoding:
+    async def test_non_ascii_round_trip(self, store):
+        entry = MemoryEntry(
+            id="",
+            type=MemoryType.SESSION,
+            content="Grüße aus Köln 🐾",
+            role="user",
+            session_key="websocket:utf8",
+        )
+        await store.save(entry)
+        store._flush_session_index()
+
+        history = await store.get_session("websocket:utf8")
+        assert history[0].content == "Grüße aus Köln 🐾"
+        raw = (store.sessions_path / "websocket_utf8.json").read_bytes()
+        assert json.loads(raw)[0]["content"] == "Grüße aus Köln 🐾"
+        index = json.loads(store._index_path.read_bytes())
+        assert index["websocket_utf8"]["title"] == "Grüße aus Köln 🐾"
+
+    async def test_lone_surrogate_is_saved(self, store):
+        # Valid JSON "\ud83d" (half an emoji from a UTF-16 client) parses to this
+        entry = MemoryEntry(
+            id="",
+            type=MemoryType.SESSION,
+            content="split \ud83d",
+            role="user",
+            session_key="websocket:surrogate",
+        )
+        await store.save(entry)
+        store._flush_session_index()
+
+        history = await store.get_session("websocket:surrogate")
+        assert history[0].content == "split \ud83d"
+        raw = (store.sessions_path / "websocket_surrogate.json").read_bytes()
+        raw.decode("utf-8")
+
+
+class TestBatchedIndexWrites:
+    """Per-message index updates are coalesced into one delayed write."""
+
+    async def test_burst_of_saves_writes_index_once(self, store, monkeypatch):
+        writes = []
+        real_save = store._save_session_index
+        monkeypatch.setattr(
+            store, "_save_session_index", lambda i: writes.append(1) or real_save(i)
+        )
+
+        timers = []
+        for content in ("one", "two", "three"):
+            await store.save(
+                MemoryEntry(
+                    id="",
+                    type=MemoryType.SESSION,
+                    content=content,
+                    role="user",
+                    session_key="websocket:burst",
+                )
+            )
+            timers.append(store._session_index_flush)
+
+        # One timer covers the whole burst; readers see the pending update
+        assert timers[0] is not None
+        assert timers == [timers[0]] * 3
+        assert store._load_session_index()["websocket_burst"]["message_count"] == 3
+        assert writes == []
+
+        # Run what the timer would, without waiting on the wall clock
+        store._flush_session_index()
+        assert writes == [1]
+        assert store._session_index_flush is None
+        on_disk = json.loads(store._index_path.read_text())
+        assert on_disk["websocket_burst"]["message_count"] == 3
+
+    async def test_direct_save_supersedes_pending_write(self, store):
+        entry = MagicMock(spec=MemoryEntry)
+        data = [{"id": "1", "role": "user", "content": "Hi", "timestamp": "2026-02-10T10:00:00"}]
+        await store._update_session_index("websocket:pend", entry, data)
+        assert store._session_index_flush is not None
+
+        await store.update_session_title("websocket_pend", "Renamed")
+        assert store._session_index_flush is None
+        on_disk = json.loads(store._index_path.read_text())
+        assert on_disk["websocket_pend"]["title"] == "Renamed"
+
+    def test_flush_writes_pending_update(self, store):
+        import asyncio
+
+        entry = MagicMock(spec=MemoryEntry)
+        data = [{"id": "1", "role": "user", "content": "Hi", "timestamp": "2026-02-10T10:00:00"}]
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(store._update_session_index("websocket:exit", entry, data))
+        finally:
+            loop.close()
+
+        # The loop closed before the timer fired; the atexit hook calls this
+        store._flush_session_index()
+        assert "websocket_exit" in json.loads(store._index_path.read_text())
+
+
 class TestIndexMigration:
     """Test that index is built on first run when _index.json doesn't exist."""
 
@@ -503,6 +715,10 @@ class TestSearchSessions:
         assert "sess_one" in ids
         assert "sess_three" in ids
 
+    async def test_match_keeps_original_case(self, search_store):
+        results = await search_store.search_sessions("HELLO a")
+        assert [(r["id"], r["match"]) for r in results] == [("sess_three", "Hello Again")]
+
     async def test_respects_limit(self, search_store):
         results = await search_store.search_sessions("o", limit=1)
         assert len(results) <= 1
@@ -527,13 +743,19 @@ class TestSearchSessions:
             json.dumps([{"role": "user", "content": "secret"}])
         )
         # This is the only real session
-        (sessions / "sess_a.json").write_text(
-            json.dumps([{"role": "user", "content": "secret"}])
-        )
+        (sessions / "sess_a.json").write_text(json.dumps([{"role": "user", "content": "secret"}]))
         results = await store.search_sessions("secret")
         assert len(results) == 1
         assert results[0]["id"] == "sess_a"
 
+    async def test_skips_non_session_entries(self, search_store):
+        sessions = search_store.sessions_path
+        (sessions / "dir_session.json").mkdir()
+        (sessions / "sess_tmp.tmp").write_text(json.dumps([{"role": "user", "content": "mars"}]))
+        (sessions / "_aliases.json").write_text(json.dumps({"mars": "sess_two"}))
+        results = await search_store.search_sessions("mars")
+        assert [r["id"] for r in results] == ["sess_two"]
+
     async def test_truncates_match_to_200_chars(self, tmp_path):
         store = FileMemoryStore(base_path=tmp_path)
         sessions = tmp_path / "sessions"
@@ -546,6 +768,153 @@ class TestSearchSessions:
         assert len(results) == 1
         assert len(results[0]["match"]) == 200
 
+    async def test_matches_inside_words(self, search_store):
+        results = await search_store.search_sessions("ld goo")
+        assert results == []
+        results = await search_store.search_sessions("ELL")
+        assert {r["id"] for r in results} == {"sess_one", "sess_three"}
+
+    async def test_warm_search_reads_no_session_files(self, search_store, monkeypatch):
+        await search_store.search_sessions("warm")  # builds the search cache
+        opened = []
+        real_read_bytes = Path.read_bytes
+        monkeypatch.setattr(
+            Path, "read_bytes", lambda self: opened.append(self.name) or real_read_bytes(self)
+        )
+        results = await search_store.search_sessions("mars")
+        assert [r["id"] for r in results] == ["sess_two"]
+        assert [r["title"] for r in results] == ["Second Session"]
+        assert not [name for name in opened if name.startswith("sess_")]
+
+    async def test_oversized_session_searched_from_disk(self, search_store):
+        big = "y" * _SEARCH_CACHE_MAX_CHARS + " needle"
+        (search_store.sessions_path / "sess_big.json").write_text(
+            json.dumps([{"role": "user", "content": big}])
+        )
+        results = await search_store.search_sessions("needle")
+        assert [r["id"] for r in results] == ["sess_big"]
+        assert search_store._session_texts["sess_big"] is None
+
+    async def test_oversized_miss_is_not_parsed(self, search_store, monkeypatch):
+        big = "y" * _SEARCH_CACHE_MAX_CHARS + " needle"
+        (search_store.sessions_path / "sess_big.json").write_text(
+            json.dumps([{"role": "user", "content": big}])
+        )
+        await search_store.search_sessions("warm")  # builds the search cache
+        parsed = []
+        real_loads = file_store.json_loads
+        monkeypatch.setattr(
+            file_store, "json_loads", lambda raw: parsed.append(len(raw)) or real_loads(raw)
+        )
+        # Every word is in the index, but not as one phrase
+        assert await search_store.search_sessions("needle yyy") == []
+        assert await search_store.search_sessions("needle") != []
+        # Only the hit was parsed
+        assert len([n for n in parsed if n > _SEARCH_CACHE_MAX_CHARS]) == 1
+
+    @pytest.mark.parametrize(
+        ("raw", "needle", "expected"),
+        [
+            (b'[{"content": "Hello World"}]', "hello w", True),
+            (b'[{"content": "Hello World"}]', "goodbye", False),
+            (b'[{"content": "say \\"hi\\""}]', '"hi"', True),  # escaped in JSON
+            (b'[{"content": "\\u212a"}]', "k", True),  # Kelvin sign lowercases to k
+            ('[{"content": "caf\u00e9"}]'.encode(), "zzz", True),  # non-ASCII file
+        ],
+    )
+    def test_raw_prefilter(self, raw, needle, expected):
+        assert file_store._raw_may_match(raw, needle) is expected
+
+    def test_search_cache_on_thread_pool_matches_serial(self, search_store, monkeypatch):
+        serial = file_store._build_session_search_cache(search_store.sessions_path)
+        monkeypatch.setattr(file_store, "_PARALLEL_REBUILD_MIN_FILES", 1)
+        pooled = file_store._build_session_search_cache(search_store.sessions_path)
+        assert pooled == serial
+        assert set(serial[0]) == {"sess_one", "sess_two", "sess_three"}
+
+    async def test_search_reads_on_search_pool(self, search_store, monkeypatch):
+        threads = []
+        real_build = file_store._build_session_search_cache
+
+        def _build(path):
+            threads.append(threading.current_thread().name)
+            return real_build(path)
+
+        monkeypatch.setattr(file_store, "_build_session_search_cache", _build)
+        assert await search_store.search_sessions("mars")
+        assert threads and threads[0].startswith("pocketpaw-search")
+
+    async def test_warm_search_scans_on_search_pool(self, search_store):
+        assert await search_store.search_sessions("mars")  # builds the cache
+        threads = []
+
+        class _Terms(dict):
+            def items(self):
+                threads.append(threading.current_thread().name)
+                return super().items()
+
+        search_store._session_terms = _Terms(search_store._session_terms)
+        assert await search_store.search_sessions("hello")
+        assert threads and threads[0].startswith("pocketpaw-search")
+
+    async def test_deleted_session_not_found(self, search_store):
+        assert await search_store.search_sessions("goodbye")
+        await search_store.delete_session("sess_two")
+        assert await search_store.search_sessions("goodbye") == []
+        assert "goodbye" not in search_store._session_terms
+        assert "sess_two" not in search_store._session_words
+        assert search_store._session_terms["hello"] == {"sess_one", "sess_three"}
+
+    @pytest.fixture
+    def uncached_calls(self, search_store, monkeypatch):
+        calls = []
+        real = search_store._search_sessions_uncached
+
+        async def _counting(query_lower, limit):
+            calls.append(query_lower)
+            return await real(query_lower, limit)
+
+        monkeypatch.setattr(search_store, "_search_sessions_uncached", _counting)
+        return calls
+
+    async def test_repeated_search_is_cached(self, search_store, uncached_calls):
+        first = await search_store.search_sessions("Hello")
+        first[0]["title"] = "mutated by caller"
+        second = await search_store.search_sessions("hello")
+        assert uncached_calls == ["hello"]
+        assert "mutated by caller" not in {r["title"] for r in second}
+        assert {r["id"] for r in second} == {"sess_one", "sess_three"}
+
+    async def test_rename_invalidates_cached_results(self, search_store, uncached_calls):
+        await search_store.search_sessions("goodbye")
+        await search_store.update_session_title("sess_two", "Renamed")
+        results = await search_store.search_sessions("goodbye")
+        assert results[0]["title"] == "Renamed"
+        assert len(uncached_calls) == 2
+
+    async def test_cached_results_expire(self, search_store, uncached_calls, monkeypatch):
+        now = [1000.0]
+        clock = SimpleNamespace(monotonic=lambda: now[0])
+        monkeypatch.setattr("pocketpaw.memory.file_store.time", clock)
+        await search_store.search_sessions("goodbye")
+        now[0] += _SEARCH_RESULT_TTL + 1
+        await search_store.search_sessions("goodbye")
+        assert len(uncached_calls) == 2
+
+    async def test_finds_messages_saved_after_first_search(self, search_store):
+        assert await search_store.search_sessions("jupiter") == []
+        await search_store.save(
+            MemoryEntry(
+                id="",
+                type=MemoryType.SESSION,
+                content="Off to Jupiter",
+                role="user",
+                session_key="websocket:later",
+            )
+        )
+        results = await search_store.search_sessions("jupiter")
+        assert [r["id"] for r in results] == ["websocket_later"]
+
 
 # =========================================================================
 # F2: MemoryManager.search_sessions
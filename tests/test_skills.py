@@ -132,6 +132,47 @@ class TestSkillPromptBuilding:
         assert prompt == "First: apple, Second: banana, Third: cherry"
 
 
+class TestSkillSearchFields:
+    """Test the lowercased fields kept for SkillLoader.search()."""
+
+    def test_lowercased_once_and_hidden(self):
+        """Shadow fields are set at construction and left out of repr/eq."""
+        kwargs = dict(
+            name="Code-Review",
+            description="Review CODE",
+            content="review",
+            path=Path("/tmp/review/SKILL.md"),
+        )
+        skill = Skill(**kwargs)
+
+        assert (skill._name_lc, skill._desc_lc) == ("code-review", "review code")
+        assert "_name_lc" not in repr(skill)
+        assert skill == Skill(**kwargs)
+
+
+class TestSkillImmutability:
+    """Skill is a frozen, slotted dataclass."""
+
+    def test_frozen_and_picklable(self):
+        """Fields can't be reassigned; pickling keeps the search fields."""
+        import dataclasses
+        import pickle
+
+        skill = Skill(
+            name="Commit",
+            description="Commit messages",
+            content="commit",
+            path=Path("/tmp/commit/SKILL.md"),
+        )
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            skill.name = "other"
+        assert not hasattr(skill, "__dict__")
+        restored = pickle.loads(pickle.dumps(skill))
+        assert restored == skill
+        assert restored._name_lc == "commit"
+
+
 class TestSkillLoader:
     """Test SkillLoader."""
 
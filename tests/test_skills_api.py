@@ -9,16 +9,54 @@ Covers:
   - POST /api/skills/reload (force reload)
 
 Created: 2026-02-12
+Updated: 2026-10-16 — skills.sh proxy via httpx.MockTransport; module-scoped loader mock
+  reset per test; tmp_path home; module-level imports; install tests patch only
+  create_subprocess_exec; parametrized preset needs_args checks; plain coroutine stubs;
+  slotted _FakeRequest; shared _SKILL_MD_BYTES.
 """
 
-import asyncio
+import functools
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
+from pocketpaw.dashboard import (
+    install_skill,
+    list_installed_skills,
+    reload_skills,
+    remove_skill,
+    search_skills_library,
+)
+from pocketpaw.mcp.presets import get_all_presets, get_preset
 from pocketpaw.skills.loader import Skill, SkillLoader
 
+_SKILL_MD_BYTES = b"---\nname: my-skill\ndescription: test\n---\nContent"
+
+
+def _async_return(value):
+    """Coroutine function returning *value* — a cheap stand-in for AsyncMock."""
+
+    async def _f(*args, **kwargs):
+        return value
+
+    return _f
+
+
+class _FakeRequest:
+    """Minimal stand-in for a Starlette request; the endpoints only await ``json()``."""
+
+    __slots__ = ("_payload",)
+
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    async def json(self) -> dict:
+        return self._payload
+
+
 # ======================================================================
 # SkillLoader.search() tests
 # ======================================================================
@@ -118,36 +156,80 @@ class TestSkillLoaderSearch:
         assert len(results) == 1
         assert results[0].name == "commit"
 
+    def test_empty_search_returns_a_fresh_list(self):
+        loader = self._make_loader()
+        loader.search("").clear()
+        loader.get_invocable().clear()
+        assert len(loader.search("")) == 3
+        assert len(loader.get_invocable()) == 3
+
+    def test_search_sees_reloaded_skills(self):
+        loader = self._make_loader()
+        assert loader.search("deploy") == []
+        loader._skills = {
+            "deploy": Skill(
+                name="deploy",
+                description="Ship it",
+                content="deploy",
+                path=Path("/fake/deploy/SKILL.md"),
+            )
+        }
+        assert [s.name for s in loader.search("DEPLOY")] == ["deploy"]
+
 
 # ======================================================================
 # REST Endpoint tests (mocked)
 # ======================================================================
 
 
+@pytest.fixture(scope="module")
+def _shared_loader():
+    loader = MagicMock()
+    loader.get_invocable.return_value = [
+        Skill(
+            name="test-skill",
+            description="A test skill",
+            content="test",
+            path=Path("/fake/SKILL.md"),
+            user_invocable=True,
+            argument_hint="[query]",
+        ),
+    ]
+    return loader
+
+
 class TestSkillsRESTEndpoints:
     """Test the REST endpoints by importing from dashboard and calling directly."""
 
     @pytest.fixture
-    def mock_loader(self):
-        loader = MagicMock()
-        loader.reload.return_value = {}
-        loader.get_invocable.return_value = [
-            Skill(
-                name="test-skill",
-                description="A test skill",
-                content="test",
-                path=Path("/fake/SKILL.md"),
-                user_invocable=True,
-                argument_hint="[query]",
-            ),
-        ]
-        return loader
+    def skills_sh(self):
+        """Serve skills.sh requests from an in-process httpx.MockTransport.
+
+        The real AsyncClient still builds and sends the request, so query
+        encoding, ``raise_for_status`` and ``json()`` are exercised for real.
+        Set ``payload`` / ``status_code`` before the call; sent requests are
+        collected in ``requests``.
+        """
+        state = SimpleNamespace(payload={}, status_code=200, requests=[])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            state.requests.append(request)
+            return httpx.Response(state.status_code, json=state.payload)
+
+        client_cls = functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(handler))
+        with patch("httpx.AsyncClient", client_cls):
+            yield state
+
+    @pytest.fixture
+    def mock_loader(self, _shared_loader):
+        """Module-wide loader mock; call history and ``reload`` reset per test."""
+        _shared_loader.reset_mock()
+        _shared_loader.reload.return_value = {}
+        return _shared_loader
 
     async def test_list_installed_skills(self, mock_loader):
         """GET /api/skills returns installed invocable skills."""
         with patch("pocketpaw.dashboard.get_skill_loader", return_value=mock_loader):
-            from pocketpaw.dashboard import list_installed_skills
-
             result = await list_installed_skills()
             assert len(result) == 1
             assert result[0]["name"] == "test-skill"
@@ -174,52 +256,42 @@ class TestSkillsRESTEndpoints:
             ),
         }
         with patch("pocketpaw.dashboard.get_skill_loader", return_value=mock_loader):
-            from pocketpaw.dashboard import reload_skills
-
             result = await reload_skills()
             assert result["status"] == "ok"
             assert result["count"] == 1  # only 1 invocable
 
     async def test_search_skills_library_empty_query(self):
         """GET /api/skills/search with empty q returns empty list."""
-        from pocketpaw.dashboard import search_skills_library
-
         result = await search_skills_library(q="", limit=30)
         assert result == {"skills": [], "count": 0}
 
-    async def test_search_skills_library_proxies(self):
+    async def test_search_skills_library_proxies(self, skills_sh):
         """GET /api/skills/search proxies to skills.sh API."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
+        skills_sh.payload = {
             "skills": [{"name": "react-skill", "installs": 1000}],
             "count": 1,
         }
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock()
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client.get = AsyncMock(return_value=mock_response)
-
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            from pocketpaw.dashboard import search_skills_library
-
-            result = await search_skills_library(q="react", limit=10)
-            assert result == {
-                "skills": [{"name": "react-skill", "installs": 1000}],
-                "count": 1,
-            }
-            mock_client.get.assert_called_once_with(
-                "https://skills.sh/api/search",
-                params={"q": "react", "limit": 10},
-            )
+        result = await search_skills_library(q="react", limit=10)
+        assert result == {
+            "skills": [{"name": "react-skill", "installs": 1000}],
+            "count": 1,
+        }
+        assert len(skills_sh.requests) == 1
+        url = skills_sh.requests[0].url
+        assert url.copy_with(query=None) == "https://skills.sh/api/search"
+        assert dict(url.params) == {"q": "react", "limit": "10"}
+
+    async def test_search_skills_library_upstream_error(self, skills_sh):
+        """An HTTP error from skills.sh is reported instead of raised."""
+        skills_sh.status_code = 502
+        result = await search_skills_library(q="react", limit=10)
+        assert result["skills"] == []
+        assert result["count"] == 0
+        assert "502" in result["error"]
 
     async def test_install_skill_missing_source(self):
         """POST /api/skills/install with no source returns 400."""
-        from pocketpaw.dashboard import install_skill
-
-        request = MagicMock()
-        request.json = AsyncMock(return_value={})
+        request = _FakeRequest({})
 
         result = await install_skill(request)
         # FastAPI JSONResponse
@@ -227,151 +299,90 @@ class TestSkillsRESTEndpoints:
 
     async def test_install_skill_invalid_source(self):
         """POST /api/skills/install with dangerous chars returns 400."""
-        from pocketpaw.dashboard import install_skill
-
-        request = MagicMock()
-        request.json = AsyncMock(return_value={"source": "foo; rm -rf /"})
+        request = _FakeRequest({"source": "foo; rm -rf /"})
 
         result = await install_skill(request)
         assert result.status_code == 400
 
-    async def test_install_skill_success(self, mock_loader):
+    async def test_install_skill_success(self, mock_loader, tmp_path, monkeypatch):
         """POST /api/skills/install clones repo, copies skill dir, reloads."""
-        import tempfile
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        request = _FakeRequest({"source": "owner/repo/my-skill"})
 
-        request = MagicMock()
-        request.json = AsyncMock(return_value={"source": "owner/repo/my-skill"})
+        mock_proc = SimpleNamespace(communicate=_async_return((b"", b"")), returncode=0)
 
-        mock_proc = AsyncMock()
-        mock_proc.communicate = AsyncMock(return_value=(b"", b""))
-        mock_proc.returncode = 0
+        # Prepare a fake cloned repo with a skill inside skills/ subdir
+        async def fake_clone(*args, **kwargs):
+            # args: "git", "clone", "--depth=1", url, tmpdir
+            tmpdir = Path(args[4])
+            skill_dir = tmpdir / "skills" / "my-skill"
+            skill_dir.mkdir(parents=True)
+            (skill_dir / "SKILL.md").write_bytes(_SKILL_MD_BYTES)
+            return mock_proc
 
         with (
-            patch("pocketpaw.dashboard.asyncio") as mock_asyncio,
+            patch("pocketpaw.dashboard.asyncio.create_subprocess_exec", new=fake_clone),
             patch("pocketpaw.dashboard.get_skill_loader", return_value=mock_loader),
-            tempfile.TemporaryDirectory() as fake_home,
         ):
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=mock_proc)
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.TimeoutError = asyncio.TimeoutError
-
-            # Make wait_for actually call the coroutine
-            async def passthrough(coro, timeout):
-                return await coro
-
-            mock_asyncio.wait_for = passthrough
-
-            # Prepare a fake cloned repo with a skill inside skills/ subdir
-            from pathlib import Path
-
-            async def fake_clone(*args, **kwargs):
-                # args: "git", "clone", "--depth=1", url, tmpdir
-                tmpdir = Path(args[4])
-                skill_dir = tmpdir / "skills" / "my-skill"
-                skill_dir.mkdir(parents=True)
-                (skill_dir / "SKILL.md").write_text(
-                    "---\nname: my-skill\ndescription: test\n---\nContent"
-                )
-                return mock_proc
-
-            mock_asyncio.create_subprocess_exec = AsyncMock(side_effect=fake_clone)
-
-            # Patch install dir to use temp dir
-            install_path = Path(fake_home) / ".agents" / "skills"
-            with patch("pathlib.Path.home", return_value=Path(fake_home)):
-                from pocketpaw.dashboard import install_skill
+            result = await install_skill(request)
 
-                result = await install_skill(request)
-                assert result["status"] == "ok"
-                assert "my-skill" in result["installed"]
-                assert (install_path / "my-skill" / "SKILL.md").exists()
+        install_path = tmp_path / ".agents" / "skills"
+        assert result["status"] == "ok"
+        assert "my-skill" in result["installed"]
+        assert (install_path / "my-skill" / "SKILL.md").read_bytes() == _SKILL_MD_BYTES
 
     async def test_install_skill_clone_failure(self, mock_loader):
         """POST /api/skills/install returns error when git clone fails."""
-        request = MagicMock()
-        request.json = AsyncMock(return_value={"source": "owner/bad-repo/skill"})
+        request = _FakeRequest({"source": "owner/bad-repo/skill"})
 
-        mock_proc = AsyncMock()
-        mock_proc.communicate = AsyncMock(return_value=(b"", b"fatal: repository not found\n"))
-        mock_proc.returncode = 128
+        mock_proc = SimpleNamespace(
+            communicate=_async_return((b"", b"fatal: repository not found\n")),
+            returncode=128,
+        )
 
-        with (
-            patch("pocketpaw.dashboard.asyncio") as mock_asyncio,
+        with patch(
+            "pocketpaw.dashboard.asyncio.create_subprocess_exec",
+            new=_async_return(mock_proc),
         ):
-            mock_asyncio.create_subprocess_exec = AsyncMock(return_value=mock_proc)
-            mock_asyncio.subprocess = asyncio.subprocess
-            mock_asyncio.TimeoutError = asyncio.TimeoutError
-
-            async def passthrough(coro, timeout):
-                return await coro
-
-            mock_asyncio.wait_for = passthrough
-
-            from pocketpaw.dashboard import install_skill
-
             result = await install_skill(request)
-            assert result.status_code == 500
+        assert result.status_code == 500
 
     async def test_remove_skill_missing_name(self):
         """POST /api/skills/remove with no name returns 400."""
-        from pocketpaw.dashboard import remove_skill
-
-        request = MagicMock()
-        request.json = AsyncMock(return_value={})
+        request = _FakeRequest({})
 
         result = await remove_skill(request)
         assert result.status_code == 400
 
     async def test_remove_skill_invalid_name(self):
         """POST /api/skills/remove with dangerous chars returns 400."""
-        from pocketpaw.dashboard import remove_skill
-
-        request = MagicMock()
-        request.json = AsyncMock(return_value={"name": "foo|bar"})
+        request = _FakeRequest({"name": "foo|bar"})
 
         result = await remove_skill(request)
         assert result.status_code == 400
 
-    async def test_remove_skill_success(self, mock_loader):
+    async def test_remove_skill_success(self, mock_loader, tmp_path, monkeypatch):
         """POST /api/skills/remove deletes skill dir and reloads."""
-        import tempfile
-        from pathlib import Path
-
-        request = MagicMock()
-        request.json = AsyncMock(return_value={"name": "old-skill"})
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        request = _FakeRequest({"name": "old-skill"})
 
-        with (
-            tempfile.TemporaryDirectory() as fake_home,
-            patch("pocketpaw.dashboard.get_skill_loader", return_value=mock_loader),
-            patch("pathlib.Path.home", return_value=Path(fake_home)),
-        ):
+        with patch("pocketpaw.dashboard.get_skill_loader", return_value=mock_loader):
             # Create a fake installed skill
-            skill_dir = Path(fake_home) / ".agents" / "skills" / "old-skill"
+            skill_dir = tmp_path / ".agents" / "skills" / "old-skill"
             skill_dir.mkdir(parents=True)
-            (skill_dir / "SKILL.md").write_text("---\nname: old-skill\n---\nContent")
-
-            from pocketpaw.dashboard import remove_skill
+            (skill_dir / "SKILL.md").write_bytes(_SKILL_MD_BYTES)
 
             result = await remove_skill(request)
             assert result["status"] == "ok"
             assert not skill_dir.exists()
 
-    async def test_remove_skill_not_found(self):
+    async def test_remove_skill_not_found(self, tmp_path, monkeypatch):
         """POST /api/skills/remove returns 404 for non-existent skill."""
-        import tempfile
-        from pathlib import Path
-
-        request = MagicMock()
-        request.json = AsyncMock(return_value={"name": "nonexistent"})
-
-        with (
-            tempfile.TemporaryDirectory() as fake_home,
-            patch("pathlib.Path.home", return_value=Path(fake_home)),
-        ):
-            from pocketpaw.dashboard import remove_skill
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        request = _FakeRequest({"name": "nonexistent"})
 
-            result = await remove_skill(request)
-            assert result.status_code == 404
+        result = await remove_skill(request)
+        assert result.status_code == 404
 
 
 # ======================================================================
@@ -380,38 +391,22 @@ class TestSkillsRESTEndpoints:
 
 
 class TestMCPPresetNeedsArgs:
-    def test_filesystem_needs_args(self):
-        from pocketpaw.mcp.presets import get_preset
-
-        p = get_preset("filesystem")
-        assert p is not None
-        assert p.needs_args is True
-
-    def test_postgres_needs_args(self):
-        from pocketpaw.mcp.presets import get_preset
-
-        p = get_preset("postgres")
-        assert p is not None
-        assert p.needs_args is True
-
-    def test_sqlite_needs_args(self):
-        from pocketpaw.mcp.presets import get_preset
-
-        p = get_preset("sqlite")
+    @pytest.mark.parametrize(
+        ("preset_id", "expected"),
+        [
+            ("filesystem", True),
+            ("postgres", True),
+            ("sqlite", True),
+            ("github", False),
+        ],
+    )
+    def test_needs_args(self, preset_id, expected):
+        p = get_preset(preset_id)
         assert p is not None
-        assert p.needs_args is True
-
-    def test_github_does_not_need_args(self):
-        from pocketpaw.mcp.presets import get_preset
-
-        p = get_preset("github")
-        assert p is not None
-        assert p.needs_args is False
+        assert p.needs_args is expected
 
     def test_needs_args_in_preset_response(self):
         """list_mcp_presets includes needs_args in response."""
-        from pocketpaw.mcp.presets import get_all_presets
-
         for p in get_all_presets():
             # Every preset should have a bool needs_args
             assert isinstance(p.needs_args, bool), f"Preset {p.id} needs_args is not bool"
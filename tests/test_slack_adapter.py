@@ -1,9 +1,13 @@
 # Tests for Slack Channel Adapter
 # Created: 2026-02-06
+# Updated: 2026-10-16 — MockAsyncApp.client is a SimpleNamespace, not a MagicMock; _out()
+#   builds outbound messages; send tests compare kwargs as one dict; started_adapter
+#   fixture; shared _POST_RESULT; _async_recorder() client stubs.
 
 import sys
 import types
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -16,12 +20,29 @@ mock_socket_mode = types.ModuleType("slack_bolt.adapter.socket_mode")
 mock_async_handler = types.ModuleType("slack_bolt.adapter.socket_mode.async_handler")
 
 
+# Read-only chat.postMessage response shared by every MockAsyncApp
+_POST_RESULT = {"ts": "1234567890.123456"}
+
+
+def _async_recorder(return_value=None):
+    """Coroutine function that appends each call's kwargs to its ``.calls`` list."""
+    calls = []
+
+    async def _f(**kwargs):
+        calls.append(kwargs)
+        return return_value
+
+    _f.calls = calls
+    return _f
+
+
 class MockAsyncApp:
     def __init__(self, **kwargs):
         self.token = kwargs.get("token")
-        self.client = MagicMock()
-        self.client.chat_postMessage = AsyncMock(return_value={"ts": "1234567890.123456"})
-        self.client.chat_update = AsyncMock()
+        self.client = SimpleNamespace(
+            chat_postMessage=_async_recorder(_POST_RESULT),
+            chat_update=_async_recorder(),
+        )
         self._event_handlers = {}
         self._command_handlers = {}
 
@@ -66,6 +87,11 @@ from pocketpaw.bus.events import Channel, OutboundMessage
 from pocketpaw.bus.queue import MessageBus
 
 
+def _out(content: str, **kwargs) -> OutboundMessage:
+    """OutboundMessage for the default allowed Slack channel."""
+    return OutboundMessage(channel=Channel.SLACK, chat_id="C111", content=content, **kwargs)
+
+
 @pytest.fixture
 def adapter():
     return SlackAdapter(
@@ -80,6 +106,14 @@ def bus():
     return MessageBus()
 
 
+@pytest.fixture
+async def started_adapter(adapter, bus):
+    """The default adapter, started on ``bus`` and stopped after the test."""
+    await adapter.start(bus)
+    yield adapter
+    await adapter.stop()
+
+
 def test_channel_property(adapter):
     assert adapter.channel == Channel.SLACK
 
@@ -93,111 +127,75 @@ async def test_start_stop(adapter, bus):
     assert adapter._running is False
 
 
-async def test_send_normal_message(adapter, bus):
-    await adapter.start(bus)
+async def test_send_normal_message(started_adapter):
+    msg = _out("Hello Slack!")
+    await started_adapter.send(msg)
 
-    msg = OutboundMessage(
-        channel=Channel.SLACK,
-        chat_id="C111",
-        content="Hello Slack!",
-    )
-    await adapter.send(msg)
+    post = started_adapter._slack_app.client.chat_postMessage
+    assert post.calls == [{"channel": "C111", "text": "Hello Slack!"}]
 
-    adapter._slack_app.client.chat_postMessage.assert_called_once_with(
-        channel="C111",
-        text="Hello Slack!",
-    )
 
+async def test_send_with_thread_ts(started_adapter):
+    msg = _out("Threaded reply", metadata={"thread_ts": "1234567890.111"})
+    await started_adapter.send(msg)
 
-async def test_send_with_thread_ts(adapter, bus):
-    await adapter.start(bus)
+    post = started_adapter._slack_app.client.chat_postMessage
+    assert post.calls == [
+        {"channel": "C111", "text": "Threaded reply", "thread_ts": "1234567890.111"}
+    ]
 
-    msg = OutboundMessage(
-        channel=Channel.SLACK,
-        chat_id="C111",
-        content="Threaded reply",
-        metadata={"thread_ts": "1234567890.111"},
-    )
-    await adapter.send(msg)
-
-    adapter._slack_app.client.chat_postMessage.assert_called_once_with(
-        channel="C111",
-        text="Threaded reply",
-        thread_ts="1234567890.111",
-    )
 
+async def test_stream_buffering(started_adapter):
+    chunk = _out("Hello ", is_stream_chunk=True)
+    await started_adapter.send(chunk)
 
-async def test_stream_buffering(adapter, bus):
-    await adapter.start(bus)
-
-    chunk = OutboundMessage(
-        channel=Channel.SLACK,
-        chat_id="C111",
-        content="Hello ",
-        is_stream_chunk=True,
-    )
-    await adapter.send(chunk)
-
-    assert "C111" in adapter._buffers
-    assert adapter._buffers["C111"]["text"] == "Hello "
+    assert "C111" in started_adapter._buffers
+    assert started_adapter._buffers["C111"]["text"] == "Hello "
     # First chunk triggers chat_postMessage with "..."
-    adapter._slack_app.client.chat_postMessage.assert_called_once()
-
+    assert len(started_adapter._slack_app.client.chat_postMessage.calls) == 1
 
-async def test_stream_flush_via_chat_update(adapter, bus):
-    await adapter.start(bus)
 
+async def test_stream_flush_via_chat_update(started_adapter):
     # Prime the buffer
-    adapter._buffers["C111"] = {
+    started_adapter._buffers["C111"] = {
         "ts": "1234567890.123456",
         "text": "Complete response",
         "thread_ts": None,
         "last_update": 0,
     }
 
-    end_msg = OutboundMessage(
-        channel=Channel.SLACK,
-        chat_id="C111",
-        content="",
-        is_stream_end=True,
-    )
-    await adapter.send(end_msg)
+    end_msg = _out("", is_stream_end=True)
+    await started_adapter.send(end_msg)
 
-    assert "C111" not in adapter._buffers
-    adapter._slack_app.client.chat_update.assert_called_once_with(
-        channel="C111",
-        ts="1234567890.123456",
-        text="Complete response",
-    )
+    assert "C111" not in started_adapter._buffers
+    assert started_adapter._slack_app.client.chat_update.calls == [
+        {"channel": "C111", "ts": "1234567890.123456", "text": "Complete response"}
+    ]
 
 
-async def test_channel_filtering(adapter, bus):
+async def test_channel_filtering(started_adapter, bus):
     """Messages from non-allowed channels are ignored."""
-    await adapter.start(bus)
-
     event = {
         "channel": "C999",  # not in allowed list
         "user": "U123",
         "text": "hello",
         "channel_type": "im",
     }
-    await adapter._handle_slack_event(event)
+    await started_adapter._handle_slack_event(event)
 
     # No message should be published
     assert bus.inbound_pending() == 0
 
 
-async def test_mention_handler(adapter, bus):
+async def test_mention_handler(started_adapter, bus):
     """app_mention events are processed."""
-    await adapter.start(bus)
-
     event = {
         "channel": "C111",
         "user": "U123",
         "text": "<@BOT123> what is the weather",
         "ts": "123.456",
     }
-    await adapter._handle_slack_event(event)
+    await started_adapter._handle_slack_event(event)
 
     assert bus.inbound_pending() == 1
     msg = await bus.consume_inbound()
@@ -228,10 +226,8 @@ async def test_dm_handler(adapter, bus):
     assert msg.content == "hello bot"
 
 
-async def test_thread_ts_in_metadata(adapter, bus):
+async def test_thread_ts_in_metadata(started_adapter, bus):
     """thread_ts is passed through metadata."""
-    await adapter.start(bus)
-
     event = {
         "channel": "C111",
         "user": "U123",
@@ -239,7 +235,7 @@ async def test_thread_ts_in_metadata(adapter, bus):
         "thread_ts": "123.000",
         "ts": "123.001",
     }
-    await adapter._handle_slack_event(event)
+    await started_adapter._handle_slack_event(event)
 
     msg = await bus.consume_inbound()
     assert msg.metadata["thread_ts"] == "123.000"
@@ -255,11 +251,7 @@ async def test_bus_integration(bus):
     adapter._running = True
     bus.subscribe_outbound(adapter.channel, adapter.send)
 
-    msg = OutboundMessage(
-        channel=Channel.SLACK,
-        chat_id="C111",
-        content="response",
-    )
+    msg = _out("response")
     await bus.publish_outbound(msg)
 
     adapter.send.assert_called_once_with(msg)
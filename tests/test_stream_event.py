@@ -1,7 +1,19 @@
 # Tests for StreamEvent token-by-token streaming integration
 # Created: 2026-02-06
+# Updated: 2026-10-16 — _make_sdk() builds a _FakeSDK with its own settings mock;
+#   monkeypatch-based loop_env fixture; module-level imports; fake query() streams from
+#   _query_yielding(); SimpleNamespace loop_env collaborators; _events_of()/_count() filter
+#   while streaming.
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from pocketpaw.agents.claude_sdk import ClaudeAgentSDK
+from pocketpaw.agents.loop import AgentLoop
+from pocketpaw.agents.protocol import AgentEvent
+from pocketpaw.bus import Channel, InboundMessage
 
 # ---------------------------------------------------------------------------
 # Helpers — lightweight fakes for SDK types
@@ -38,46 +50,80 @@ class FakeResultMessage:
         self.is_error = is_error
 
 
-def _make_sdk(settings=None):
-    """Create a ClaudeAgentSDK with mocked SDK imports."""
-    from pocketpaw.agents.claude_sdk import ClaudeAgentSDK
-
-    s = settings or MagicMock(
-        tool_profile="full",
-        tools_allow=[],
-        tools_deny=[],
-        bypass_permissions=True,
-        smart_routing_enabled=False,
-        llm_provider="anthropic",
-        anthropic_api_key="sk-test",
-        anthropic_model="claude-sonnet-4-5-20250929",
-        ollama_host="http://localhost:11434",
+class _FakeSDK(ClaudeAgentSDK):
+    """ClaudeAgentSDK whose _initialize() wires fake SDK types instead of importing."""
+
+    def _initialize(self) -> None:
+        self._sdk_available = True
+        self._cli_available = True
+        self._StreamEvent = FakeStreamEvent
+        self._AssistantMessage = FakeAssistantMessage
+        self._TextBlock = FakeTextBlock
+        self._ToolUseBlock = FakeToolUseBlock
+        self._ResultMessage = FakeResultMessage
+        self._UserMessage = type("UserMessage", (), {})
+        self._SystemMessage = type("SystemMessage", (), {})
+        self._ToolResultBlock = type("ToolResultBlock", (), {})
+        self._HookMatcher = lambda matcher, hooks: MagicMock()
+        self._ClaudeAgentOptions = lambda **kw: MagicMock()
+
+
+def _make_sdk():
+    """Return a fresh ClaudeAgentSDK with mocked SDK imports.
+
+    Each call builds its own settings mock (and the tool policy derived from
+    it), so no mock state carries over between tests.
+    """
+    return _FakeSDK(
+        MagicMock(
+            tool_profile="full",
+            tools_allow=[],
+            tools_deny=[],
+            bypass_permissions=True,
+            smart_routing_enabled=False,
+            llm_provider="anthropic",
+            anthropic_api_key="sk-test",
+            anthropic_model="claude-sonnet-4-5-20250929",
+            ollama_host="http://localhost:11434",
+        )
     )
-    with patch.object(ClaudeAgentSDK, "_initialize"):
-        sdk = ClaudeAgentSDK(s)
-
-    # Wire up fake types
-    sdk._sdk_available = True
-    sdk._cli_available = True
-    sdk._StreamEvent = FakeStreamEvent
-    sdk._AssistantMessage = FakeAssistantMessage
-    sdk._TextBlock = FakeTextBlock
-    sdk._ToolUseBlock = FakeToolUseBlock
-    sdk._ResultMessage = FakeResultMessage
-    sdk._UserMessage = type("UserMessage", (), {})
-    sdk._SystemMessage = type("SystemMessage", (), {})
-    sdk._ToolResultBlock = type("ToolResultBlock", (), {})
-    sdk._HookMatcher = lambda matcher, hooks: MagicMock()
-    sdk._ClaudeAgentOptions = lambda **kw: MagicMock()
-    return sdk
-
-
-async def _collect(sdk, message="hi"):
-    """Collect all AgentEvents from chat()."""
-    events = []
+
+
+class _ListAsyncIter:
+    """Async iterator over a fixed list — a frame-free stand-in for query()."""
+
+    def __init__(self, items):
+        self._it = iter(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._it)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+    async def aclose(self):
+        """Match the async-generator API; AgentLoop closes the router stream."""
+
+
+def _query_yielding(*items):
+    """Fake ``sdk._query`` that yields *items* on each call."""
+    return lambda **kw: _ListAsyncIter(items)
+
+
+async def _events_of(sdk, type_, message="hi"):
+    """AgentEvents of *type_* from run(), filtered as they stream."""
+    return [ev async for ev in sdk.run(message) if ev.type == type_]
+
+
+async def _count(sdk, type_, message="hi"):
+    """Number of *type_* AgentEvents from run(), without keeping them."""
+    n = 0
     async for ev in sdk.run(message):
-        events.append(ev)
-    return events
+        n += ev.type == type_
+    return n
 
 
 # ---------------------------------------------------------------------------
@@ -92,16 +138,14 @@ class TestStreamEventHandling:
         """StreamEvent with text_delta yields AgentEvent(type='message')."""
         sdk = _make_sdk()
 
-        async def fake_query(**kw):
-            yield FakeStreamEvent({"type": "content_block_delta", "delta": {"text": "Hello"}})
-            yield FakeStreamEvent({"type": "content_block_delta", "delta": {"text": " world"}})
+        sdk._query = _query_yielding(
+            FakeStreamEvent({"type": "content_block_delta", "delta": {"text": "Hello"}}),
+            FakeStreamEvent({"type": "content_block_delta", "delta": {"text": " world"}}),
             # Follow with an AssistantMessage (text should be skipped)
-            yield FakeAssistantMessage([FakeTextBlock("Hello world")])
+            FakeAssistantMessage([FakeTextBlock("Hello world")]),
+        )
 
-        sdk._query = fake_query
-
-        events = await _collect(sdk)
-        messages = [e for e in events if e.type == "message"]
+        messages = await _events_of(sdk, "message")
         assert len(messages) == 2
         assert messages[0].content == "Hello"
         assert messages[1].content == " world"
@@ -110,16 +154,14 @@ class TestStreamEventHandling:
         """StreamEvent with thinking_delta yields AgentEvent(type='thinking')."""
         sdk = _make_sdk()
 
-        async def fake_query(**kw):
-            yield FakeStreamEvent(
+        sdk._query = _query_yielding(
+            FakeStreamEvent(
                 {"type": "content_block_delta", "delta": {"thinking": "Let me reason..."}}
-            )
-            yield FakeAssistantMessage([])
-
-        sdk._query = fake_query
+            ),
+            FakeAssistantMessage([]),
+        )
 
-        events = await _collect(sdk)
-        thinking = [e for e in events if e.type == "thinking"]
+        thinking = await _events_of(sdk, "thinking")
         assert len(thinking) == 1
         assert thinking[0].content == "Let me reason..."
 
@@ -127,35 +169,27 @@ class TestStreamEventHandling:
         """content_block_stop for thinking block yields AgentEvent(type='thinking_done')."""
         sdk = _make_sdk()
 
-        async def fake_query(**kw):
-            ev = FakeStreamEvent({"type": "content_block_stop", "index": 0})
-            ev._block_type = "thinking"
-            yield ev
-            yield FakeAssistantMessage([])
+        ev = FakeStreamEvent({"type": "content_block_stop", "index": 0})
+        ev._block_type = "thinking"
+        sdk._query = _query_yielding(ev, FakeAssistantMessage([]))
 
-        sdk._query = fake_query
-
-        events = await _collect(sdk)
-        done = [e for e in events if e.type == "thinking_done"]
-        assert len(done) == 1
+        assert await _count(sdk, "thinking_done") == 1
 
     async def test_tool_use_start_yields_tool_use(self):
         """content_block_start with tool_use yields AgentEvent(type='tool_use')."""
         sdk = _make_sdk()
 
-        async def fake_query(**kw):
-            yield FakeStreamEvent(
+        sdk._query = _query_yielding(
+            FakeStreamEvent(
                 {
                     "type": "content_block_start",
                     "content_block": {"type": "tool_use", "name": "Bash"},
                 }
-            )
-            yield FakeAssistantMessage([FakeToolUseBlock("Bash", {"command": "ls"})])
-
-        sdk._query = fake_query
+            ),
+            FakeAssistantMessage([FakeToolUseBlock("Bash", {"command": "ls"})]),
+        )
 
-        events = await _collect(sdk)
-        tool_events = [e for e in events if e.type == "tool_use"]
+        tool_events = await _events_of(sdk, "tool_use")
         # Should only get ONE tool_use (from StreamEvent), not a duplicate from AssistantMessage
         assert len(tool_events) == 1
         assert tool_events[0].metadata["name"] == "Bash"
@@ -164,14 +198,12 @@ class TestStreamEventHandling:
         """When StreamEvent deltas sent, AssistantMessage text is skipped."""
         sdk = _make_sdk()
 
-        async def fake_query(**kw):
-            yield FakeStreamEvent({"type": "content_block_delta", "delta": {"text": "Hi"}})
-            yield FakeAssistantMessage([FakeTextBlock("Hi")])
+        sdk._query = _query_yielding(
+            FakeStreamEvent({"type": "content_block_delta", "delta": {"text": "Hi"}}),
+            FakeAssistantMessage([FakeTextBlock("Hi")]),
+        )
 
-        sdk._query = fake_query
-
-        events = await _collect(sdk)
-        messages = [e for e in events if e.type == "message"]
+        messages = await _events_of(sdk, "message")
         # Only the StreamEvent delta, not the AssistantMessage duplicate
         assert len(messages) == 1
         assert messages[0].content == "Hi"
@@ -180,33 +212,26 @@ class TestStreamEventHandling:
         """When StreamEvent announced tool, AssistantMessage tool_use is skipped."""
         sdk = _make_sdk()
 
-        async def fake_query(**kw):
-            yield FakeStreamEvent(
+        sdk._query = _query_yielding(
+            FakeStreamEvent(
                 {
                     "type": "content_block_start",
                     "content_block": {"type": "tool_use", "name": "Read"},
                 }
-            )
-            yield FakeAssistantMessage([FakeToolUseBlock("Read", {"file": "foo.py"})])
-
-        sdk._query = fake_query
+            ),
+            FakeAssistantMessage([FakeToolUseBlock("Read", {"file": "foo.py"})]),
+        )
 
-        events = await _collect(sdk)
-        tool_events = [e for e in events if e.type == "tool_use"]
-        assert len(tool_events) == 1
+        assert await _count(sdk, "tool_use") == 1
 
     async def test_fallback_without_stream_event(self):
         """With _StreamEvent = None, AssistantMessage text yields normally."""
         sdk = _make_sdk()
         sdk._StreamEvent = None  # Disable StreamEvent support
 
-        async def fake_query(**kw):
-            yield FakeAssistantMessage([FakeTextBlock("Fallback text")])
-
-        sdk._query = fake_query
+        sdk._query = _query_yielding(FakeAssistantMessage([FakeTextBlock("Fallback text")]))
 
-        events = await _collect(sdk)
-        messages = [e for e in events if e.type == "message"]
+        messages = await _events_of(sdk, "message")
         assert len(messages) == 1
         assert messages[0].content == "Fallback text"
 
@@ -214,147 +239,102 @@ class TestStreamEventHandling:
         """_streamed_via_events resets between AssistantMessages."""
         sdk = _make_sdk()
 
-        async def fake_query(**kw):
+        sdk._query = _query_yielding(
             # Turn 1: stream via events
-            yield FakeStreamEvent({"type": "content_block_delta", "delta": {"text": "Turn1"}})
-            yield FakeAssistantMessage([FakeTextBlock("Turn1")])
+            FakeStreamEvent({"type": "content_block_delta", "delta": {"text": "Turn1"}}),
+            FakeAssistantMessage([FakeTextBlock("Turn1")]),
             # Turn 2: no stream events → AssistantMessage text should yield
-            yield FakeAssistantMessage([FakeTextBlock("Turn2")])
+            FakeAssistantMessage([FakeTextBlock("Turn2")]),
+        )
 
-        sdk._query = fake_query
-
-        events = await _collect(sdk)
-        messages = [e for e in events if e.type == "message"]
+        messages = await _events_of(sdk, "message")
         assert len(messages) == 2
         assert messages[0].content == "Turn1"
         assert messages[1].content == "Turn2"
 
 
+@pytest.fixture
+def loop_env(monkeypatch):
+    """AgentLoop wired to mock settings, bus, memory and context builder."""
+    bus = SimpleNamespace(publish_system=AsyncMock(), publish_outbound=AsyncMock())
+    mem = SimpleNamespace(
+        add_to_session=AsyncMock(),
+        get_session_history=AsyncMock(return_value=[]),
+        get_compacted_history=AsyncMock(return_value=[]),
+        resolve_session_key=AsyncMock(side_effect=lambda k: k),
+    )
+    builder = SimpleNamespace(
+        memory=mem, build_system_prompt=AsyncMock(return_value="System Prompt")
+    )
+    # Only the settings AgentLoop reads on this path; optional features off
+    settings = SimpleNamespace(
+        agent_backend="claude_agent_sdk",
+        max_concurrent_conversations=5,
+        welcome_hint_enabled=False,
+        injection_scan_enabled=False,
+        injection_scan_llm=False,
+        compaction_recent_window=10,
+        compaction_char_budget=8000,
+        compaction_summary_chars=150,
+        compaction_llm_summarize=False,
+        memory_backend="file",
+        file_auto_learn=False,
+        mem0_auto_learn=False,
+    )
+
+    monkeypatch.setattr("pocketpaw.agents.loop.get_settings", lambda: settings)
+    monkeypatch.setattr("pocketpaw.agents.loop.get_message_bus", lambda: bus)
+    monkeypatch.setattr("pocketpaw.agents.loop.get_memory_manager", lambda: mem)
+    monkeypatch.setattr("pocketpaw.agents.loop.AgentContextBuilder", lambda **kw: builder)
+
+    return SimpleNamespace(loop=AgentLoop(), bus=bus, mem=mem)
+
+
+def _router_yielding(*events):
+    """Router stand-in whose run() yields the given (type, content) events."""
+    agent_events = [AgentEvent(type=type_, content=content) for type_, content in events]
+    return SimpleNamespace(run=lambda msg, **kw: _ListAsyncIter(agent_events))
+
+
 class TestLoopThinkingIntegration:
     """Tests for thinking event handling in AgentLoop."""
 
-    async def test_loop_thinking_publishes_system_event(self):
+    async def test_loop_thinking_publishes_system_event(self, loop_env):
         """Loop publishes thinking as SystemEvent, not OutboundMessage."""
-        from pocketpaw.bus import Channel, InboundMessage
-
-        with (
-            patch("pocketpaw.agents.loop.get_settings") as mock_settings,
-            patch("pocketpaw.agents.loop.get_message_bus") as mock_bus_fn,
-            patch("pocketpaw.agents.loop.get_memory_manager") as mock_mem_fn,
-            patch("pocketpaw.agents.loop.AgentContextBuilder") as mock_builder_cls,
-        ):
-            mock_settings.return_value = MagicMock(
-                agent_backend="claude_agent_sdk",
-                max_concurrent_conversations=5,
-            )
-            bus = MagicMock()
-            bus.publish_system = AsyncMock()
-            bus.publish_outbound = AsyncMock()
-            mock_bus_fn.return_value = bus
-            mem = MagicMock()
-            mem.add_to_session = AsyncMock()
-            mem.get_session_history = AsyncMock(return_value=[])
-            mem.get_compacted_history = AsyncMock(return_value=[])
-            mem.resolve_session_key = AsyncMock(side_effect=lambda k: k)
-            mock_mem_fn.return_value = mem
-            mock_builder_cls.return_value.build_system_prompt = AsyncMock(
-                return_value="System Prompt"
-            )
-
-            from pocketpaw.agents.loop import AgentLoop
-
-            loop = AgentLoop()
-
-            # Mock router to yield thinking + done
-            router = MagicMock()
-
-            async def fake_run(msg, *, system_prompt=None, history=None, session_key=None):
-                from pocketpaw.agents.protocol import AgentEvent
-
-                yield AgentEvent(type="thinking", content="Deep thought")
-                yield AgentEvent(type="thinking_done", content="")
-                yield AgentEvent(type="done", content="")
-
-            router.run = fake_run
-            loop._router = router
-
-            msg = InboundMessage(
-                channel=Channel.WEBSOCKET,
-                sender_id="user1",
-                chat_id="test",
-                content="hello",
-            )
-            await loop._process_message(msg)
-
-            # Check that publish_system was called with thinking events
-            system_calls = bus.publish_system.call_args_list
-            event_types = [c.args[0].event_type for c in system_calls]
-            assert "thinking" in event_types
-            assert "thinking_done" in event_types
-
-            # Check that thinking content was NOT sent as OutboundMessage
-            outbound_calls = bus.publish_outbound.call_args_list
-            for call in outbound_calls:
-                msg_obj = call.args[0]
-                assert "Deep thought" not in (msg_obj.content or "")
-
-    async def test_loop_thinking_not_in_memory(self):
+        loop_env.loop._router = _router_yielding(
+            ("thinking", "Deep thought"), ("thinking_done", ""), ("done", "")
+        )
+        msg = InboundMessage(
+            channel=Channel.WEBSOCKET, sender_id="user1", chat_id="test", content="hello"
+        )
+        await loop_env.loop._process_message(msg)
+
+        # Check that publish_system was called with thinking events
+        event_types = [c.args[0].event_type for c in loop_env.bus.publish_system.call_args_list]
+        assert "thinking" in event_types
+        assert "thinking_done" in event_types
+
+        # Check that thinking content was NOT sent as OutboundMessage
+        for call in loop_env.bus.publish_outbound.call_args_list:
+            assert "Deep thought" not in (call.args[0].content or "")
+
+    async def test_loop_thinking_not_in_memory(self, loop_env):
         """Thinking content is excluded from full_response stored in memory."""
-        from pocketpaw.bus import Channel, InboundMessage
-
-        with (
-            patch("pocketpaw.agents.loop.get_settings") as mock_settings,
-            patch("pocketpaw.agents.loop.get_message_bus") as mock_bus_fn,
-            patch("pocketpaw.agents.loop.get_memory_manager") as mock_mem_fn,
-            patch("pocketpaw.agents.loop.AgentContextBuilder") as mock_builder_cls,
-        ):
-            mock_settings.return_value = MagicMock(
-                agent_backend="claude_agent_sdk",
-                max_concurrent_conversations=5,
-            )
-            bus = MagicMock()
-            bus.publish_system = AsyncMock()
-            bus.publish_outbound = AsyncMock()
-            mock_bus_fn.return_value = bus
-            mem = MagicMock()
-            mem.add_to_session = AsyncMock()
-            mem.get_session_history = AsyncMock(return_value=[])
-            mem.get_compacted_history = AsyncMock(return_value=[])
-            mem.resolve_session_key = AsyncMock(side_effect=lambda k: k)
-            mock_mem_fn.return_value = mem
-            mock_builder_cls.return_value.build_system_prompt = AsyncMock(
-                return_value="System Prompt"
-            )
-
-            from pocketpaw.agents.loop import AgentLoop
-
-            loop = AgentLoop()
-
-            router = MagicMock()
-
-            async def fake_run(msg, *, system_prompt=None, history=None, session_key=None):
-                from pocketpaw.agents.protocol import AgentEvent
-
-                yield AgentEvent(type="thinking", content="secret reasoning")
-                yield AgentEvent(type="message", content="Hello!")
-                yield AgentEvent(type="done", content="")
-
-            router.run = fake_run
-            loop._router = router
-
-            msg = InboundMessage(
-                channel=Channel.WEBSOCKET,
-                sender_id="user1",
-                chat_id="test",
-                content="hi",
-            )
-            await loop._process_message(msg)
-
-            # Memory should store "Hello!" but NOT "secret reasoning"
-            assistant_calls = [
-                c for c in mem.add_to_session.call_args_list if c.kwargs.get("role") == "assistant"
-            ]
-            assert len(assistant_calls) == 1
-            stored = assistant_calls[0].kwargs["content"]
-            assert "Hello!" in stored
-            assert "secret reasoning" not in stored
+        loop_env.loop._router = _router_yielding(
+            ("thinking", "secret reasoning"), ("message", "Hello!"), ("done", "")
+        )
+        msg = InboundMessage(
+            channel=Channel.WEBSOCKET, sender_id="user1", chat_id="test", content="hi"
+        )
+        await loop_env.loop._process_message(msg)
+
+        # Memory should store "Hello!" but NOT "secret reasoning"
+        assistant_calls = [
+            c
+            for c in loop_env.mem.add_to_session.call_args_list
+            if c.kwargs.get("role") == "assistant"
+        ]
+        assert len(assistant_calls) == 1
+        stored = assistant_calls[0].kwargs["content"]
+        assert "Hello!" in stored
+        assert "secret reasoning" not in stored
@@ -1,14 +1,19 @@
 """Tests for update_check module.
 
 Changes:
+  - 2026-10-16: mock_urlopen fixture; lru_cache coverage for _parse_version; one
+    parametrized check_for_updates test; module-level PyPI byte constants.
   - 2026-02-18: Added TestStyledUpdateNotice, TestFetchReleaseNotes, TestVersionSeen.
   - 2026-02-16: Initial tests for PyPI version check with caching.
 """
 
+import io
 import json
 import time
 from unittest.mock import patch
 
+import pytest
+
 from pocketpaw.update_check import (
     CACHE_FILENAME,
     CACHE_TTL,
@@ -23,91 +28,88 @@ from pocketpaw.update_check import (
 )
 
 
-class TestParseVersion:
-    def test_simple(self):
-        assert _parse_version("0.4.1") == (0, 4, 1)
+@pytest.fixture
+def mock_urlopen(monkeypatch):
+    """Return a setter that makes urllib.request.urlopen serve the given body."""
 
-    def test_major(self):
-        assert _parse_version("1.0.0") == (1, 0, 0)
+    def _serve(body: bytes) -> None:
+        monkeypatch.setattr("urllib.request.urlopen", lambda *a, **kw: io.BytesIO(body))
 
-    def test_two_digit(self):
-        assert _parse_version("0.12.3") == (0, 12, 3)
-
-
-class TestCheckForUpdates:
-    def test_returns_no_update_when_current(self, tmp_path):
-        """When PyPI returns same version, update_available is False."""
-        pypi_response = json.dumps({"info": {"version": "0.4.1"}}).encode()
-        with patch("urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.return_value.__enter__ = lambda s: s
-            mock_urlopen.return_value.__exit__ = lambda s, *a: None
-            mock_urlopen.return_value.read.return_value = pypi_response
+    return _serve
 
-            result = check_for_updates("0.4.1", tmp_path)
 
-        assert result is not None
-        assert result["current"] == "0.4.1"
-        assert result["latest"] == "0.4.1"
-        assert result["update_available"] is False
-
-    def test_returns_update_when_behind(self, tmp_path):
-        """When PyPI has newer version, update_available is True."""
-        pypi_response = json.dumps({"info": {"version": "0.5.0"}}).encode()
-        with patch("urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.return_value.__enter__ = lambda s: s
-            mock_urlopen.return_value.__exit__ = lambda s, *a: None
-            mock_urlopen.return_value.read.return_value = pypi_response
+# Canned PyPI JSON bodies, built once instead of json.dumps().encode() per case
+_PYPI_041 = b'{"info": {"version": "0.4.1"}}'
+_PYPI_050 = b'{"info": {"version": "0.5.0"}}'
 
-            result = check_for_updates("0.4.1", tmp_path)
 
-        assert result is not None
-        assert result["update_available"] is True
-        assert result["latest"] == "0.5.0"
+def _no_network(*args, **kwargs):
+    raise AssertionError("unexpected PyPI request")
 
-    def test_writes_cache_file(self, tmp_path):
-        """After a successful check, cache file should exist."""
-        pypi_response = json.dumps({"info": {"version": "0.4.1"}}).encode()
-        with patch("urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.return_value.__enter__ = lambda s: s
-            mock_urlopen.return_value.__exit__ = lambda s, *a: None
-            mock_urlopen.return_value.read.return_value = pypi_response
 
-            check_for_updates("0.4.1", tmp_path)
+class TestParseVersion:
+    def test_simple(self):
+        assert _parse_version("0.4.1") == (0, 4, 1)
 
-        cache_file = tmp_path / CACHE_FILENAME
-        assert cache_file.exists()
-        cache = json.loads(cache_file.read_text())
-        assert "ts" in cache
-        assert cache["latest"] == "0.4.1"
+    def test_major(self):
+        assert _parse_version("1.0.0") == (1, 0, 0)
 
-    def test_uses_fresh_cache(self, tmp_path):
-        """When cache is fresh, doesn't hit PyPI."""
-        cache_file = tmp_path / CACHE_FILENAME
-        cache_file.write_text(json.dumps({"ts": time.time(), "latest": "0.5.0"}))
+    def test_two_digit(self):
+        assert _parse_version("0.12.3") == (0, 12, 3)
 
-        # No mock needed — if it tries to hit PyPI it would fail
-        result = check_for_updates("0.4.1", tmp_path)
+    def test_repeated_parse_is_cached(self):
+        _parse_version.cache_clear()
+        first = _parse_version("0.7.2")
+        assert _parse_version("0.7.2") is first
+        assert _parse_version.cache_info().hits == 1
 
-        assert result is not None
-        assert result["update_available"] is True
-        assert result["latest"] == "0.5.0"
 
-    def test_ignores_stale_cache(self, tmp_path):
-        """When cache is older than TTL, re-fetches from PyPI."""
+class TestCheckForUpdates:
+    @pytest.mark.parametrize(
+        ("cache", "pypi_body", "expected_latest", "expect_update"),
+        [
+            pytest.param(None, _PYPI_041, "0.4.1", False, id="current"),
+            pytest.param(None, _PYPI_050, "0.5.0", True, id="behind"),
+            # Fresh cache answers without PyPI (pypi_body=None fails any fetch)
+            pytest.param(("fresh", "0.5.0"), None, "0.5.0", True, id="fresh-cache"),
+            pytest.param(("stale", "0.3.0"), _PYPI_041, "0.4.1", False, id="stale-cache"),
+            pytest.param("not json{{{", _PYPI_041, "0.4.1", False, id="corrupted-cache"),
+        ],
+    )
+    def test_check(
+        self,
+        tmp_path,
+        monkeypatch,
+        mock_urlopen,
+        cache,
+        pypi_body,
+        expected_latest,
+        expect_update,
+    ):
+        """Cache state + PyPI answer decide the result, and the cache ends up current."""
         cache_file = tmp_path / CACHE_FILENAME
-        stale_ts = time.time() - CACHE_TTL - 100
-        cache_file.write_text(json.dumps({"ts": stale_ts, "latest": "0.3.0"}))
-
-        pypi_response = json.dumps({"info": {"version": "0.4.1"}}).encode()
-        with patch("urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.return_value.__enter__ = lambda s: s
-            mock_urlopen.return_value.__exit__ = lambda s, *a: None
-            mock_urlopen.return_value.read.return_value = pypi_response
+        if isinstance(cache, tuple):
+            age, cached_latest = cache
+            ts = time.time() - (CACHE_TTL + 100 if age == "stale" else 0)
+            cache_file.write_text(json.dumps({"ts": ts, "latest": cached_latest}))
+        elif cache is not None:
+            cache_file.write_text(cache)
+
+        if pypi_body is None:
+            monkeypatch.setattr("urllib.request.urlopen", _no_network)
+        else:
+            mock_urlopen(pypi_body)
 
-            result = check_for_updates("0.4.1", tmp_path)
+        result = check_for_updates("0.4.1", tmp_path)
 
-        assert result is not None
-        assert result["latest"] == "0.4.1"  # Updated from stale 0.3.0
+        assert result == {
+            "current": "0.4.1",
+            "latest": expected_latest,
+            "update_available": expect_update,
+        }
+        written = json.loads(cache_file.read_text())
+        assert "ts" in written
+        assert written["latest"] == expected_latest
 
     def test_returns_none_on_network_error(self, tmp_path):
         """Network errors return None, never raise."""
@@ -116,22 +118,6 @@ class TestCheckForUpdates:
 
         assert result is None
 
-    def test_handles_corrupted_cache(self, tmp_path):
-        """Corrupted cache file doesn't crash, re-fetches."""
-        cache_file = tmp_path / CACHE_FILENAME
-        cache_file.write_text("not json{{{")
-
-        pypi_response = json.dumps({"info": {"version": "0.4.1"}}).encode()
-        with patch("urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.return_value.__enter__ = lambda s: s
-            mock_urlopen.return_value.__exit__ = lambda s, *a: None
-            mock_urlopen.return_value.read.return_value = pypi_response
-
-            result = check_for_updates("0.4.1", tmp_path)
-
-        assert result is not None
-        assert result["current"] == "0.4.1"
-
 
 class TestPrintUpdateNotice:
     def test_prints_notice(self, capsys):
@@ -201,7 +187,7 @@ class TestStyledUpdateNotice:
 
 
 class TestFetchReleaseNotes:
-    def test_fetch_and_cache(self, tmp_path):
+    def test_fetch_and_cache(self, tmp_path, mock_urlopen):
         """Fetches from GitHub and caches the result."""
         release_data = json.dumps(
             {
@@ -212,12 +198,8 @@ class TestFetchReleaseNotes:
             }
         ).encode()
 
-        with patch("urllib.request.urlopen") as mock_urlopen:
-            mock_urlopen.return_value.__enter__ = lambda s: s
-            mock_urlopen.return_value.__exit__ = lambda s, *a: None
-            mock_urlopen.return_value.read.return_value = release_data
-
-            result = fetch_release_notes("0.4.2", tmp_path)
+        mock_urlopen(release_data)
+        result = fetch_release_notes("0.4.2", tmp_path)
 
         assert result is not None
         assert result["version"] == "0.4.2"
@@ -1,7 +1,11 @@
 # Tests for WhatsApp Channel Adapter
 # Created: 2026-02-06
+# Updated: 2026-10-16 — module-scoped started adapter and bus, reset by _reset_adapter();
+#   _envelope() payloads; shared _OK response; read_json snapshot in test_read_receipts;
+#   parametrized content extraction.
 
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -10,27 +14,57 @@ from pocketpaw.bus.events import Channel, OutboundMessage
 from pocketpaw.bus.queue import MessageBus
 
 
-@pytest.fixture
-def adapter():
-    return WhatsAppAdapter(
-        access_token="test-token",
-        phone_number_id="123456789",
-        verify_token="verify-secret",
-        allowed_phone_numbers=["+1234567890"],
-    )
+def _make_adapter(**overrides) -> WhatsAppAdapter:
+    kwargs = {
+        "access_token": "test-token",
+        "phone_number_id": "123456789",
+        "verify_token": "verify-secret",
+        "allowed_phone_numbers": ["+1234567890"],
+    }
+    kwargs.update(overrides)
+    return WhatsAppAdapter(**kwargs)
+
+
+# Shared successful Graph API response; the adapter only reads .status_code
+_OK = SimpleNamespace(status_code=200)
+
+# Plain text message from the allowlisted number; tests override single fields
+_TEXT_MSG = {"from": "+1234567890", "type": "text", "text": {"body": "hi"}, "id": "msg1"}
+
+
+def _envelope(msg: dict) -> dict:
+    """Wrap one message dict in the Meta webhook entry/changes/value envelope."""
+    return {"entry": [{"changes": [{"value": {"messages": [msg]}}]}]}
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def bus():
     return MessageBus()
 
 
+@pytest.fixture(scope="module")
+async def adapter(bus):
+    """One started adapter for the module; its httpx client is built once."""
+    adapter = _make_adapter()
+    await adapter.start(bus)
+    yield adapter
+    await adapter.stop()
+
+
+@pytest.fixture(autouse=True)
+def _reset_adapter(adapter, bus):
+    adapter._buffers.clear()
+    adapter._http.post = AsyncMock(return_value=_OK)
+    bus.clear()
+
+
 def test_channel_property(adapter):
     assert adapter.channel == Channel.WHATSAPP
 
 
-async def test_start_stop(adapter, bus):
-    await adapter.start(bus)
+async def test_start_stop():
+    adapter = _make_adapter()
+    await adapter.start(MessageBus())
     assert adapter._running is True
     assert adapter._http is not None
 
@@ -56,13 +90,7 @@ def test_webhook_verify_wrong_mode(adapter):
     assert result is None
 
 
-async def test_send_text_message(adapter, bus):
-    await adapter.start(bus)
-
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    adapter._http.post = AsyncMock(return_value=mock_response)
-
+async def test_send_text_message(adapter):
     msg = OutboundMessage(
         channel=Channel.WHATSAPP,
         chat_id="+1234567890",
@@ -76,17 +104,9 @@ async def test_send_text_message(adapter, bus):
     assert call_args[1]["json"]["text"]["body"] == "Hello WhatsApp!"
     assert call_args[1]["json"]["messaging_product"] == "whatsapp"
 
-    await adapter.stop()
-
 
-async def test_stream_accumulation(adapter, bus):
+async def test_stream_accumulation(adapter):
     """WhatsApp doesn't stream — chunks accumulate and send on stream_end."""
-    await adapter.start(bus)
-
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    adapter._http.post = AsyncMock(return_value=mock_response)
-
     # Send chunks
     chunk1 = OutboundMessage(
         channel=Channel.WHATSAPP,
@@ -121,66 +141,19 @@ async def test_stream_accumulation(adapter, bus):
     assert call_args[1]["json"]["text"]["body"] == "Hello World!"
     assert "+1234567890" not in adapter._buffers
 
-    await adapter.stop()
-
 
 async def test_phone_number_filtering(adapter, bus):
     """Messages from non-allowed numbers are ignored."""
-    await adapter.start(bus)
-    adapter._http.post = AsyncMock(return_value=MagicMock(status_code=200))
-
-    payload = {
-        "entry": [
-            {
-                "changes": [
-                    {
-                        "value": {
-                            "messages": [
-                                {
-                                    "from": "+9999999999",  # not allowed
-                                    "type": "text",
-                                    "text": {"body": "hello"},
-                                    "id": "msg1",
-                                }
-                            ]
-                        }
-                    }
-                ]
-            }
-        ]
-    }
+    # +9999999999 is not on the allowlist
+    payload = _envelope({**_TEXT_MSG, "from": "+9999999999"})
 
     await adapter.handle_webhook_message(payload)
     assert bus.inbound_pending() == 0
 
-    await adapter.stop()
-
 
 async def test_text_webhook_parsing(adapter, bus):
     """Text messages are parsed and published to bus."""
-    await adapter.start(bus)
-    adapter._http.post = AsyncMock(return_value=MagicMock(status_code=200))
-
-    payload = {
-        "entry": [
-            {
-                "changes": [
-                    {
-                        "value": {
-                            "messages": [
-                                {
-                                    "from": "+1234567890",
-                                    "type": "text",
-                                    "text": {"body": "Hello from WhatsApp"},
-                                    "id": "msg1",
-                                }
-                            ]
-                        }
-                    }
-                ]
-            }
-        ]
-    }
+    payload = _envelope({**_TEXT_MSG, "text": {"body": "Hello from WhatsApp"}})
 
     await adapter.handle_webhook_message(payload)
     assert bus.inbound_pending() == 1
@@ -191,85 +164,41 @@ async def test_text_webhook_parsing(adapter, bus):
     assert msg.sender_id == "+1234567890"
     assert msg.chat_id == "+1234567890"
 
-    await adapter.stop()
-
 
 async def test_image_webhook_parsing(adapter, bus):
     """Image messages extract caption or placeholder."""
-    await adapter.start(bus)
-    adapter._http.post = AsyncMock(return_value=MagicMock(status_code=200))
-
-    payload = {
-        "entry": [
-            {
-                "changes": [
-                    {
-                        "value": {
-                            "messages": [
-                                {
-                                    "from": "+1234567890",
-                                    "type": "image",
-                                    "image": {"caption": "Look at this!"},
-                                    "id": "msg2",
-                                }
-                            ]
-                        }
-                    }
-                ]
-            }
-        ]
-    }
+    payload = _envelope(
+        {
+            "from": "+1234567890",
+            "type": "image",
+            "image": {"caption": "Look at this!"},
+            "id": "msg2",
+        }
+    )
 
     await adapter.handle_webhook_message(payload)
     msg = await bus.consume_inbound()
     # Caption is present, so content starts with it
     assert "Look at this!" in msg.content
 
-    await adapter.stop()
-
 
-async def test_read_receipts(adapter, bus):
+async def test_read_receipts(adapter):
     """Read receipts are sent after processing."""
-    await adapter.start(bus)
-    mock_response = MagicMock(status_code=200)
-    adapter._http.post = AsyncMock(return_value=mock_response)
-
-    payload = {
-        "entry": [
-            {
-                "changes": [
-                    {
-                        "value": {
-                            "messages": [
-                                {
-                                    "from": "+1234567890",
-                                    "type": "text",
-                                    "text": {"body": "hi"},
-                                    "id": "wamid.123",
-                                }
-                            ]
-                        }
-                    }
-                ]
-            }
-        ]
-    }
+    payload = _envelope({**_TEXT_MSG, "id": "wamid.123"})
 
     await adapter.handle_webhook_message(payload)
 
-    # Should have called post twice: once for read receipt
-    # The read receipt call
+    # Only the read receipt is posted; replies go out later via the bus
     calls = adapter._http.post.call_args_list
-    assert len(calls) == 1  # Just the read receipt
-    read_call = calls[0]
-    assert read_call[1]["json"]["status"] == "read"
-    assert read_call[1]["json"]["message_id"] == "wamid.123"
-
-    await adapter.stop()
+    assert len(calls) == 1
+    read_json = calls[0].kwargs["json"]
+    assert read_json["status"] == "read"
+    assert read_json["message_id"] == "wamid.123"
 
 
-async def test_bus_integration(bus):
+async def test_bus_integration():
     """Adapter receives outbound messages from bus subscription."""
+    bus = MessageBus()
     adapter = WhatsAppAdapter(access_token="t", phone_number_id="p", verify_token="v")
     adapter.send = AsyncMock()
 
@@ -287,62 +216,30 @@ async def test_bus_integration(bus):
     adapter.send.assert_called_once_with(msg)
 
 
-async def test_extract_content_and_media_types():
-    """Various message types extract content correctly."""
-    adapter = WhatsAppAdapter(access_token="t", phone_number_id="p", verify_token="v")
-
-    content, media = await adapter._extract_content_and_media(
-        {"type": "text", "text": {"body": "hi"}}
-    )
-    assert content == "hi"
+@pytest.mark.parametrize(
+    ("msg", "expected"),
+    [
+        pytest.param({"type": "text", "text": {"body": "hi"}}, "hi", id="text"),
+        pytest.param({"type": "image", "image": {}}, "[image received]", id="image"),
+        pytest.param({"type": "image", "image": {"caption": "pic"}}, "pic", id="image-caption"),
+        pytest.param({"type": "audio", "audio": {}}, "[audio received]", id="audio"),
+        pytest.param({"type": "sticker", "sticker": {}}, "[sticker received]", id="sticker"),
+    ],
+)
+async def test_extract_content_and_media_types(adapter, msg, expected):
+    """Each message type extracts its text, caption or placeholder (no media id, no download)."""
+    content, media = await adapter._extract_content_and_media(msg)
+    assert content == expected
     assert media == []
 
-    content, media = await adapter._extract_content_and_media({"type": "image", "image": {}})
-    assert "image" in content.lower() or "received" in content.lower()
-
-    content, media = await adapter._extract_content_and_media(
-        {"type": "image", "image": {"caption": "pic"}}
-    )
-    assert "pic" in content
-
-    content, media = await adapter._extract_content_and_media({"type": "audio", "audio": {}})
-    assert "audio" in content.lower() or "received" in content.lower()
-
-    content, media = await adapter._extract_content_and_media({"type": "sticker", "sticker": {}})
-    assert "sticker" in content.lower() or "received" in content.lower()
-
 
 async def test_no_allowed_numbers_means_all_allowed(bus):
     """No allowed_phone_numbers means all numbers are allowed."""
-    adapter = WhatsAppAdapter(
-        access_token="t",
-        phone_number_id="p",
-        verify_token="v",
-        allowed_phone_numbers=[],
-    )
+    adapter = _make_adapter(allowed_phone_numbers=[])
     await adapter.start(bus)
-    adapter._http.post = AsyncMock(return_value=MagicMock(status_code=200))
-
-    payload = {
-        "entry": [
-            {
-                "changes": [
-                    {
-                        "value": {
-                            "messages": [
-                                {
-                                    "from": "+9999999999",
-                                    "type": "text",
-                                    "text": {"body": "anyone"},
-                                    "id": "msg1",
-                                }
-                            ]
-                        }
-                    }
-                ]
-            }
-        ]
-    }
+    adapter._http.post = AsyncMock(return_value=_OK)
+
+    payload = _envelope({**_TEXT_MSG, "from": "+9999999999", "text": {"body": "anyone"}})
 
     await adapter.handle_webhook_message(payload)
     assert bus.inbound_pending() == 1